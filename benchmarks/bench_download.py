@@ -0,0 +1,70 @@
+"""
+Measures the throughput of Curl.download_file() with a single stream versus parallel byte ranges.
+
+A local range-capable server caps the bandwidth of every connection, as a remote server or a long fat link does, so
+the benefit of several connections is visible on loopback. Use a rate of 0 to serve at full speed.
+
+Usage:
+    python benchmarks/bench_download.py [size in MiB] [per-connection rate in MiB/s]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests'))
+
+from pycurlify import PyCurlify  # noqa: E402
+from LocalServer import EchoHandler, LocalServer  # noqa: E402
+
+RATE = 0
+
+
+class ThrottledHandler(EchoHandler):
+    """
+    Serves the test routes, writing the bodies at most RATE bytes per second per connection.
+    """
+
+    def send_body(self, body, content_type='application/json', status=200, headers=None):
+        if not RATE or self.command == 'HEAD':
+            return super().send_body(body, content_type, status, headers)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        started = time.perf_counter()
+        block = 64 * 1024
+        for offset in range(0, len(body), block):
+            self.wfile.write(body[offset:offset + block])
+            delay = started + (offset + block) / RATE - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def main():
+    global RATE
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 64 * 1024 * 1024
+    RATE = int(float(sys.argv[2]) * 1024 * 1024) if len(sys.argv) > 2 else 16 * 1024 * 1024
+
+    curl = PyCurlify()
+    curl.set_pool_config(pool_maxsize=16)
+    with LocalServer(ThrottledHandler) as server, tempfile.TemporaryDirectory() as directory:
+        for connections in (1, 2, 4, 8):
+            started = time.perf_counter()
+            with open(os.devnull, 'w') as devnull:
+                stderr, sys.stderr = sys.stderr, devnull
+                try:
+                    result = curl.download_file(server.url(f'/bytes?{size}'), directory, 'file.bin',
+                                                connections=connections)
+                finally:
+                    sys.stderr = stderr
+            seconds = time.perf_counter() - started
+            print(f"connections={connections:<3} {result['file_size'] / seconds / 1024 / 1024:8.1f} MiB/s "
+                  f"({seconds:.2f} s)")
+
+
+if __name__ == '__main__':
+    main()
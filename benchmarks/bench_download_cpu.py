@@ -0,0 +1,102 @@
+"""
+Measures the client CPU time per GiB and the peak Python memory of Curl.download_file(), with the regular copy and
+with zero_copy=True (os.splice, Linux), against the previous write loop (iter_content(chunk_size=1024), one bytes
+object and one progress bar update per chunk).
+
+The server runs in a separate process, so only the CPU time of the downloading process is counted. The peak memory
+is measured by tracemalloc in a separate run, as tracing slows the allocations down.
+
+Usage:
+    python benchmarks/bench_download_cpu.py [size in MiB] [repeat]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tests'))
+
+from tqdm import tqdm  # noqa: E402
+
+from pycurlify import PyCurlify  # noqa: E402
+from LocalServer import LocalServer  # noqa: E402
+
+
+def serve(connection):
+    with LocalServer() as server:
+        connection.send(server.url('/'))
+        connection.recv()
+
+
+def previous_loop(curl, url, file_path):
+    curl.enable_stream()
+    response = curl.get(url)
+    total_size = int(response.headers.get('content-length', 0))
+    with open(file_path, 'wb') as file, tqdm(total=total_size, unit='B', unit_scale=True) as bar:
+        for data in response.iter_content(chunk_size=1024):
+            file.write(data)
+            bar.update(len(data))
+    curl.disable_stream()
+
+
+def quiet(function):
+    with open(os.devnull, 'w') as devnull:
+        stderr, sys.stderr = sys.stderr, devnull
+        try:
+            function()
+        finally:
+            sys.stderr = stderr
+
+
+def measure(function):
+    wall, before = time.perf_counter(), os.times()
+    quiet(function)
+    after = os.times()
+    return time.perf_counter() - wall, after.user - before.user, after.system - before.system
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        quiet(function)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 256 * 1024 * 1024
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    gib = size / 1024 ** 3
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child,), daemon=True)
+    server.start()
+    base_url = parent.recv()
+    url = f'{base_url}bytes?{size}'
+
+    curl = PyCurlify()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'file.bin')
+        candidates = (
+            ('iter_content(1024)', lambda: previous_loop(curl, url, file_path)),
+            ('download_file', lambda: curl.download_file(url, directory, 'file.bin')),
+            ('zero_copy=True', lambda: curl.download_file(url, directory, 'file.bin', zero_copy=True)),
+        )
+        for name, function in candidates:
+            runs = [measure(function) for _ in range(repeat)]
+            wall, user, system = min(runs, key=lambda run: run[1] + run[2])
+            peak = peak_memory(function)
+            print(f"{name:<20} {(user + system) / gib:6.2f} CPU s/GiB (user {user / gib:5.2f}, system "
+                  f"{system / gib:5.2f}) {size / wall / 1024 ** 2:8.1f} MiB/s {peak / 1024:7.0f} KiB peak")
+
+    parent.send('stop')
+    server.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares the JSON codecs (see Curl.set_json_codec()) on realistic payloads of about 1 KB, 100 KB and 10 MB.
+
+For every installed codec, measures encoding a payload, decoding it, and Curl.response() decoding a canned
+application/json response, which includes the lookup of the decoder of the response.
+
+Usage:
+    python benchmarks/bench_json.py [scale]
+"""
+import os
+import random
+import sys
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pycurlify import PyCurlify  # noqa: E402
+from pycurlify.JsonCodec import CODECS, get_codec  # noqa: E402
+
+
+def _record(rng, index):
+    return {
+        'id': index,
+        'uuid': '%032x' % rng.getrandbits(128),
+        'name': f'Item {index}',
+        'active': rng.random() < 0.5,
+        'price': round(rng.uniform(1, 1000), 2),
+        'tags': rng.sample(['red', 'green', 'blue', 'large', 'small', 'sale', 'new'], 3),
+        'owner': {'login': f'user{rng.randrange(10000)}', 'email': f'user{index}@example.com'},
+        'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * rng.randrange(1, 4),
+    }
+
+
+def _payload(records):
+    rng = random.Random(records)
+    return {'total': records, 'page': 1, 'items': [_record(rng, index) for index in range(records)]}
+
+
+def _response(content):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json'
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    codecs = [get_codec(name) for name, (_, module) in CODECS.items() if module is not None]
+    # About 1 KB, 100 KB and 10 MB once encoded
+    sizes = {'small': 3, 'medium': 320, 'large': 32000}
+    curl = PyCurlify()
+
+    for label, records in sizes.items():
+        payload = _payload(max(1, int(records * scale)))
+        encoded = codecs[0].dumps(payload)
+        number = max(1, int(2000000 / len(encoded)))
+        print(f"{label} payload ({len(encoded) / 1024:.0f} KB, {number} iterations)")
+        baseline = {}
+        for codec in codecs:
+            curl.set_json_codec(codec)
+
+            def with_response():
+                curl._context().response = _response(encoded)
+                return curl.response()
+
+            timings = {
+                'encode': lambda: codec.dumps(payload),
+                'decode': lambda: codec.loads(encoded),
+                'response()': with_response,
+            }
+            results = []
+            for operation, function in timings.items():
+                seconds = min(timeit.repeat(function, number=number, repeat=3)) / number
+                baseline.setdefault(operation, seconds)
+                results.append(f"{operation} {seconds * 1e6:10.1f} us ({baseline[operation] / seconds:4.1f}x)")
+            print(f"  {codec.name:<8} " + '  '.join(results))
+
+
+if __name__ == '__main__':
+    main()
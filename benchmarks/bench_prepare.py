@@ -0,0 +1,60 @@
+"""
+Measures the client-side overhead of Curl.get() versus a RequestTemplate created by Curl.prepare().
+
+The transport is replaced by one returning a canned response, so only the per-call request setup is measured.
+
+Usage:
+    python benchmarks/bench_prepare.py [iterations]
+"""
+import os
+import sys
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pycurlify import PyCurlify  # noqa: E402
+from pycurlify.Transport import Transport  # noqa: E402
+
+
+class CannedTransport(Transport):
+    name = 'canned'
+
+    def __init__(self):
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response._content = b'{}'
+
+    def send(self, request_kwargs):
+        return self.response
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    curl = PyCurlify()
+    curl.set_transport(CannedTransport())
+    headers = {'Accept': 'application/json', 'X-Api-Key': 'secret'}
+
+    def with_get():
+        curl.set_bearer_authentication('token')
+        curl.set_timeout(5)
+        curl.get('https://api.example.com/items/42', headers=headers, params={'page': 1})
+
+    curl.set_bearer_authentication('token')
+    curl.set_timeout(5)
+    template = curl.prepare('get', 'https://api.example.com/items/{item_id}', headers=headers)
+
+    def with_template():
+        template.send(item_id=42, params={'page': 1})
+
+    results = {}
+    for name, function in (('Curl.get', with_get), ('RequestTemplate.send', with_template)):
+        seconds = min(timeit.repeat(function, number=iterations, repeat=3))
+        results[name] = seconds / iterations * 1e6
+        print(f"{name:<22} {results[name]:8.2f} us/call")
+    print(f"{'overhead reduction':<22} {1 - results['RequestTemplate.send'] / results['Curl.get']:8.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,539 @@
+import asyncio
+import inspect
+import os
+import weakref
+from urllib.parse import urlparse
+import requests
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from tqdm import tqdm
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from .BaseCurl import BaseCurl
+from .RequestContext import RequestContext
+from .JsonCodec import encode_body
+from .Upload import UploadBody, set_payload
+
+
+class AsyncRequestContext(RequestContext):
+    """
+    Per-task request state of an AsyncCurl instance.
+
+    Attributes:
+        Inherits all attributes from RequestContext.
+        stream_response: The open httpx response of the last streamed request, consumed by AsyncCurl.iter_content().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stream_response = None
+
+
+class AsyncCurl(BaseCurl):
+    """
+    An asyncio client mirroring the API of Curl.
+
+    AsyncCurl offers awaitable versions of get, post, put, patch, delete, options and download_file, running on the
+    non-blocking httpx transport with its own connection pool, so a single process can keep thousands of requests in
+    flight. Options are staged with the same setters as Curl (set_header, set_timeout, ...) and are kept per asyncio
+    task, and responses are returned as requests.Response objects so the inherited helpers (response(), get_content(),
+    get_error_code(), ...) behave exactly as in Curl.
+
+    Callbacks may be plain functions or coroutine functions.
+
+    AsyncCurl requires the optional httpx package (pip install httpx).
+
+    Example Usage:
+    ```
+    async with AsyncPyCurlify() as curl:
+        await curl.get('https://api.example.com/data')
+        print(curl.response())
+    ```
+    """
+
+    DEFAULT_TRANSPORT = 'httpx'
+
+    def __init__(self):
+        """
+        Initializes a new instance of the AsyncCurl class.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+
+        Raises:
+        ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("AsyncCurl requires the 'httpx' package. Install it with: pip install httpx")
+        self._task_contexts = weakref.WeakKeyDictionary()
+        self._retired_sessions = []
+        self._pool_requests = 0
+        super().__init__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def _context(self):
+        """
+        Retrieve the request context of the calling asyncio task, creating it on first use.
+
+        Contexts are keyed by task rather than stored in a context variable, because tasks inherit the context variables of the task that created them and would otherwise share its request context. Outside of a task the context of the calling thread is used.
+
+        Returns:
+        AsyncRequestContext: The request context of the calling task.
+        """
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            context = getattr(self._local, 'context', None)
+            if context is None:
+                context = self._local.context = AsyncRequestContext()
+            return context
+        context = self._task_contexts.get(task)
+        if context is None:
+            context = self._task_contexts[task] = AsyncRequestContext()
+        return context
+
+    def set_pool_config(self, pool_connections=10, pool_maxsize=10, max_connections=None, pool_block=False,
+                        idle_timeout=None):
+        """
+        Configure the connection pool of the underlying httpx client.
+
+        This method replaces the httpx client with one using the given limits. The previous client is closed by aclose(). httpx keeps a single pool for all hosts and always waits for a free connection when max_connections is reached, so pool_connections and pool_block are accepted for API compatibility with BaseCurl but have no effect.
+
+        Parameters:
+        - pool_connections (int, optional): Unused. Defaults to 10.
+        - pool_maxsize (int, optional): The maximum number of idle keep-alive connections. Defaults to 10.
+        - max_connections (int, optional): The maximum number of open connections. Defaults to None (no limit).
+        - pool_block (bool, optional): Unused. Defaults to False.
+        - idle_timeout (int or float, optional): Seconds after which an idle connection is closed. Defaults to None (never).
+
+        Returns:
+        None
+        """
+        self._pool_config = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'max_connections': max_connections,
+            'pool_block': pool_block,
+            'idle_timeout': idle_timeout
+        }
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=pool_maxsize,
+            keepalive_expiry=idle_timeout
+        )
+        if isinstance(self._session, httpx.AsyncClient):
+            self._retired_sessions.append(self._session)
+        self._session = httpx.AsyncClient(limits=limits)
+
+    def set_transport(self, transport):
+        """
+        Select the transport backend used to send the requests.
+
+        AsyncCurl always uses httpx; this method only exists for API compatibility with BaseCurl and recreates the httpx client with the current pool configuration.
+
+        Parameters:
+        - transport (str): Must be 'httpx'.
+
+        Returns:
+        None
+
+        Raises:
+        ValueError: If another transport is requested.
+        """
+        if transport != self.DEFAULT_TRANSPORT:
+            raise ValueError("AsyncCurl only supports the 'httpx' transport")
+        self.set_pool_config(**self._pool_config)
+
+    def get_transport(self):
+        """
+        Retrieve the httpx client used to send the requests.
+
+        Returns:
+        httpx.AsyncClient: The httpx client.
+        """
+        return self._session
+
+    def get_pool_stats(self):
+        """
+        Retrieve live statistics of the httpx connection pool.
+
+        Parameters:
+        None
+
+        Returns:
+        dict: A dictionary with the 'open', 'idle', 'in_use' and 'requests' counters.
+        """
+        pool = getattr(self._session._transport, '_pool', None)
+        connections = list(pool.connections) if pool is not None else []
+        open_connections = [conn for conn in connections if not conn.is_closed()]
+        idle = sum(1 for conn in open_connections if conn.is_idle())
+        return {
+            'open': len(open_connections),
+            'idle': idle,
+            'in_use': len(open_connections) - idle,
+            'requests': self._pool_requests,
+        }
+
+    async def aclose(self):
+        """
+        Close the httpx client and release all its connections.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        for session in self._retired_sessions:
+            await session.aclose()
+        self._retired_sessions = []
+        await self._session.aclose()
+
+    @staticmethod
+    async def _run_callback(callback, *args):
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
+
+    @staticmethod
+    def _to_response(httpx_response, content):
+        """
+        Convert an httpx response into a requests.Response.
+
+        Parameters:
+        - httpx_response (httpx.Response): The response returned by httpx.
+        - content (bytes or bool): The response body, or False if the body has not been read (streaming).
+
+        Returns:
+        requests.Response: The equivalent requests response.
+        """
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.reason = httpx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(httpx_response.headers.items())
+        response.url = str(httpx_response.url)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = getattr(httpx_response, '_elapsed', response.elapsed)
+        response._content = content
+        response._content_consumed = content is not False
+        jar = RequestsCookieJar()
+        jar.update(httpx_response.cookies.jar)
+        response.cookies = jar
+        return response
+
+    async def exec(self, method, url, headers=None, cookies=None, params=None, data=None):
+        """
+        Execute an HTTP request using the specified method, URL, headers, cookies, params, and data.
+
+        This coroutine is the asynchronous counterpart of BaseCurl.exec(): it consumes the options staged by the calling task, sends the request through httpx and runs the callbacks.
+
+        Parameters:
+        - method (str): The HTTP method for the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+        - url (str): The URL to which the request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Parameters to be included in the query string.
+        - data (dict, optional): The request payload data to be sent with the request.
+
+        Returns:
+        None
+
+        Raises:
+        Any exceptions raised during the request execution will be handled internally, and may trigger error or complete callbacks if provided.
+        """
+        context = self._context()
+        options = self._request_options(context)
+        parsed_url = urlparse(url)
+
+        final_headers = {
+            **options['headers'],
+            'Host': parsed_url.netloc,
+            "Connection": "keep-alive",
+            **(headers or {})
+        }
+        final_cookies = {**options['cookies'], **(cookies or {})}
+        if final_cookies:
+            # httpx deprecates per-request cookies, so they are sent as a header like requests does
+            final_headers['Cookie'] = '; '.join(f'{key}={value}' for key, value in final_cookies.items())
+
+        request_kwargs = {
+            'method': method,
+            'url': url,
+            'headers': final_headers,
+            'cookies': final_cookies,
+            'timeout': options['timeout'],
+            'allow_redirects': options['follow_location'],
+            'params': params,
+            'stream': context.stream
+        }
+
+        if method.lower() in ['post', 'put', 'patch']:
+            set_payload(request_kwargs, data)
+
+        self.close()
+
+        if self.before_send_callback:
+            await self._run_callback(self.before_send_callback, request_kwargs)
+
+        if context.stream_response is not None:
+            await context.stream_response.aclose()
+            context.stream_response = None
+
+        try:
+            encoded_kwargs = encode_body(request_kwargs, self._json_codec)
+            content = encoded_kwargs.get('data')
+            headers = encoded_kwargs['headers']
+            if isinstance(content, UploadBody):
+                # httpx sends async iterables with chunked transfer encoding unless the length is given
+                if content.length is not None:
+                    headers = {**headers, 'Content-Length': str(content.length)}
+                content = aiter(content)
+            request = self._session.build_request(
+                request_kwargs['method'].upper(),
+                request_kwargs['url'],
+                headers=headers,
+                params=request_kwargs['params'],
+                content=content,
+                timeout=request_kwargs['timeout']
+            )
+            self._pool_requests += 1
+            httpx_response = await self._session.send(
+                request,
+                stream=True,
+                follow_redirects=bool(request_kwargs['allow_redirects'])
+            )
+            if request_kwargs['stream']:
+                context.stream_response = httpx_response
+                response = self._to_response(httpx_response, False)
+            elif self._body_limits is not None:
+                content = await self._body_limits.aread(httpx_response)
+                response = self._body_limits.set_content(self._to_response(httpx_response, False), content)
+            else:
+                try:
+                    content = await httpx_response.aread()
+                finally:
+                    await httpx_response.aclose()
+                response = self._to_response(httpx_response, content)
+        except (httpx.HTTPError, requests.RequestException) as e:
+            context.response = None
+            context.error = str(e)
+            if self.error_callback:
+                await self._run_callback(self.error_callback, str(e))
+            return
+
+        context.response = response
+        context.error = None
+        context.request_headers = final_headers.copy()
+
+        if self.after_send_callback:
+            await self._run_callback(self.after_send_callback, response)
+
+        if response.ok and self.success_callback:
+            await self._run_callback(self.success_callback, response)
+        elif self.error_callback:
+            await self._run_callback(self.error_callback, response)
+
+        if self.complete_callback:
+            await self._run_callback(self.complete_callback, response)
+
+    async def iter_content(self, chunk_size=None):
+        """
+        Iterate asynchronously over the body of the last streamed response of the calling task.
+
+        Streaming is enabled with enable_stream() before the request. The underlying connection is released once the body has been consumed.
+
+        Parameters:
+        - chunk_size (int, optional): The size of the chunks to yield. Defaults to None (chunks as received).
+
+        Yields:
+        bytes: The next chunk of the response body.
+
+        Raises:
+        ValueError: If there is no streamed response available.
+        """
+        context = self._context()
+        stream_response = context.stream_response
+        if stream_response is None:
+            raise ValueError("No hay ninguna respuesta en streaming disponible.")
+        try:
+            async for chunk in stream_response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await stream_response.aclose()
+            if context.stream_response is stream_response:
+                context.stream_response = None
+
+    async def get(self, url, headers=None, cookies=None, params=None):
+        """
+        Sends a GET request to the specified URL.
+
+        Parameters:
+        - url (str): The URL to which the GET request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+        """
+        await self.exec('get', url, headers=headers, cookies=cookies, params=params)
+        return self.get_response()
+
+    async def post(self, url, headers=None, cookies=None, params=None, data=None):
+        """
+        Sends a POST request to the specified URL.
+
+        Parameters:
+        - url (str): The URL to which the POST request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict or object, optional): The JSON payload, or a body streamed without being loaded in memory: a binary file object, a bytes-like object, an iterator or async iterable of chunks or an Upload.UploadBody.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+        """
+        await self.exec('post', url, headers=headers, cookies=cookies, params=params, data=data)
+        return self.get_response()
+
+    async def put(self, url, headers=None, cookies=None, params=None, data=None):
+        """
+        Sends a PUT request to the specified URL.
+
+        Parameters:
+        - url (str): The URL to which the PUT request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict or object, optional): The JSON payload, or a body streamed without being loaded in memory: a binary file object, a bytes-like object, an iterator or async iterable of chunks or an Upload.UploadBody.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+        """
+        await self.exec('put', url, headers=headers, cookies=cookies, params=params, data=data)
+        return self.get_response()
+
+    async def options(self, url, headers=None, cookies=None, params=None):
+        """
+        Sends an OPTIONS request to the specified URL.
+
+        Parameters:
+        - url (str): The URL to which the OPTIONS request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+        """
+        await self.exec('options', url, headers=headers, cookies=cookies, params=params)
+        return self.get_response()
+
+    async def delete(self, url, headers=None, cookies=None, params=None):
+        """
+        Sends a DELETE request to the specified URL.
+
+        Parameters:
+        - url (str): The URL to which the DELETE request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+        """
+        await self.exec('delete', url, headers=headers, cookies=cookies, params=params)
+        return self.get_response()
+
+    async def patch(self, url, headers=None, cookies=None, params=None, data=None):
+        """
+        Sends a PATCH request to the specified URL.
+
+        Parameters:
+        - url (str): The URL to which the PATCH request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict or object, optional): The JSON payload, or a body streamed without being loaded in memory: a binary file object, a bytes-like object, an iterator or async iterable of chunks or an Upload.UploadBody.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+        """
+        await self.exec('patch', url, headers=headers, cookies=cookies, params=params, data=data)
+        return self.get_response()
+
+    async def download_file(self, url, dir_path, file_name, method='get', headers=None, cookies=None, params=None,
+                            data=None):
+        """
+        Downloads a file from the specified URL and saves it to the specified directory.
+
+        Parameters:
+        - url (str): The URL from which to download the file.
+        - dir_path (str): The directory path where the file will be saved.
+        - file_name (str): The name of the file to be saved.
+        - method (str, optional): The HTTP method to use for the request. Defaults to 'get'.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict, optional): The data payload to be sent with the request.
+
+        Returns:
+        dict or None: A dictionary containing information about the downloaded file, including its path and size,
+                      or None if the file could not be downloaded.
+        """
+        try:
+            if not os.path.exists(dir_path):
+                raise FileNotFoundError(f"The specified directory '{dir_path}' does not exist.")
+
+            file_path = os.path.join(dir_path, file_name)
+
+            self.enable_stream()
+
+            if method.lower() == 'get':
+                response = await self.get(url, headers=headers, cookies=cookies, params=params)
+            elif method.lower() == 'post':
+                response = await self.post(url, headers=headers, cookies=cookies, params=params, data=data)
+            else:
+                raise ValueError("Unsupported HTTP method. Only 'get' and 'post' are supported.")
+
+            if response is None:
+                raise ValueError("The request did not return a response.")
+
+            total_size = int(response.headers.get('content-length', 0))
+
+            with open(file_path, 'wb') as file, tqdm(
+                    desc="Downloading",
+                    total=total_size,
+                    unit='B',
+                    unit_scale=True,
+                    unit_divisor=1024,
+                    bar_format="{l_bar}{bar}{r_bar}",
+                    colour='green'
+            ) as bar:
+                async for chunk in self.iter_content(chunk_size=65536):
+                    file.write(chunk)
+                    bar.update(len(chunk))
+
+            self.disable_stream()
+            if os.path.exists(file_path):
+                return {'file_path': file_path, 'file_size': total_size}
+            return None
+        except Exception as e:
+            self.disable_stream()
+            print(f"An error occurred while downloading the file: {str(e)}")
+            return None
@@ -1,11 +1,25 @@
-import xml.etree.ElementTree as ET
 import base64
+import threading
+from functools import partial
 from urllib.parse import urlparse
 import requests
 import validators
 
+from .Transport import TRANSPORTS, RequestsTransport
+from .Cache import MemoryStore, ResponseCache
+from .DiskCache import DiskStore, TieredStore
+from .SingleFlight import SingleFlight
+from .Spool import BodyLimits, is_spooled
+from .Decoders import DecoderRegistry
+from .Defaults import Defaults
+from .JsonCodec import encode_body, get_codec
+from .RequestContext import RequestContext, UNSET
+from .Upload import set_payload
+
 
 class BaseCurl:
+    DEFAULT_TRANSPORT = RequestsTransport.name
+
     def __init__(self):
         """
         Initializes a new instance of the BaseCurl class.
@@ -19,21 +33,454 @@ class BaseCurl:
             success_callback: A callback function executed if the request is successful.
             error_callback: A callback function executed if the request encounters an error.
             complete_callback: A callback function executed after the request is complete.
+
+        The options staged for the next request and the last response are kept per thread (see RequestContext),
+        so one instance and its connection pool can be shared by many threads. Client-level defaults set with the
+        set_default_* methods are shared by all threads and survive close().
         """
-        self._stream = False
+        self._local = threading.local()
+        self._defaults_lock = threading.Lock()
+        self._defaults = Defaults()
         self._session = requests.Session()
-        self._follow_location = None
-        self._headers = {}
-        self._request_headers = {}
-        self._cookies = {}
-        self._timeout = None
-        self._response = None
+        self._pool_config = {}
+        self._transport = None
+        self._cache = None
+        self._single_flight = None
+        self._body_limits = None
+        self._json_codec = get_codec()
+        self._decoders = DecoderRegistry(json_codec=self._json_codec)
+        self.set_transport(self.DEFAULT_TRANSPORT)
         self.before_send_callback = None
         self.after_send_callback = None
         self.success_callback = None
         self.error_callback = None
         self.complete_callback = None
 
+    def _context(self):
+        """
+        Retrieve the request context of the calling thread, creating it on first use.
+
+        Returns:
+        RequestContext: The request context of the calling thread.
+        """
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self._local.context = RequestContext()
+        return context
+
+    def _request_options(self, context):
+        """
+        Merge the options staged on a request context over the client defaults.
+
+        Parameters:
+        - context (RequestContext): The request context holding the staged options.
+
+        Returns:
+        dict: A dictionary with the effective 'headers', 'cookies', 'timeout' and 'follow_location'.
+        """
+        defaults = self._defaults
+        return {
+            'headers': {**defaults.headers, **context.headers},
+            'cookies': {**defaults.cookies, **context.cookies},
+            'timeout': defaults.timeout if context.timeout is UNSET else context.timeout,
+            'follow_location': defaults.follow_location if context.follow_location is UNSET else context.follow_location
+        }
+
+    def _update_defaults(self, update):
+        """
+        Rebuild the frozen defaults snapshot.
+
+        Parameters:
+        - update (callable): A function receiving the current Defaults and returning the new one.
+
+        Returns:
+        None
+        """
+        with self._defaults_lock:
+            self._defaults = update(self._defaults)
+
+    def get_defaults(self):
+        """
+        Retrieve the client-level defaults.
+
+        Parameters:
+        None
+
+        Returns:
+        Defaults: An immutable snapshot of the default headers, cookies, timeout and follow location.
+        """
+        return self._defaults
+
+    def set_default_header(self, key, value):
+        """
+        Set a header sent with every request of this client.
+
+        Unlike set_header(), default headers survive close() and therefore every request. Headers staged with set_header() or passed to a request override them.
+
+        Parameters:
+        - key (str): The key of the header.
+        - value (str): The value of the header.
+
+        Returns:
+        None
+        """
+        self.set_default_headers({key: value})
+
+    def set_default_headers(self, headers):
+        """
+        Set multiple headers sent with every request of this client.
+
+        Parameters:
+        - headers (dict): A dictionary containing the headers to be set.
+
+        Returns:
+        None
+        """
+        self._update_defaults(lambda defaults: defaults.replace(headers={**defaults.headers, **headers}))
+
+    def remove_default_header(self, key):
+        """
+        Remove a header from the client defaults.
+
+        Parameters:
+        - key (str): The key of the header to be removed.
+
+        Returns:
+        None
+        """
+        self._update_defaults(lambda defaults: defaults.replace(
+            headers={name: value for name, value in defaults.headers.items() if name != key}
+        ))
+
+    def set_default_cookie(self, key, value):
+        """
+        Set a cookie sent with every request of this client.
+
+        Parameters:
+        - key (str): The key of the cookie.
+        - value (str): The value of the cookie.
+
+        Returns:
+        None
+        """
+        self.set_default_cookies({key: value})
+
+    def set_default_cookies(self, cookies):
+        """
+        Set multiple cookies sent with every request of this client.
+
+        Parameters:
+        - cookies (dict): A dictionary containing the cookies to be set.
+
+        Returns:
+        None
+        """
+        self._update_defaults(lambda defaults: defaults.replace(cookies={**defaults.cookies, **cookies}))
+
+    def set_default_timeout(self, seconds):
+        """
+        Set the timeout used by every request of this client that does not stage its own with set_timeout().
+
+        Parameters:
+        - seconds (int or float): The timeout value in seconds. If set to None, requests will not have a timeout.
+
+        Returns:
+        None
+        """
+        self._update_defaults(lambda defaults: defaults.replace(timeout=seconds))
+
+    def set_default_follow_location(self, follow_location=True):
+        """
+        Set the redirect policy used by every request of this client that does not stage its own with set_follow_location().
+
+        Parameters:
+        - follow_location (bool, optional): Whether to follow HTTP redirects. Defaults to True.
+
+        Returns:
+        None
+        """
+        self._update_defaults(lambda defaults: defaults.replace(follow_location=follow_location))
+
+    def set_default_basic_authentication(self, username, password=''):
+        """
+        Set the Basic authentication header sent with every request of this client.
+
+        Parameters:
+        - username (str): The username for Basic authentication.
+        - password (str, optional): The password for Basic authentication. Defaults to an empty string.
+
+        Returns:
+        None
+        """
+        self.set_default_header('Authorization', self._basic_auth_header(username, password))
+
+    def set_default_bearer_authentication(self, token):
+        """
+        Set the Bearer token authentication header sent with every request of this client.
+
+        Parameters:
+        - token (str): The Bearer token to be used for authentication.
+
+        Returns:
+        None
+        """
+        self.set_default_header('Authorization', f"Bearer {token}")
+
+    def clear_defaults(self):
+        """
+        Remove all the client-level defaults.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self._update_defaults(lambda defaults: Defaults())
+
+    def set_pool_config(self, pool_connections=10, pool_maxsize=10, max_connections=None, pool_block=False,
+                        idle_timeout=None):
+        """
+        Configure the connection pool used by the transport.
+
+        This method replaces the connection pool of the current transport (see set_transport()) and closes the previous one. Use it to size the pool for highly concurrent workloads, where the default per-host size causes "connection pool is full, discarding connection" warnings and repeated TCP/TLS handshakes. The configuration is kept and applied to transports selected later.
+
+        Parameters:
+        - pool_connections (int, optional): The number of per-host pools to keep cached. Defaults to 10.
+        - pool_maxsize (int, optional): The maximum number of connections kept per host. Defaults to 10.
+        - max_connections (int, optional): The maximum number of connections in use across all hosts. Defaults to None (no limit).
+        - pool_block (bool, optional): If True, wait for a free connection when a limit is reached. If False, open an overflow connection that is discarded after use. Defaults to False.
+        - idle_timeout (int or float, optional): Seconds after which an idle connection is closed instead of being reused. Defaults to None (never).
+
+        Returns:
+        None
+        """
+        self._pool_config = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'max_connections': max_connections,
+            'pool_block': pool_block,
+            'idle_timeout': idle_timeout
+        }
+        self._transport.configure_pool(**self._pool_config)
+
+    def get_pool_stats(self):
+        """
+        Retrieve live statistics of the connection pool.
+
+        This method returns a snapshot of the connection pool configured with set_pool_config(), useful to size the pool from data instead of guessing.
+
+        Parameters:
+        None
+
+        Returns:
+        dict: A dictionary containing the pool statistics.
+
+        Example:
+        ```
+        {
+            'open': 12,
+            'idle': 4,
+            'in_use': 8,
+            'requests': 1500,
+            'created': 12,
+            'reused': 1488,
+            'reuse_ratio': 0.992,
+            'waits': 3,
+            'overflows': 0,
+            'discarded': 0,
+            'expired': 0
+        }
+        ```
+        """
+        return self._transport.get_pool_stats()
+
+    def set_transport(self, transport):
+        """
+        Select the transport backend used to send the requests.
+
+        The available backends are 'requests' (the default, requests.Session), 'urllib3' (urllib3 directly, without the per-call overhead of requests.Session) and 'curl' (libcurl through pycurl, which must be installed). All of them have the same semantics for headers, cookies, timeouts, redirects and streaming. The current pool configuration is applied to the new transport and the previous transport is closed.
+
+        Parameters:
+        - transport (str or Transport): The name of a backend, or a Transport instance.
+
+        Returns:
+        None
+
+        Raises:
+        ValueError: If the transport name is unknown.
+        """
+        if transport == RequestsTransport.name:
+            transport = RequestsTransport(self._session)
+        elif isinstance(transport, str):
+            if transport not in TRANSPORTS:
+                raise ValueError(f"Unknown transport '{transport}'. Available transports: {', '.join(TRANSPORTS)}")
+            transport = TRANSPORTS[transport]()
+        transport.configure_pool(**self._pool_config)
+        previous = self._transport
+        self._transport = transport
+        if previous and previous is not transport:
+            previous.close()
+
+    def get_transport(self):
+        """
+        Retrieve the transport backend used to send the requests.
+
+        Returns:
+        Transport: The current transport.
+        """
+        return self._transport
+
+    def enable_cache(self, max_entries=1024, max_bytes=64 * 1024 * 1024, path=None, disk_max_bytes=1024 * 1024 * 1024,
+                     ttl=None):
+        """
+        Enable the HTTP cache for GET and HEAD requests.
+
+        This method enables a private HTTP cache honoring Cache-Control, Expires, Vary, ETag and Last-Modified (RFC 9111). Fresh responses are served without a network round trip, stale ones are revalidated with If-None-Match/If-Modified-Since, and the least recently used entries are evicted once either limit is reached. Enabling the cache again replaces the in-memory tier with an empty one.
+
+        With a path, the responses are also stored in a persistent directory (a SQLite index and one file per body) that several processes can share, so a restarted worker starts with a warm cache. Responses found only on disk stream their body from the file.
+
+        Parameters:
+        - max_entries (int, optional): The maximum number of responses stored in memory. Defaults to 1024.
+        - max_bytes (int, optional): The maximum total size of the responses stored in memory, in bytes. Defaults to 64 MiB.
+        - path (str, optional): The directory of the persistent cache, created if needed. Defaults to None (in-memory only).
+        - disk_max_bytes (int, optional): The maximum total size of the persistent cache, in bytes. Defaults to 1 GiB.
+        - ttl (int or float, optional): The maximum time a response is kept in the persistent cache, in seconds, whatever its freshness. Defaults to None (no limit).
+
+        Returns:
+        None
+        """
+        store = MemoryStore(max_entries=max_entries, max_bytes=max_bytes)
+        if path is not None:
+            store = TieredStore(store, DiskStore(path, max_bytes=disk_max_bytes, ttl=ttl))
+        self._cache = ResponseCache(store)
+
+    def disable_cache(self):
+        """
+        Disable the HTTP cache and drop the stored responses.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self._cache = None
+
+    def clear_cache(self):
+        """
+        Remove all the responses stored in the HTTP cache, including the persistent cache shared with other processes.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        if self._cache:
+            self._cache.clear()
+
+    def get_cache_stats(self):
+        """
+        Retrieve the counters of the HTTP cache.
+
+        Parameters:
+        None
+
+        Returns:
+        dict or None: A dictionary with the 'hits', 'misses', 'revalidations', 'stores', 'entries', 'bytes' and 'evictions' counters, or None if the cache is disabled. With a persistent cache, 'entries', 'bytes' and 'evictions' describe the disk tier and the memory tier counters are prefixed by 'memory_'.
+        """
+        if self._cache:
+            return self._cache.stats()
+        return None
+
+    def enable_coalescing(self):
+        """
+        Enable the coalescing of concurrent identical GET and HEAD requests.
+
+        While a request is in flight, threads issuing the same request (same method, URL, query string, headers, cookies and redirect policy) wait for it instead of sending their own, and all receive the same response object, which must be treated as read-only. Streamed requests are never coalesced. With the HTTP cache enabled, coalescing happens in front of the cache, so only one caller revalidates or refreshes an expired response.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self._single_flight = SingleFlight()
+
+    def disable_coalescing(self):
+        """
+        Disable the coalescing of concurrent identical requests.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+        """
+        self._single_flight = None
+
+    def get_coalescing_stats(self):
+        """
+        Retrieve the counters of the request coalescing.
+
+        Parameters:
+        None
+
+        Returns:
+        dict or None: A dictionary with the 'leaders', 'collapsed', 'bypassed' and 'in_flight' counters, or None if coalescing is disabled.
+        """
+        if self._single_flight:
+            return self._single_flight.stats()
+        return None
+
+    def set_json_codec(self, codec='auto'):
+        """
+        Select the JSON codec used to encode the payloads of post, put and patch and to decode JSON responses.
+
+        By default the fastest installed codec is used: orjson, then msgspec, then the standard library. The fast codecs fall back to the standard library for the values they reject (e.g. integers beyond 64 bits), so the choice only changes the speed and the whitespace of the encoded payloads. Decoders registered with register_decoder() are not affected.
+
+        Parameters:
+        - codec (str or object, optional): 'auto', 'orjson', 'msgspec', 'json' (standard library) or an object with a name, dumps(obj) returning bytes and loads(data) raising ValueError on invalid documents (see JsonCodec.JsonCodec). Defaults to 'auto'.
+
+        Returns:
+        None
+
+        Raises:
+        ImportError: If the package of the named codec is not installed.
+        ValueError: If the codec name is unknown.
+        """
+        self._json_codec = get_codec(codec)
+        self._decoders.set_json_codec(self._json_codec)
+
+    def get_json_codec(self):
+        """
+        Retrieve the JSON codec of the client.
+
+        Returns:
+        object: The codec; its name attribute identifies it.
+        """
+        return self._json_codec
+
+    def set_body_limits(self, spool_threshold=None, max_body_size=None, spool_dir=None):
+        """
+        Bound the memory used by response bodies.
+
+        This method makes the bodies larger than spool_threshold bytes spool to an anonymous temporary file, memory-mapped once complete, instead of being loaded in memory, and aborts the transfers whose body exceeds max_body_size bytes with a Spool.BodyTooLargeError (reported like a connection error). A spooled body is still available as response.content, and get_content() returns a memoryview over it (see Spool.BodyLimits). Streamed requests and download_file() are not affected. Call it without arguments to remove the limits.
+
+        Parameters:
+        - spool_threshold (int, optional): The body size, in bytes, above which a body is spooled to disk. Defaults to None (never).
+        - max_body_size (int, optional): The maximum body size, in bytes. Defaults to None (no limit).
+        - spool_dir (str, optional): The directory of the temporary files. Defaults to None (the system temporary directory).
+
+        Returns:
+        None
+        """
+        if spool_threshold is None and max_body_size is None:
+            self._body_limits = None
+        else:
+            self._body_limits = BodyLimits(spool_threshold, max_body_size, spool_dir)
+
     def disable_timeout(self):
         """
         Disable the timeout for the HTTP request.
@@ -60,7 +507,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._timeout = seconds
+        self._context().timeout = seconds
 
     def set_user_agent(self, user_agent):
         """
@@ -88,7 +535,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._follow_location = follow_location
+        self._context().follow_location = follow_location
 
     def set_referer(self, referer):
         """
@@ -123,7 +570,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._headers[key] = value
+        self._context().headers[key] = value
 
     def set_headers(self, headers):
         """
@@ -137,7 +584,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._headers.update(headers)
+        self._context().headers.update(headers)
 
     def remove_header(self, key):
         """
@@ -151,7 +598,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._headers.pop(key, None)
+        self._context().headers.pop(key, None)
 
     def get_request_headers(self):
         """
@@ -174,7 +621,7 @@ class BaseCurl:
         }
         ```
         """
-        return self._request_headers.copy()
+        return self._context().request_headers.copy()
 
     def get_response_headers(self):
         """
@@ -188,8 +635,9 @@ class BaseCurl:
         Returns:
         dict or None: A dictionary containing the headers from the last HTTP response, if available. Otherwise, None.
         """
-        if self._response:
-            return self._response.headers.copy()
+        response = self.get_response()
+        if response:
+            return response.headers.copy()
         return None
 
     def set_cookie(self, key, value):
@@ -205,6 +653,7 @@ class BaseCurl:
         Returns:
         None
         """
+        self._context().cookies[key] = value
 
     def set_cookies(self, cookies):
         """
@@ -218,7 +667,7 @@ class BaseCurl:
             Returns:
             None
             """
-        self._cookies.update(cookies)
+        self._context().cookies.update(cookies)
 
     def set_cookie_string(self, string):
         """
@@ -287,11 +736,14 @@ class BaseCurl:
         Returns:
         None
         """
+        self.set_header('Authorization', self._basic_auth_header(username, password))
+
+    @staticmethod
+    def _basic_auth_header(username, password):
         auth_string = f"{username}:{password}"
         auth_bytes = auth_string.encode('utf-8')
         auth_base64 = base64.b64encode(auth_bytes)
-        auth_header = f"Basic {auth_base64.decode('utf-8')}"
-        self.set_header('Authorization', auth_header)
+        return f"Basic {auth_base64.decode('utf-8')}"
 
     def set_bearer_authentication(self, token):
         """
@@ -312,23 +764,25 @@ class BaseCurl:
         """
         Retrieve the follow location setting for the HTTP request.
 
-        This method returns the follow location setting for the HTTP request. If follow location is enabled, it returns True; otherwise, it returns False.
+        This method returns the follow location setting for the HTTP request: the one staged with set_follow_location(), or the client default. If follow location is enabled, it returns True; otherwise, it returns False.
 
         Returns:
         bool: True if follow location is enabled, False if it is disabled or not set.
         """
-        return self._follow_location
+        follow_location = self._context().follow_location
+        return self._defaults.follow_location if follow_location is UNSET else follow_location
 
     def get_timeout(self):
         """
         Retrieve the timeout value for the HTTP request.
 
-        This method returns the timeout value set for the HTTP request. If no timeout is set, it returns None.
+        This method returns the timeout value set for the HTTP request: the one staged with set_timeout(), or the client default. If no timeout is set, it returns None.
 
         Returns:
         int or None: The timeout value in seconds, if set. Otherwise, None.
         """
-        return self._timeout
+        timeout = self._context().timeout
+        return self._defaults.timeout if timeout is UNSET else timeout
 
     def get_response(self):
         """
@@ -339,7 +793,7 @@ class BaseCurl:
         Returns:
         requests.Response or None: The last HTTP response object, if available. Otherwise, None.
         """
-        return self._response
+        return self._context().response
 
     def get_content(self):
         """
@@ -351,14 +805,15 @@ class BaseCurl:
         None
 
         Returns:
-        bytes: The raw content of the HTTP response.
+        bytes or memoryview: The raw content of the HTTP response, or a read-only memoryview over its temporary file if the body was spooled to disk (see set_body_limits()).
 
         Raises:
         ValueError: If there is no response available to retrieve the content from.
         """
         response = self.get_response()
         if response:
-            return response.content
+            content = response.content
+            return memoryview(content) if is_spooled(content) else content
         else:
             raise ValueError("No hay ninguna respuesta disponible.")
 
@@ -366,41 +821,49 @@ class BaseCurl:
         """
         Process and return the content of the HTTP response based on its content type.
 
-        This method checks the content type of the HTTP response and processes the content accordingly. If the content type is JSON, it attempts to return a JSON object. For HTML or XML content types, it returns the content as text. If the content type is XML, it tries to parse the XML and return an ElementTree object. If none of these conditions are met, it defaults to returning the raw content.
+        This method decodes the content of the HTTP response with the decoder registered for its media type (see register_decoder()). The body is decoded on the first call only: the result is memoized on the response, so later calls return the same object, which should be treated as read-only.
 
         Returns:
-            - A JSON object if the content type is application/json and parsing is successful.
+            With the default decoders:
+            - A JSON object if the media type is application/json or has a +json suffix and parsing is successful.
             - A string containing the response text if the content type is text/html or if JSON/XML parsing fails.
-            - An ElementTree object if the content type is application/xml or text/xml and parsing is successful.
-            - The raw response content for all other content types.
+            - An ElementTree object if the media type is application/xml or text/xml or has a +xml suffix and parsing is successful.
+            - The raw response content for all other content types (a memoryview if it was spooled to disk).
 
         Raises:
             ValueError: If there is no response available to process.
         """
         response = self.get_response()
         if response:
-            content_type = response.headers.get('Content-Type', '')
-
-            if 'application/json' in content_type:
-                try:
-                    return response.json()
-                except ValueError:
-                    # Si la conversión a JSON falla, devolvemos el contenido como texto
-                    return response.text
-            elif 'text/html' in content_type:
-                return response.text
-            elif 'application/xml' in content_type or 'text/xml' in content_type:
-                try:
-                    # Parseamos el contenido XML y devolvemos el objeto XML
-                    return ET.fromstring(response.content)
-                except ET.ParseError:
-                    # Si el parsing falla, devolvemos el contenido como texto
-                    return response.text
-            else:
-                return self.get_content()
+            return self._decoders.decode(response)
         else:
             raise ValueError("No hay ninguna respuesta disponible.")
 
+    def register_decoder(self, media_type, decoder):
+        """
+        Register the function used by response() to decode the bodies of a media type.
+
+        Parameters:
+        - media_type (str): An exact media type ('application/x-msgpack'), a structured syntax suffix ('+cbor') or a wildcard ('text/*'). Exact types take precedence over suffixes, and suffixes over wildcards.
+        - decoder (callable): A function receiving the requests.Response and returning the decoded body. It handles its own errors.
+
+        Returns:
+        None
+        """
+        self._decoders.register(media_type, decoder)
+
+    def unregister_decoder(self, media_type):
+        """
+        Remove the decoder of a media type, so its bodies are returned undecoded (or by a broader decoder).
+
+        Parameters:
+        - media_type (str): The media type given to register_decoder(), or one of the defaults.
+
+        Returns:
+        None
+        """
+        self._decoders.unregister(media_type)
+
     def get_error_code(self):
         """
         Retrieve the HTTP status code from the last response as an error code.
@@ -481,7 +944,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._stream = False
+        self._context().stream = False
 
     def enable_stream(self):
         """
@@ -495,7 +958,7 @@ class BaseCurl:
         Returns:
         None
         """
-        self._stream = True
+        self._context().stream = True
 
     def exec(self, method, url, headers=None, cookies=None, params=None, data=None):
         """
@@ -517,65 +980,97 @@ class BaseCurl:
         Raises:
         Any exceptions raised during the request execution will be handled internally, and may trigger error or complete callbacks if provided.
         """
+        context = self._context()
+        defaults = self._defaults
         parsed_url = urlparse(url)
-        self.set_headers({
-            ':scheme': parsed_url.scheme,
-            ':path': parsed_url.path or '/',
-            ':method': method.upper(),
-            ':host': parsed_url.netloc,
-            'Host': parsed_url.netloc,
-            "Connection": "keep-alive"
-        })
 
-        final_headers = {**self._headers, **(headers or {})}
-        final_cookies = {**self._cookies, **(cookies or {})}
+        # HTTP/2 pseudo-headers (':scheme', ':path', ...) are not valid HTTP/1.1 header names and are rejected by requests
+        final_headers = {
+            **defaults.headers,
+            **context.headers,
+            'Host': parsed_url.netloc,
+            "Connection": "keep-alive",
+            **(headers or {})
+        }
+        final_cookies = {**defaults.cookies, **context.cookies, **(cookies or {})}
 
         request_kwargs = {
             'method': method,
             'url': url,
             'headers': final_headers,
             'cookies': final_cookies,
-            'timeout': self.get_timeout(),
-            'allow_redirects': self.get_follow_location(),
+            'timeout': defaults.timeout if context.timeout is UNSET else context.timeout,
+            'allow_redirects': defaults.follow_location if context.follow_location is UNSET else context.follow_location,
             'params': params,  # Always include params for query string
-            'stream': self._stream  # Enable streaming for response
+            'stream': context.stream  # Enable streaming for response
         }
 
         if method.lower() in ['post', 'put', 'patch']:
-            request_kwargs['json'] = data
+            set_payload(request_kwargs, data)
+
+        # The staged options are consumed by this request; everything below only uses local state
+        self.close()
+        self._dispatch(context, request_kwargs)
+
+    def _dispatch(self, context, request_kwargs):
+        """
+        Send a fully built request through the transport and handle its lifecycle.
 
+        This method runs the callbacks around the transport call and records the response, error and request headers on the given request context. It is shared by exec() and the request templates created by Curl.prepare().
+
+        Parameters:
+        - context (RequestContext): The request context of the calling thread.
+        - request_kwargs (dict): The request keyword arguments (see exec()).
+
+        Returns:
+        None
+        """
         if self.before_send_callback:
             self.before_send_callback(request_kwargs)
 
         try:
-            self._response = self._session.request(**request_kwargs)
+            # The payload is encoded after before_send_callback, which still sees it under 'json'
+            encoded_kwargs = encode_body(request_kwargs, self._json_codec)
+            send = self._transport.send
+            body_limits = self._body_limits
+            if body_limits is not None:
+                send = partial(body_limits.send, send=send)
+            cache = self._cache
+            if cache is not None:
+                send = partial(cache.send, send=send)
+            single_flight = self._single_flight
+            if single_flight is not None:
+                response = single_flight.send(encoded_kwargs, send)
+            else:
+                response = send(encoded_kwargs)
         except requests.RequestException as e:
+            context.response = None
+            context.error = str(e)
             if self.error_callback:
                 self.error_callback(str(e))
-            self.close()
             return
 
-        self._request_headers = final_headers.copy()
-
-        self.close()
+        context.response = response
+        context.error = None
+        context.request_headers = request_kwargs['headers']
 
         if self.after_send_callback:
-            self.after_send_callback(self._response)
+            self.after_send_callback(response)
 
-        if self._response.ok and self.success_callback:
-            self.success_callback(self._response)
+        if response.ok and self.success_callback:
+            self.success_callback(response)
         elif self.error_callback:
-            self.error_callback(self._response)
+            self.error_callback(response)
 
         if self.complete_callback:
-            self.complete_callback(self._response)
+            self.complete_callback(response)
 
     def close(self):
         """
         Close the current session and reset the instance attributes.
 
-        This method resets the instance attributes related to session management, such as follow location, headers, cookies, and timeout.
-        After calling this method, the instance can be re-used for making new requests with a clean state.
+        This method resets the options staged by the calling thread for the next request, such as follow location, headers, cookies, and timeout.
+        After calling this method, the instance can be re-used for making new requests with a clean state. Other threads using the same instance are not affected, and the client defaults set with the set_default_* methods are kept.
 
         Parameters:
         None
@@ -583,7 +1078,4 @@ class BaseCurl:
         Returns:
         None
         """
-        self._follow_location = None
-        self._headers = {}
-        self._cookies = {}
-        self._timeout = None
+        self._context().reset()
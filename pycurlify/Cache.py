@@ -0,0 +1,506 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .Transport import LeanTransport
+
+# Status codes cacheable by default, with heuristic freshness (RFC 9110, section 15.1)
+HEURISTICALLY_CACHEABLE = frozenset((200, 203, 204, 206, 300, 301, 308, 404, 405, 410, 414, 501))
+# Status codes this cache stores when the response carries explicit freshness information
+UNDERSTOOD_STATUS = HEURISTICALLY_CACHEABLE | frozenset((302, 307))
+# Headers of a 304 response that must not replace the stored ones (RFC 9111, section 3.2)
+NOT_UPDATED_ON_304 = frozenset(('content-length', 'content-encoding', 'transfer-encoding', 'content-range'))
+SAFE_METHODS = frozenset(('GET', 'HEAD'))
+# Fraction of the time since Last-Modified used as heuristic freshness lifetime (RFC 9111, section 4.2.2)
+HEURISTIC_FRACTION = 0.1
+# Request headers identifying the user, whose values are part of every variant
+CREDENTIAL_HEADERS = ('Authorization', 'Proxy-Authorization', 'Cookie')
+# The name of the credentials item of the Vary values; the colon keeps it apart from header names
+CREDENTIALS = ':credentials'
+# The name of the redirect policy item of the Vary values, as a redirect is only served to requests not following it
+REDIRECTS = ':redirects'
+
+
+def parse_cache_control(value):
+    """
+    Parse a Cache-Control header into a dictionary.
+
+    Parameters:
+    - value (str or None): The header value.
+
+    Returns:
+    dict: The directives in lower case, mapped to their argument or True when they have none.
+    """
+    directives = {}
+    if not value:
+        return directives
+    for part in value.split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') if argument else True
+    return directives
+
+
+def _seconds(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_date(value):
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class CacheEntry:
+    """
+    A stored response, with everything needed to compute its freshness and rebuild it.
+
+    Attributes:
+        method: The request method.
+        url: The request URL, including the query string.
+        status_code: The HTTP status code.
+        reason: The HTTP reason phrase.
+        headers: The response headers.
+        content: The response body.
+        vary: The values of the request headers named by the Vary response header, followed by the digest of the request credentials and the redirect policy.
+        request_time: When the request was sent (seconds since the epoch).
+        response_time: When the response was received (seconds since the epoch).
+    """
+
+    __slots__ = ('method', 'url', 'status_code', 'reason', 'headers', 'content', 'vary', 'request_time',
+                 'response_time')
+
+    def __init__(self, method, url, status_code, reason, headers, content, vary, request_time, response_time):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.vary = vary
+        self.request_time = request_time
+        self.response_time = response_time
+
+    @property
+    def size(self):
+        return len(self.content) + sum(len(key) + len(value) for key, value in self.headers.items())
+
+    def current_age(self, now):
+        """
+        Compute the age of the stored response (RFC 9111, section 4.2.3).
+
+        Parameters:
+        - now (float): The current time (seconds since the epoch).
+
+        Returns:
+        float: The age in seconds.
+        """
+        date = _http_date(self.headers.get('Date'))
+        apparent_age = max(0.0, self.response_time - date) if date is not None else 0.0
+        age_value = _seconds(self.headers.get('Age')) or 0
+        corrected_age_value = age_value + (self.response_time - self.request_time)
+        corrected_initial_age = max(apparent_age, corrected_age_value)
+        return corrected_initial_age + (now - self.response_time)
+
+    def freshness_lifetime(self):
+        """
+        Compute how long the stored response is fresh (RFC 9111, section 4.2.1).
+
+        Returns:
+        float: The freshness lifetime in seconds (0 when the response must always be revalidated).
+        """
+        directives = parse_cache_control(self.headers.get('Cache-Control'))
+        if 'no-cache' in directives:
+            return 0.0
+        max_age = _seconds(directives.get('max-age'))
+        if max_age is not None:
+            return float(max_age)
+        expires = self.headers.get('Expires')
+        if expires is not None:
+            expires_at = _http_date(expires)
+            if expires_at is None:
+                # An invalid Expires value means the response is already expired
+                return 0.0
+            date = _http_date(self.headers.get('Date')) or self.response_time
+            return max(0.0, expires_at - date)
+        last_modified = _http_date(self.headers.get('Last-Modified'))
+        if last_modified is not None and self.status_code in HEURISTICALLY_CACHEABLE:
+            date = _http_date(self.headers.get('Date')) or self.response_time
+            return max(0.0, (date - last_modified) * HEURISTIC_FRACTION)
+        return 0.0
+
+    def refreshed(self, headers, request_time, response_time):
+        """
+        Build a copy of the entry with updated headers and times, after a successful revalidation.
+
+        Parameters:
+        - headers (dict): The updated response headers.
+        - request_time (float): When the revalidation request was sent.
+        - response_time (float): When the 304 response was received.
+
+        Returns:
+        CacheEntry: The refreshed entry, sharing the stored body.
+        """
+        return CacheEntry(self.method, self.url, self.status_code, self.reason, headers, self.content, self.vary,
+                          request_time, response_time)
+
+    def validators(self):
+        """
+        Build the conditional request headers used to revalidate the stored response.
+
+        Returns:
+        dict: If-None-Match and/or If-Modified-Since headers. Empty if the response has no validator.
+        """
+        headers = {}
+        if 'ETag' in self.headers:
+            headers['If-None-Match'] = self.headers['ETag']
+        if 'Last-Modified' in self.headers:
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+    def to_response(self, now):
+        """
+        Build a requests.Response from the stored response.
+
+        Parameters:
+        - now (float): The current time, used to set the Age header.
+
+        Returns:
+        requests.Response: A new response object sharing the stored body.
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers['Age'] = str(int(self.current_age(now)))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response._content = self.content
+        response._content_consumed = True
+        return response
+
+
+class MemoryStore:
+    """
+    An in-memory LRU store of cache entries, bounded by entry count and total bytes.
+
+    Entries are grouped by key (method and URL); a key holds one entry per Vary variant.
+
+    Parameters:
+    - max_entries (int, optional): The maximum number of entries. Defaults to 1024.
+    - max_bytes (int, optional): The maximum total size of the entries, in bytes. Defaults to 64 MiB.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._count = 0
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Retrieve the variants stored for a key, marking them as recently used.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+
+        Returns:
+        list: The stored CacheEntry variants (empty if none).
+        """
+        variants = self._entries.get(key)
+        if variants is None:
+            return []
+        self._entries.move_to_end(key)
+        return list(variants)
+
+    def put(self, key, entry):
+        """
+        Store an entry, replacing the variant with the same Vary values, and evict entries above the limits.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+        - entry (CacheEntry): The entry to store.
+
+        Returns:
+        None
+        """
+        variants = self._entries.get(key, [])
+        self.remove(key)
+        variants = [variant for variant in variants if variant.vary != entry.vary]
+        if entry.size <= self.max_bytes:
+            variants.append(entry)
+        if not variants:
+            return
+        self._entries[key] = variants
+        self._count += len(variants)
+        self._bytes += sum(variant.size for variant in variants)
+        while self._entries and (self._count > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._count -= len(evicted)
+            self._bytes -= sum(variant.size for variant in evicted)
+            self.evictions += len(evicted)
+
+    def remove(self, key):
+        """
+        Remove all the variants stored for a key.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+
+        Returns:
+        None
+        """
+        variants = self._entries.pop(key, None)
+        if variants:
+            self._count -= len(variants)
+            self._bytes -= sum(variant.size for variant in variants)
+
+    def clear(self):
+        """
+        Remove all the entries.
+
+        Returns:
+        None
+        """
+        self._entries.clear()
+        self._count = 0
+        self._bytes = 0
+
+    def stats(self):
+        """
+        Retrieve the size of the store.
+
+        Returns:
+        dict: The 'entries', 'bytes' and 'evictions' counters.
+        """
+        return {'entries': self._count, 'bytes': self._bytes, 'evictions': self.evictions}
+
+
+class ResponseCache:
+    """
+    An HTTP cache for GET and HEAD requests following the RFC 9111 semantics of a private cache.
+
+    Responses are stored according to Cache-Control (no-store, no-cache, max-age), Expires and heuristic freshness
+    based on Last-Modified, with one variant per value of the request headers named by Vary. Fresh responses are
+    served from the store; stale ones are revalidated with If-None-Match/If-Modified-Since, and a 304 answer refreshes
+    the stored response. Successful unsafe requests (POST, PUT, PATCH, DELETE) invalidate the stored responses of
+    their URL. Streamed requests and requests carrying their own conditional or Range headers bypass the cache.
+
+    The cache is shared by the threads of a client and, with a disk store, by processes, so the credentials of a
+    request (Authorization, Proxy-Authorization and Cookie headers, and cookies) are part of every stored variant: a
+    response is only served to requests carrying the same credentials. So is the redirect policy, as a stored redirect
+    must not be served unfollowed; responses reached through redirects are not stored under the requested URL.
+
+    Parameters:
+    - store (MemoryStore or DiskCache.DiskStore or DiskCache.TieredStore): The store holding the cache entries.
+    """
+
+    BYPASS_HEADERS = ('If-None-Match', 'If-Modified-Since', 'If-Match', 'If-Unmodified-Since', 'If-Range', 'Range')
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+
+    def stats(self):
+        """
+        Retrieve the cache counters.
+
+        Returns:
+        dict: The 'hits', 'misses', 'revalidations' and 'stores' counters, with the store 'entries', 'bytes' and 'evictions'.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'stores': self.stores,
+                **self.store.stats()
+            }
+
+    def clear(self):
+        """
+        Remove all the stored responses.
+
+        Returns:
+        None
+        """
+        with self._lock:
+            self.store.clear()
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _credentials(request_kwargs, request_headers):
+        values = [request_headers.get(name) for name in CREDENTIAL_HEADERS]
+        values.append(sorted((request_kwargs.get('cookies') or {}).items()))
+        if not any(values):
+            return None
+        return hashlib.sha256(repr(values).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _vary_values(names, request_headers, credentials, redirects):
+        values = tuple((name.lower(), request_headers.get(name))
+                       for name in names if name not in (CREDENTIALS, REDIRECTS))
+        return values + ((CREDENTIALS, credentials), (REDIRECTS, redirects))
+
+    @staticmethod
+    def _vary_names(headers):
+        return [name.strip() for name in headers.get('Vary', '').split(',') if name.strip()]
+
+    def send(self, request_kwargs, send):
+        """
+        Send a request through the cache.
+
+        Parameters:
+        - request_kwargs (dict): The request keyword arguments built by BaseCurl.exec().
+        - send (callable): The function sending a request to the network (Transport.send).
+
+        Returns:
+        requests.Response: The stored or the network response.
+
+        Raises:
+        requests.RequestException: If the network request fails.
+        """
+        method = request_kwargs['method'].upper()
+        url = LeanTransport._build_url(request_kwargs['url'], request_kwargs.get('params'))
+
+        if method not in SAFE_METHODS:
+            response = send(request_kwargs)
+            if response.status_code < 400:
+                with self._lock:
+                    for safe_method in SAFE_METHODS:
+                        self.store.remove((safe_method, url))
+            return response
+
+        request_headers = CaseInsensitiveDict(request_kwargs.get('headers') or {})
+        if request_kwargs.get('stream') or any(name in request_headers for name in self.BYPASS_HEADERS):
+            return send(request_kwargs)
+
+        directives = parse_cache_control(request_headers.get('Cache-Control'))
+        if not directives and 'no-cache' in request_headers.get('Pragma', ''):
+            directives = {'no-cache': True}
+
+        key = (method, url)
+        credentials = self._credentials(request_kwargs, request_headers)
+        redirects = bool(request_kwargs.get('allow_redirects', True))
+        with self._lock:
+            variants = self.store.get(key)
+        entry = None
+        for variant in variants:
+            names = [name for name, _ in variant.vary]
+            if self._vary_values(names, request_headers, credentials, redirects) == variant.vary:
+                entry = variant
+                break
+
+        if entry is not None:
+            now = time.time()
+            age = entry.current_age(now)
+            lifetime = entry.freshness_lifetime()
+            max_age = _seconds(directives.get('max-age'))
+            if max_age is not None:
+                lifetime = min(lifetime, max_age)
+            min_fresh = _seconds(directives.get('min-fresh')) or 0
+            if 'no-cache' not in directives and age + min_fresh < lifetime:
+                try:
+                    response = entry.to_response(now)
+                except OSError:
+                    # The body was evicted by another process sharing a disk store
+                    response = None
+                if response is not None:
+                    self._count('hits')
+                    return response
+
+            validators = entry.validators()
+            if validators:
+                conditional = dict(request_kwargs)
+                conditional['headers'] = {**(request_kwargs.get('headers') or {}), **validators}
+                request_time = time.time()
+                response = send(conditional)
+                if response.status_code == 304:
+                    self._count('revalidations')
+                    try:
+                        return self._refresh(key, entry, response, request_time).to_response(time.time())
+                    except OSError:
+                        with self._lock:
+                            self.store.remove(key)
+                        request_time = time.time()
+                        response = send(request_kwargs)
+                self._count('misses')
+                self._store(key, request_headers, credentials, redirects, directives, response, request_time)
+                return response
+
+        self._count('misses')
+        request_time = time.time()
+        response = send(request_kwargs)
+        self._store(key, request_headers, credentials, redirects, directives, response, request_time)
+        return response
+
+    def _refresh(self, key, entry, response, request_time):
+        headers = CaseInsensitiveDict(entry.headers)
+        for name, value in response.headers.items():
+            if name.lower() not in NOT_UPDATED_ON_304:
+                headers[name] = value
+        refreshed = entry.refreshed(headers, request_time, time.time())
+        if 'no-store' in parse_cache_control(headers.get('Cache-Control')):
+            with self._lock:
+                self.store.remove(key)
+        else:
+            with self._lock:
+                self.store.put(key, refreshed)
+        return refreshed
+
+    def _store(self, key, request_headers, credentials, redirects, request_directives, response, request_time):
+        # The final response of a redirect chain belongs to another URL
+        if response.history:
+            return
+        response_directives = parse_cache_control(response.headers.get('Cache-Control'))
+        if 'no-store' in request_directives or 'no-store' in response_directives:
+            with self._lock:
+                self.store.remove(key)
+            return
+
+        vary_names = self._vary_names(response.headers)
+        if '*' in vary_names:
+            return
+
+        explicit = 'max-age' in response_directives or 'Expires' in response.headers
+        if response.status_code not in HEURISTICALLY_CACHEABLE \
+                and not (explicit and response.status_code in UNDERSTOOD_STATUS):
+            return
+
+        entry = CacheEntry(
+            key[0],
+            key[1],
+            response.status_code,
+            response.reason,
+            CaseInsensitiveDict(response.headers),
+            response.content if key[0] != 'HEAD' else b'',
+            self._vary_values(vary_names, request_headers, credentials, redirects),
+            request_time,
+            time.time()
+        )
+        # A response that is never fresh and cannot be revalidated would never be used
+        if entry.freshness_lifetime() <= 0 and not entry.validators():
+            return
+        with self._lock:
+            self.store.put(key, entry)
+            self.stores += 1
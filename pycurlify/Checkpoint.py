@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+
+# Bytes written between two checkpoints of a resumable download
+CHECKPOINT_BYTES = 16 * 1024 * 1024
+
+
+class DownloadCheckpoint:
+    """
+    The persistent state of a resumable download.
+
+    The data is written into a .part file preallocated to the full size; a JSON sidecar next to it (<file>.part.json)
+    records the URL, the size, the validator (strong ETag or Last-Modified) of the remote file and the byte ranges
+    already written. The sidecar is rewritten atomically after the data it covers is flushed to disk, so a crash never
+    marks unwritten bytes as complete.
+
+    Parameters:
+    - part_path (str): The path of the .part file.
+    - url (str): The URL of the download, including the query string.
+    - size (int): The size of the remote file, in bytes.
+    - validator (str or None): The ETag or Last-Modified value used in If-Range when resuming.
+    - ranges (list, optional): The (first byte, last byte) ranges already written. Defaults to none.
+    """
+
+    def __init__(self, part_path, url, size, validator, ranges=()):
+        self.part_path = part_path
+        self.path = part_path + '.json'
+        self.url = url
+        self.size = size
+        self.validator = validator
+        self.ranges = []
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        for start, end in ranges:
+            self._merge(start, end)
+
+    @classmethod
+    def load(cls, part_path, url):
+        """
+        Load the checkpoint of an interrupted download.
+
+        Parameters:
+        - part_path (str): The path of the .part file.
+        - url (str): The URL of the download, including the query string.
+
+        Returns:
+        DownloadCheckpoint or None: The checkpoint, or None if there is none, it belongs to another URL, it has no validator or the .part file does not match it.
+        """
+        try:
+            with open(part_path + '.json', encoding='utf-8') as file:
+                state = json.load(file)
+            if state['url'] != url or not state['validator'] or os.path.getsize(part_path) != state['size']:
+                return None
+            return cls(part_path, url, state['size'], state['validator'], state['ranges'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _merge(self, start, end):
+        ranges = self.ranges
+        index = len(ranges)
+        while index > 0 and ranges[index - 1][0] > start:
+            index -= 1
+        ranges.insert(index, [start, end])
+        # Coalesce the new range with its overlapping or adjacent neighbours
+        index = max(index - 1, 0)
+        while index + 1 < len(ranges):
+            if ranges[index + 1][0] <= ranges[index][1] + 1:
+                ranges[index][1] = max(ranges[index][1], ranges.pop(index + 1)[1])
+            else:
+                index += 1
+
+    def add(self, start, end):
+        """
+        Record a written byte range.
+
+        Parameters:
+        - start (int): The first byte of the range.
+        - end (int): The last byte of the range.
+
+        Returns:
+        bool: True once CHECKPOINT_BYTES were recorded since the last save.
+        """
+        with self._lock:
+            self._merge(start, end)
+            self._unsaved += end - start + 1
+            return self._unsaved >= CHECKPOINT_BYTES
+
+    def completed(self):
+        """
+        Retrieve the number of bytes already written.
+
+        Returns:
+        int: The total size of the recorded ranges.
+        """
+        with self._lock:
+            return sum(end - start + 1 for start, end in self.ranges)
+
+    def missing(self):
+        """
+        Retrieve the byte ranges still to download.
+
+        Returns:
+        list: The (first byte, last byte) ranges not written yet, in order.
+        """
+        with self._lock:
+            missing = []
+            position = 0
+            for start, end in self.ranges:
+                if start > position:
+                    missing.append((position, start - 1))
+                position = max(position, end + 1)
+            if position < self.size:
+                missing.append((position, self.size - 1))
+            return missing
+
+    def save(self, descriptor=None):
+        """
+        Write the sidecar file.
+
+        Parameters:
+        - descriptor (int, optional): The descriptor of the .part file, flushed to disk before the recorded ranges are saved. Defaults to None.
+
+        Returns:
+        None
+        """
+        with self._save_lock:
+            with self._lock:
+                ranges = [list(item) for item in self.ranges]
+                self._unsaved = 0
+            if descriptor is not None:
+                os.fsync(descriptor)
+            state = {'url': self.url, 'size': self.size, 'validator': self.validator, 'ranges': ranges}
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(state, file)
+            os.replace(temporary, self.path)
+
+    def remove(self):
+        """
+        Remove the sidecar file, once the download is complete or restarted.
+
+        Returns:
+        None
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -1,9 +1,132 @@
 import ftplib
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import re
+import threading
+import requests
 from tqdm import tqdm
 
 from .BaseCurl import BaseCurl
+from .Checkpoint import DownloadCheckpoint
+from .EventStream import EventSource
+from .Integrity import IntegrityError, StreamHasher
+from .RequestTemplate import RequestTemplate
+from .JsonStream import check_batch_size, iter_json_items, iter_ndjson_records
+from .Streaming import MIN_CHUNK_SIZE, copy_body, iter_body, splice_body
+from .Transport import LeanTransport
+from .XmlStream import iter_xml_elements
+
+# Default minimum size of a byte range in parallel ranged downloads
+MIN_PART_SIZE = 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+)')
+
+
+def _parse_content_range(value):
+    """
+    Parse a Content-Range header of a 206 response.
+
+    Parameters:
+    - value (str or None): The header value, e.g. 'bytes 0-1023/4096'.
+
+    Returns:
+    tuple or None: The (first byte, last byte, total size), or None if the value is missing, invalid or the total size is unknown.
+    """
+    match = _CONTENT_RANGE.fullmatch(value.strip()) if value else None
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+
+_seek_lock = threading.Lock()
+
+
+class _ProgressCallback:
+    """
+    Stands in for the progress bar of a download, forwarding its updates to a function.
+
+    Parameters:
+    - progress (callable): A function called with the number of bytes written since its previous call and the total size of the file (0 if unknown).
+    - total_size (int): The total size of the file.
+    - initial (int, optional): The bytes already written, reported at once. Defaults to 0.
+    """
+
+    def __init__(self, progress, total_size, initial=0):
+        self.progress = progress
+        self.total_size = total_size
+        self.progress(initial, total_size)
+
+    def update(self, size):
+        self.progress(size, self.total_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def _pwrite(descriptor, data, offset):
+    """
+    Write data at an offset of a file shared by several threads.
+    """
+    while data:
+        if hasattr(os, 'pwrite'):
+            written = os.pwrite(descriptor, data, offset)
+        else:
+            # Windows has no positional write, so the seek and the write must not interleave with other threads
+            with _seek_lock:
+                os.lseek(descriptor, offset, os.SEEK_SET)
+                written = os.write(descriptor, data)
+        data = data[written:]
+        offset += written
+
+
+def _write_range(descriptor, response, start, end, progress, zero_copy=False, hasher=None):
+    """
+    Write a streamed byte range response at its offset of a preallocated file.
+
+    Parameters:
+    - descriptor (int): The file descriptor of the preallocated file.
+    - response (requests.Response): The streamed 206 response.
+    - start (int): The first byte of the range.
+    - end (int): The last byte of the range.
+    - progress (callable): A function called with the offset and the size of the written data, in batches (see Streaming.copy_body()).
+    - zero_copy (bool, optional): Whether to move the body with Streaming.splice_body() when eligible. Defaults to False.
+    - hasher (Integrity.StreamHasher, optional): The hasher of the file; spliced bytes are read back from the file. Defaults to None.
+
+    Returns:
+    None
+
+    Raises:
+    requests.ConnectionError: If the response ends before the last byte of the range.
+    """
+    offset = start
+    reported = start
+    hashing = hasher is not None and hasher.enabled
+
+    def write(chunk):
+        nonlocal offset
+        _pwrite(descriptor, chunk, offset)
+        if hashing:
+            hasher.update_at(offset, chunk)
+        offset += len(chunk)
+
+    def report(size):
+        nonlocal reported
+        progress(reported, size)
+        if hashing and zero_copy:
+            hasher.mark_written(reported, reported + size - 1)
+        reported += size
+
+    copied = splice_body(response, descriptor, start, report) if zero_copy else None
+    if copied is not None:
+        offset = start + copied
+    else:
+        copy_body(response, write, report, size_hint=end - start + 1)
+    if offset != end + 1:
+        raise requests.ConnectionError(f"The range {start}-{end} ended after {offset - start} bytes.")
 
 
 class Curl(BaseCurl):
@@ -23,6 +146,9 @@ class Curl(BaseCurl):
         options(self, url, headers=None, cookies=None, params=None): Sends an OPTIONS request to the specified URL.
         delete(self, url, headers=None, cookies=None, params=None): Sends a DELETE request to the specified URL.
         patch(self, url, headers=None, cookies=None, params=None, data=None): Sends a PATCH request to the specified URL with optional headers, cookies, and data.
+        request_many(self, requests, concurrency=10, ordered=False): Sends a batch of requests concurrently, yielding results as they complete.
+        get_many(self, urls, headers=None, cookies=None, params=None, concurrency=10, ordered=False): Sends a batch of GET requests concurrently.
+        prepare(self, method, url, headers=None, cookies=None): Creates a reusable request template with its invariant parts computed once.
 
     Example Usage:
     ```
@@ -78,7 +204,7 @@ class Curl(BaseCurl):
         - headers (dict, optional): Additional headers to be included in the request.
         - cookies (dict, optional): Cookies to be included in the request.
         - params (dict, optional): Query parameters to be included in the request.
-        - data (dict, optional): The data payload to be sent with the request.
+        - data (dict or object, optional): The JSON payload, or a body streamed without being loaded in memory: a binary file object, a bytes-like object, an iterator of chunks or an Upload.UploadBody.
 
         Returns:
         dict or None: A dictionary containing the response data, including status code, headers, and content,
@@ -101,7 +227,7 @@ class Curl(BaseCurl):
         - headers (dict, optional): Additional headers to be included in the request.
         - cookies (dict, optional): Cookies to be included in the request.
         - params (dict, optional): Query parameters to be included in the request.
-        - data (dict, optional): The data payload to be sent with the request.
+        - data (dict or object, optional): The JSON payload, or a body streamed without being loaded in memory: a binary file object, a bytes-like object, an iterator of chunks or an Upload.UploadBody.
 
         Returns:
         dict or None: A dictionary containing the response data, including status code, headers, and content,
@@ -168,7 +294,7 @@ class Curl(BaseCurl):
         - headers (dict, optional): Additional headers to be included in the request.
         - cookies (dict, optional): Cookies to be included in the request.
         - params (dict, optional): Query parameters to be included in the request.
-        - data (dict, optional): The data payload to be sent with the request.
+        - data (dict or object, optional): The JSON payload, or a body streamed without being loaded in memory: a binary file object, a bytes-like object, an iterator of chunks or an Upload.UploadBody.
 
         Returns:
         dict or None: A dictionary containing the response data, including status code, headers, and content,
@@ -180,10 +306,336 @@ class Curl(BaseCurl):
         self.exec('patch', url, headers=headers, cookies=cookies, params=params, data=data)
         return self.get_response()
 
-    def download_file(self, url, dir_path, file_name, method='get', headers=None, cookies=None, params=None, data=None):
+    def prepare(self, method, url, headers=None, cookies=None):
+        """
+        Creates a reusable request template with its invariant parts computed once.
+
+        This method captures the client defaults and the options staged on the client (headers, cookies, timeout, follow location, streaming), merges them with the given headers and cookies, and returns an immutable RequestTemplate. Calling template.send() with the varying parts (URL fields, params, data) skips the per-call setup of exec(), which matters when the same endpoint is hit millions of times. The staged options are consumed, as by a request.
+
+        Parameters:
+        - method (str): The HTTP method for the request (e.g., 'GET', 'POST').
+        - url (str): The URL, optionally with str.format() fields (e.g., 'https://api.example.com/items/{item_id}').
+        - headers (dict, optional): Additional headers to be included in every request.
+        - cookies (dict, optional): Cookies to be included in every request.
+
+        Returns:
+        RequestTemplate: The request template.
+
+        Example Usage:
+        ```
+        template = curl.prepare('get', 'https://api.example.com/items/{item_id}')
+        response = template.send(item_id=42)
+        ```
+        """
+        context = self._context()
+        options = self._request_options(context)
+        template = RequestTemplate(
+            self,
+            method,
+            url,
+            headers={**options['headers'], **(headers or {})},
+            cookies={**options['cookies'], **(cookies or {})},
+            timeout=options['timeout'],
+            follow_location=options['follow_location'],
+            stream=context.stream
+        )
+        self.close()
+        return template
+
+    def _request_one(self, index, request, staged):
+        """
+        Execute one request of a batch in the calling worker thread.
+
+        Parameters:
+        - index (int): The position of the request in the batch.
+        - request (dict): The request specification.
+        - staged (dict): The options staged by the thread that started the batch.
+
+        Returns:
+        dict: The batch result for this request (see request_many()).
+        """
+        try:
+            self.set_headers(staged['headers'])
+            self.set_cookies(staged['cookies'])
+            self.set_timeout(staged['timeout'])
+            self.set_follow_location(staged['follow_location'])
+            self.exec(
+                request.get('method', 'get'),
+                request['url'],
+                headers=request.get('headers'),
+                cookies=request.get('cookies'),
+                params=request.get('params'),
+                data=request.get('data')
+            )
+            context = self._context()
+            return {'index': index, 'request': request, 'response': context.response, 'error': context.error}
+        except Exception as e:
+            self.close()
+            return {'index': index, 'request': request, 'response': None, 'error': str(e)}
+
+    def request_many(self, requests, concurrency=10, ordered=False):
+        """
+        Sends a batch of requests concurrently over the shared connection pool.
+
+        This method executes the given request specifications with at most `concurrency` requests in flight and yields one result per request. Results are yielded as soon as they complete, or in input order if `ordered` is True. The input iterable is consumed lazily, so arbitrarily large batches can be streamed. A failed request is reported in its result and never aborts the batch.
+
+        The client defaults and the options staged before the call (set_header, set_timeout, ...) apply to every request of the batch. Size the pool with set_pool_config(pool_maxsize=concurrency) to avoid opening overflow connections.
+
+        Parameters:
+        - requests (iterable): Request specifications. Each one is a dict with the keys 'url' (required), 'method' (defaults to 'get'), 'headers', 'cookies', 'params' and 'data', or a URL string for a GET request.
+        - concurrency (int, optional): The maximum number of requests in flight. Defaults to 10.
+        - ordered (bool, optional): Whether to yield results in input order instead of completion order. Defaults to False.
+
+        Yields:
+        dict: A dictionary with the keys 'index' (position in the input), 'request' (the specification), 'response' (requests.Response or None) and 'error' (error message or None).
+
+        Raises:
+        ValueError: If concurrency is lower than 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        staged = self._request_options(self._context())
+        self.close()
+
+        specs = (
+            (index, {'url': request} if isinstance(request, str) else request)
+            for index, request in enumerate(requests)
+        )
+        pending = set()
+        completed = {}
+        next_index = 0
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                while True:
+                    # In ordered mode, results waiting for an earlier one also count against the window
+                    while not exhausted and len(pending) + len(completed) < concurrency:
+                        try:
+                            index, request = next(specs)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        pending.add(executor.submit(self._request_one, index, request, staged))
+
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        if not ordered:
+                            yield result
+                        else:
+                            completed[result['index']] = result
+
+                    while next_index in completed:
+                        yield completed.pop(next_index)
+                        next_index += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_many(self, urls, headers=None, cookies=None, params=None, concurrency=10, ordered=False):
+        """
+        Sends a batch of GET requests concurrently.
+
+        This method is a shortcut for request_many() where every URL is fetched with GET and the same headers, cookies and query parameters.
+
+        Parameters:
+        - urls (iterable): The URLs to which the GET requests will be sent.
+        - headers (dict, optional): Additional headers to be included in every request.
+        - cookies (dict, optional): Cookies to be included in every request.
+        - params (dict, optional): Query parameters to be included in every request.
+        - concurrency (int, optional): The maximum number of requests in flight. Defaults to 10.
+        - ordered (bool, optional): Whether to yield results in input order instead of completion order. Defaults to False.
+
+        Yields:
+        dict: One result per URL, as described in request_many().
+        """
+        requests = (
+            {'method': 'get', 'url': url, 'headers': headers, 'cookies': cookies, 'params': params}
+            for url in urls
+        )
+        return self.request_many(requests, concurrency=concurrency, ordered=ordered)
+
+    def _open_stream(self, method, url, headers=None, cookies=None, params=None, data=None):
+        """
+        Send a streamed request whose body is consumed incrementally by a parser.
+
+        Parameters:
+        - method (str): The HTTP method for the request.
+        - url (str): The URL to which the request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict, optional): The payload of POST, PUT and PATCH requests.
+
+        Returns:
+        requests.Response: The streamed response, with a successful status.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        requests.HTTPError: If the response has an error status. The response is closed.
+        """
+        self.enable_stream()
+        try:
+            self.exec(method, url, headers=headers, cookies=cookies, params=params, data=data)
+        finally:
+            self.disable_stream()
+        response = self.get_response()
+        if response is None:
+            raise requests.ConnectionError(self._context().error)
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
+        return response
+
+    def iter_json(self, url, path='item', method='get', headers=None, cookies=None, params=None, data=None,
+                  chunk_size=MIN_CHUNK_SIZE):
+        """
+        Stream a JSON document and yield the values found at a path, one at a time.
+
+        The body is parsed incrementally as it is read from the socket (see JsonStream.JsonItemParser), and each value
+        at the path is decoded with the JSON codec of the client (see set_json_codec()) as soon as it is complete. Only
+        the value being read is held in memory, so arrays of any size can be consumed. The request is sent when the
+        iteration starts; stopping the iteration early closes the connection.
+
+        Parameters:
+        - url (str): The URL of the document.
+        - path (str, optional): The path of the values, in ijson prefix notation: keys and 'item' for array elements, joined with dots (e.g. 'items.item' for the elements of the 'items' array of a top-level object). Defaults to 'item' (the elements of a top-level array).
+        - method (str, optional): The HTTP method for the request. Defaults to 'get'.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict, optional): The payload of POST, PUT and PATCH requests.
+        - chunk_size (int, optional): The maximum size of the reads from the connection. Defaults to 64 KiB.
+
+        Yields:
+        object: The decoded values, in document order.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        requests.HTTPError: If the response has an error status.
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON or is truncated.
+        """
+        response = self._open_stream(method, url, headers, cookies, params, data)
+        chunks = iter_body(response, chunk_size)
+        try:
+            yield from iter_json_items(chunks, path, self._json_codec)
+        finally:
+            chunks.close()
+
+    def iter_ndjson(self, url, batch_size=None, method='get', headers=None, cookies=None, params=None, data=None,
+                    chunk_size=MIN_CHUNK_SIZE):
+        """
+        Stream a newline-delimited JSON (NDJSON, JSON Lines) body and yield its records as their lines arrive.
+
+        Lines are split on the received bytes without copying them, and each record is decoded with the JSON codec of
+        the client (see set_json_codec()). Only the incomplete last line is buffered, so memory is constant however
+        long the stream runs. The request is sent when the iteration starts; stopping the iteration early closes the
+        connection.
+
+        Parameters:
+        - url (str): The URL of the stream.
+        - batch_size (int, optional): Yield lists of up to this many records instead of single records. Defaults to None.
+        - method (str, optional): The HTTP method for the request. Defaults to 'get'.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict, optional): The payload of POST, PUT and PATCH requests.
+        - chunk_size (int, optional): The maximum size of the reads from the connection. Defaults to 64 KiB.
+
+        Yields:
+        object or list: The decoded records, or lists of batch_size records (the last one possibly shorter).
+
+        Raises:
+        ValueError: If batch_size is neither None nor an integer of at least 1, before any request is sent.
+        requests.RequestException: If the request fails.
+        requests.HTTPError: If the response has an error status.
+        requests.exceptions.JSONDecodeError: If a line is not valid JSON.
+        """
+        check_batch_size(batch_size)
+        response = self._open_stream(method, url, headers, cookies, params, data)
+        chunks = iter_body(response, chunk_size)
+        try:
+            yield from iter_ndjson_records(chunks, self._json_codec, batch_size)
+        finally:
+            chunks.close()
+
+    def iter_xml(self, url, path, method='get', headers=None, cookies=None, params=None, data=None,
+                 chunk_size=MIN_CHUNK_SIZE):
+        """
+        Stream an XML document and yield the elements matching a path as soon as they are complete.
+
+        The body is fed to an incremental parser as it is read from the socket (see XmlStream.XmlElementParser), and
+        every processed subtree is detached from the document, so feeds of any size are consumed with flat memory,
+        unlike response(), which parses the whole body at once. The request is sent when the iteration starts;
+        stopping the iteration early closes the connection.
+
+        Parameters:
+        - url (str): The URL of the document.
+        - path (str): The tag of the elements ('item', '{http://www.w3.org/2005/Atom}entry', '{*}entry') or a simple path of tags ('channel/item', '/rss/channel/item').
+        - method (str, optional): The HTTP method for the request. Defaults to 'get'.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict, optional): The payload of POST, PUT and PATCH requests.
+        - chunk_size (int, optional): The maximum size of the reads from the connection. Defaults to 64 KiB.
+
+        Yields:
+        xml.etree.ElementTree.Element: The matching elements, complete.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        requests.HTTPError: If the response has an error status.
+        xml.etree.ElementTree.ParseError: If the body is not well-formed XML or is truncated.
+        """
+        response = self._open_stream(method, url, headers, cookies, params, data)
+        chunks = iter_body(response, chunk_size)
+        try:
+            yield from iter_xml_elements(chunks, path)
+        finally:
+            chunks.close()
+
+    def event_source(self, url, headers=None, cookies=None, params=None, last_event_id='', retry=3.0,
+                     max_retries=None):
+        """
+        Create a Server-Sent Events consumer for a text/event-stream URL.
+
+        Iterating over the returned EventSource yields the events as they arrive, parsed incrementally from the
+        socket; its run() method dispatches them to callbacks registered with on() instead. Dropped connections are
+        reestablished after the reconnection time, which the server may set with a retry field, with a Last-Event-ID
+        header so the server can resume the stream. The options staged on the client apply to every connection.
+
+        Parameters:
+        - url (str): The URL of the stream.
+        - headers (dict, optional): Additional headers to be included in the requests.
+        - cookies (dict, optional): Cookies to be included in the requests.
+        - params (dict, optional): Query parameters to be included in the requests.
+        - last_event_id (str, optional): The ID of the last event already received, to resume a stream. Defaults to ''.
+        - retry (float, optional): The reconnection time in seconds, until the server sets one. Defaults to 3.0.
+        - max_retries (int, optional): The number of consecutive reconnections without receiving an event after which the iteration gives up. Defaults to None (never).
+
+        Returns:
+        EventStream.EventSource: The event source; see its stats() for the throughput, reconnections and lag.
+        """
+        return EventSource(self, url, headers=headers, cookies=cookies, params=params, last_event_id=last_event_id,
+                           retry=retry, max_retries=max_retries)
+
+    def download_file(self, url, dir_path, file_name, method='get', headers=None, cookies=None, params=None, data=None,
+                      connections=1, min_part_size=MIN_PART_SIZE, resume=False, zero_copy=False, digests=None,
+                      on_mismatch='delete', progress=None):
         """
         Downloads a file from the specified URL and saves it to the specified directory.
 
+        With connections > 1 (GET only), the file is fetched in byte ranges over several connections in parallel. The first range request doubles as a probe: if the server answers 206 Partial Content, the remaining bytes are split into ranges fetched concurrently and written at their offsets into a preallocated file, with If-Range guarding against the file changing between requests. If the server ignores the Range header, its full response is downloaded as a single stream. The connection pool should allow as many connections per host (see set_pool_config()).
+
+        With resume=True (GET only), the data is written to '<file_name>.part' and the completed byte ranges and the validator (ETag or Last-Modified) of the remote file are checkpointed in '<file_name>.part.json'. A failed download keeps both files, and the next call with resume=True only requests the missing ranges, with If-Range; if the remote file changed meanwhile, the server answers with the full file and the download restarts from zero. The .part file is renamed to the file name once complete.
+
+        The file is hashed while it is written, so verifying it needs no second pass over the disk. The digests requested with digests, and those announced by the Content-MD5, Digest (RFC 3230) or Repr-Digest (RFC 9530) headers of the response when present, are computed and returned in 'digests'. If one differs from its expected value, the file is deleted or quarantined (see on_mismatch) and None is returned.
+
         Parameters:
         - url (str): The URL from which to download the file.
         - dir_path (str): The directory path where the file will be saved.
@@ -193,23 +645,45 @@ class Curl(BaseCurl):
         - cookies (dict, optional): Cookies to be included in the request.
         - params (dict, optional): Query parameters to be included in the request.
         - data (dict, optional): The data payload to be sent with the request.
+        - connections (int, optional): The maximum number of parallel connections. Defaults to 1 (single stream).
+        - min_part_size (int, optional): The minimum size of a byte range, in bytes. Files no larger than this are fetched by the probe request alone. Defaults to 1 MiB.
+        - resume (bool, optional): Whether to checkpoint the download and resume an interrupted one. Defaults to False.
+        - zero_copy (bool, optional): Whether to move plain HTTP bodies from the socket to the file in the kernel with os.splice() (Linux), without copying them through Python. TLS, compressed or chunked responses, other platforms and the curl transport fall back to the regular copy. When hashing, spliced bytes are read back from the page cache. Defaults to False.
+        - digests (list or dict, optional): The digest algorithms to compute (e.g. ['sha256']), or a dict of {algorithm: expected hexadecimal digest}, where None only computes the digest. Defaults to None.
+        - on_mismatch (str, optional): What to do with a file that does not match an expected digest: 'delete' it or 'quarantine' it by renaming it to '<file_name>.quarantine'. Defaults to 'delete'.
+        - progress (callable, optional): A function called with the number of bytes written since its previous call and the total size of the file (0 if unknown), instead of displaying a progress bar. It is first called with the bytes reused from an interrupted download. Defaults to None.
 
         Returns:
-        dict or None: A dictionary containing information about the downloaded file, including its path and size,
-                      or None if the file could not be downloaded.
+        dict or None: A dictionary containing information about the downloaded file, including its path, size,
+                      the number of 'connections' used, the number of 'resumed_bytes' reused from an interrupted
+                      download and the computed 'digests' ({algorithm: hexadecimal digest}), or None if the file
+                      could not be downloaded or did not match an expected digest.
 
         Raises:
         FileNotFoundError: If the specified directory does not exist.
-        ValueError: If an unsupported HTTP method is provided. Only 'get' and 'post' are supported.
+        ValueError: If an unsupported HTTP method, digest algorithm or on_mismatch action is provided. Only 'get' and 'post' are supported.
         """
+        file_path = None
+        ranged = method.lower() == 'get' and (connections > 1 or resume)
         try:
             # Check if the specified directory exists
             if not os.path.exists(dir_path):
                 raise FileNotFoundError(f"The specified directory '{dir_path}' does not exist.")
+            if on_mismatch not in ('delete', 'quarantine'):
+                raise ValueError("Unsupported on_mismatch action. Only 'delete' and 'quarantine' are supported.")
+            if isinstance(digests, dict):
+                hasher = StreamHasher(digests, expected=digests)
+            else:
+                hasher = StreamHasher(digests or ())
 
             # Create the full file path
             file_path = os.path.join(dir_path, file_name)
 
+            if ranged:
+                result = self._download_ranges(url, file_path, headers, cookies, params, connections, min_part_size,
+                                               resume, zero_copy, hasher, progress)
+                return self._verify_file(result, hasher, on_mismatch)
+
             # Enable streaming for the request
             self.enable_stream()
 
@@ -221,29 +695,15 @@ class Curl(BaseCurl):
             else:
                 raise ValueError("Unsupported HTTP method. Only 'get' and 'post' are supported.")
 
-            # Get the total size of the file to download
-            total_size = int(response.headers.get('content-length', 0))
-
-            # Write the downloaded data to the file while displaying a progress bar
-            with open(file_path, 'wb') as file, tqdm(
-                    desc="Downloading",
-                    total=total_size,
-                    unit='B',
-                    unit_scale=True,
-                    unit_divisor=1024,
-                    bar_format="{l_bar}{bar}{r_bar}",
-                    colour='green'
-            ) as bar:
-                for data in response.iter_content(chunk_size=1024):
-                    file.write(data)
-                    bar.update(len(data))
+            total_size = self._write_stream(response, file_path, zero_copy, hasher, progress)
 
             # Check if the file was successfully downloaded
             if os.path.exists(file_path):
                 # Disable streaming after the download is complete
                 self.disable_stream()
                 # Return information about the downloaded file
-                return {'file_path': file_path, 'file_size': total_size}
+                result = {'file_path': file_path, 'file_size': total_size, 'connections': 1, 'resumed_bytes': 0}
+                return self._verify_file(result, hasher, on_mismatch)
             else:
                 # Disable streaming if the file could not be downloaded
                 self.disable_stream()
@@ -251,10 +711,305 @@ class Curl(BaseCurl):
         except Exception as e:
             # Disable streaming in case of any exception
             self.disable_stream()
+            # Recorded as for a failed request, so callers running downloads in worker threads can report it
+            self._context().error = str(e)
+            # A ranged download never leaves a partial file behind, unless it is kept to be resumed
+            if ranged and not resume and file_path is not None and os.path.exists(file_path):
+                os.remove(file_path)
             # Handle the exception
             print(f"An error occurred while downloading the file: {str(e)}")
             return None
 
+    @staticmethod
+    def _verify_file(result, hasher, on_mismatch):
+        """
+        Check a downloaded file against its expected digests.
+
+        Parameters:
+        - result (dict): The downloaded file information (see download_file()).
+        - hasher (Integrity.StreamHasher): The hasher fed with the file while it was written.
+        - on_mismatch (str): 'delete' or 'quarantine'.
+
+        Returns:
+        dict: The downloaded file information, with its 'digests'.
+
+        Raises:
+        Integrity.IntegrityError: If the file does not match an expected digest, once it is deleted or quarantined.
+        """
+        try:
+            result['digests'] = hasher.verify()
+        except IntegrityError:
+            if on_mismatch == 'quarantine':
+                os.replace(result['file_path'], result['file_path'] + '.quarantine')
+            else:
+                os.remove(result['file_path'])
+            raise
+        return result
+
+    @staticmethod
+    def _progress_bar(total_size, initial=0, progress=None):
+        if progress is not None:
+            return _ProgressCallback(progress, total_size, initial)
+        return tqdm(
+            desc="Downloading",
+            total=total_size,
+            initial=initial,
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+            bar_format="{l_bar}{bar}{r_bar}",
+            colour='green'
+        )
+
+    def _write_stream(self, response, file_path, zero_copy=False, hasher=None, progress=None):
+        """
+        Write a streamed response to a file while displaying a progress bar.
+
+        Parameters:
+        - response (requests.Response): The streamed response.
+        - file_path (str): The path of the file to write.
+        - zero_copy (bool, optional): Whether to move the body with Streaming.splice_body() when eligible. Defaults to False.
+        - hasher (Integrity.StreamHasher, optional): The hasher fed with the body; it expects the digests announced by the response headers. Defaults to None.
+        - progress (callable, optional): A function replacing the progress bar (see download_file()). Defaults to None.
+
+        Returns:
+        int: The size announced by the Content-Length header (0 if absent).
+        """
+        # Get the total size of the file to download
+        total_size = int(response.headers.get('content-length', 0))
+
+        if hasher is not None:
+            hasher.reset()
+            hasher.expect_headers(response.headers)
+            hasher.path = file_path
+
+        # Write the downloaded data to the file while displaying a progress bar
+        with open(file_path, 'wb') as file, self._progress_bar(total_size, progress=progress) as bar:
+            if hasher is None or not hasher.enabled:
+                write, report = file.write, bar.update
+            else:
+                def write(chunk):
+                    file.write(chunk)
+                    hasher.update(chunk)
+
+                def report(size):
+                    # Spliced bytes are already in the file, and hashed from the page cache
+                    bar.update(size)
+                    hasher.mark_written(hasher.position, hasher.position + size - 1)
+
+            if not zero_copy or splice_body(response, file.fileno(), 0, report) is None:
+                copy_body(response, write, bar.update, size_hint=total_size or None)
+        return total_size
+
+    def _fetch_range(self, url, headers, cookies, params, staged, start, end):
+        """
+        Request a byte range in the calling worker thread.
+
+        Parameters:
+        - url (str): The URL from which to download the file.
+        - headers (dict): The headers of the range requests, including If-Range.
+        - cookies (dict): Cookies to be included in the request.
+        - params (dict): Query parameters to be included in the request.
+        - staged (dict): The options staged by the thread that started the download.
+        - start (int): The first byte of the range.
+        - end (int): The last byte of the range.
+
+        Returns:
+        requests.Response: The streamed 206 response.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        """
+        self.set_headers(staged['headers'])
+        self.set_cookies(staged['cookies'])
+        self.set_timeout(staged['timeout'])
+        self.set_follow_location(staged['follow_location'])
+        self.enable_stream()
+        try:
+            response = self.get(url, headers={**headers, 'Range': f'bytes={start}-{end}'}, cookies=cookies,
+                                params=params)
+        finally:
+            self.disable_stream()
+        if response is None:
+            raise requests.ConnectionError(self._context().error)
+        return response
+
+    def _download_ranges(self, url, file_path, headers, cookies, params, connections, min_part_size, resume,
+                         zero_copy=False, hasher=None, progress=None):
+        """
+        Download a file in byte ranges over parallel connections, optionally resuming an interrupted download (see download_file()).
+
+        Parameters:
+        - url (str): The URL from which to download the file.
+        - file_path (str): The path of the file to write.
+        - headers (dict): Additional headers to be included in the requests.
+        - cookies (dict): Cookies to be included in the requests.
+        - params (dict): Query parameters to be included in the requests.
+        - connections (int): The maximum number of parallel connections.
+        - min_part_size (int): The minimum size of a byte range, in bytes.
+        - resume (bool): Whether to checkpoint the download in a .part file and resume it.
+        - zero_copy (bool, optional): Whether to move the bodies with os.splice() when eligible. Defaults to False.
+        - hasher (Integrity.StreamHasher, optional): The hasher fed with the whole file, including resumed ranges. Defaults to None.
+        - progress (callable, optional): A function replacing the progress bar (see download_file()). Defaults to None.
+
+        Returns:
+        dict: The downloaded file information (see download_file()).
+
+        Raises:
+        requests.RequestException: If a request fails.
+        ValueError: If the server does not return a requested range, e.g. because the file changed.
+        """
+        staged = self._request_options(self._context())
+        # Ranges are byte offsets of the stored representation, so it must not be content-coded
+        headers = {'Accept-Encoding': 'identity', **(headers or {})}
+        target = file_path + '.part' if resume else file_path
+        checkpoint = None
+        if resume:
+            checkpoint = DownloadCheckpoint.load(target, LeanTransport._build_url(url, params))
+        missing = checkpoint.missing() if checkpoint is not None else [(0, None)]
+        if not missing:
+            missing = [(checkpoint.size - 1, checkpoint.size - 1)]
+
+        # The probe fetches the first missing range; a server without range support, or whose file changed since the
+        # checkpoint (If-Range), answers with the whole file
+        first_start, first_end = missing[0]
+        if connections > 1:
+            probe_end = first_start + min_part_size - 1
+            if first_end is not None:
+                probe_end = min(probe_end, first_end)
+        else:
+            probe_end = first_end if first_end is not None else ''
+        probe_headers = {**headers, 'Range': f'bytes={first_start}-{probe_end}'}
+        if checkpoint is not None:
+            probe_headers['If-Range'] = checkpoint.validator
+        self.enable_stream()
+        probe = self.get(url, headers=probe_headers, cookies=cookies, params=params)
+        self.disable_stream()
+        if probe is None:
+            raise requests.ConnectionError(self._context().error)
+
+        if probe.status_code == 416 and probe.headers.get('Content-Range', '').replace(' ', '') == 'bytes*/0':
+            # No range of an empty file is satisfiable
+            probe.close()
+            open(file_path, 'wb').close()
+            if checkpoint is not None:
+                os.remove(target)
+                checkpoint.remove()
+            return {'file_path': file_path, 'file_size': 0, 'connections': 1, 'resumed_bytes': 0}
+
+        content_range = _parse_content_range(probe.headers.get('Content-Range')) if probe.status_code == 206 else None
+        etag = probe.headers.get('ETag')
+        validator = etag if etag and not etag.startswith('W/') else probe.headers.get('Last-Modified')
+
+        if content_range is None or content_range[0] != first_start \
+                or (checkpoint is not None and content_range[2] != checkpoint.size):
+            probe.raise_for_status()
+            if probe.status_code == 206:
+                # A partial body of other bytes than requested must not be written as the whole file
+                probe.close()
+                raise ValueError(f"The server did not return the bytes {first_start}-{probe_end} (unexpected "
+                                 f"Content-Range {probe.headers.get('Content-Range')!r}); the file may have changed.")
+            if checkpoint is not None:
+                # The remote file changed: the interrupted download is discarded
+                checkpoint.remove()
+                checkpoint = None
+            length = probe.headers.get('Content-Length')
+            if not resume or length is None or probe.headers.get('Content-Encoding', 'identity') != 'identity':
+                total_size = self._write_stream(probe, target, zero_copy, hasher, progress)
+                if resume:
+                    os.replace(target, file_path)
+                return {'file_path': file_path, 'file_size': total_size, 'connections': 1, 'resumed_bytes': 0}
+            # A full response can still be checkpointed, and resumed later if the server supports ranges
+            total_size = int(length)
+            checkpoint = DownloadCheckpoint(target, LeanTransport._build_url(url, params), total_size, validator)
+            jobs = [(probe, 0, total_size - 1)]
+            resumed_bytes = 0
+            preallocate = True
+        else:
+            total_size = content_range[2]
+            if checkpoint is None:
+                if resume:
+                    checkpoint = DownloadCheckpoint(target, LeanTransport._build_url(url, params), total_size,
+                                                    validator)
+                missing = [(0, total_size - 1)]
+                preallocate = True
+            else:
+                preallocate = False
+            resumed_bytes = checkpoint.completed() if checkpoint is not None and not preallocate else 0
+
+            # The probe covers the start of the first missing range; the rest is split between the connections
+            probe_end = content_range[1]
+            missing[0] = (probe_end + 1, missing[0][1])
+            missing = [(start, end) for start, end in missing if start <= end]
+            remaining = sum(end - start + 1 for start, end in missing)
+            part_size = max(min_part_size, -(-remaining // connections)) if remaining > 0 else 1
+            jobs = [(probe, first_start, probe_end)]
+            jobs += [(None, start, min(start + part_size - 1, end))
+                     for range_start, end in missing for start in range(range_start, end + 1, part_size)]
+
+        if checkpoint is not None:
+            # A 206 response may omit the validators, which If-Range then takes from the checkpoint
+            if validator:
+                checkpoint.validator = validator
+            else:
+                validator = checkpoint.validator
+        if validator:
+            headers['If-Range'] = validator
+
+        if preallocate:
+            with open(target, 'wb') as file:
+                file.truncate(total_size)
+        if hasher is not None:
+            # Content-MD5 of a 206 response only covers the range, the other digests cover the whole file
+            hasher.expect_headers(probe.headers, partial=probe.status_code == 206)
+            hasher.path = target
+            if not preallocate:
+                for start, end in checkpoint.ranges:
+                    hasher.mark_written(start, end)
+        descriptor = os.open(target, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+        bar_lock = threading.Lock()
+        workers = min(connections, len(jobs))
+        try:
+            with self._progress_bar(total_size, resumed_bytes, progress) as bar:
+                def advance(offset, size):
+                    with bar_lock:
+                        bar.update(size)
+                    if checkpoint is not None and checkpoint.add(offset, offset + size - 1):
+                        checkpoint.save(descriptor)
+
+                def fetch(response, start, end):
+                    if response is None:
+                        response = self._fetch_range(url, headers, cookies, params, staged, start, end)
+                        if response.status_code != 206 or _parse_content_range(
+                                response.headers.get('Content-Range')) != (start, end, total_size):
+                            response.close()
+                            raise ValueError(
+                                f"The server did not return the bytes {start}-{end}; the file may have changed.")
+                    _write_range(descriptor, response, start, end, advance, zero_copy, hasher)
+
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(fetch, *job) for job in jobs]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        # The ranges not started yet are abandoned; the running ones complete
+                        for future in futures:
+                            future.cancel()
+                        raise
+        except BaseException:
+            if checkpoint is not None:
+                checkpoint.save(descriptor)
+            raise
+        finally:
+            os.close(descriptor)
+
+        if checkpoint is not None:
+            os.replace(target, file_path)
+            checkpoint.remove()
+        return {'file_path': file_path, 'file_size': total_size, 'connections': workers,
+                'resumed_bytes': resumed_bytes}
+
     async def upload_ftp(self, local_file_path, remote_path, ftp_host, ftp_port=21, ftp_username='', ftp_password='',
                          passive=True):
         """
@@ -0,0 +1,233 @@
+import xml.etree.ElementTree as ET
+
+from .JsonCodec import JsonCodec
+from .JsonStream import NdjsonParser
+from .Spool import is_spooled
+
+# Number of distinct Content-Type values whose decoder is remembered by a registry
+MAX_RESOLVED = 1024
+
+
+class JsonDecoder:
+    """
+    Decodes JSON bodies with a JSON codec (see JsonCodec), falling back to their text if they are not valid JSON.
+
+    UTF-8 bodies are handed to the codec as bytes, without building a str first; bodies declaring another charset
+    are decoded to text first.
+
+    Parameters:
+    - codec (object): The JSON codec.
+    """
+
+    def __init__(self, codec):
+        self.codec = codec
+
+    def __call__(self, response):
+        content = response.content
+        encoding = (response.encoding or 'utf-8').lower().replace('-', '').replace('_', '')
+        try:
+            if encoding != 'utf8':
+                return self.codec.loads(response.text)
+            return self.codec.loads(memoryview(content) if is_spooled(content) else content)
+        except ValueError:
+            return response.text
+
+
+class NdjsonDecoder(JsonDecoder):
+    """
+    Decodes newline-delimited JSON (NDJSON, JSON Lines) bodies into the list of their records with a JSON codec.
+
+    Invalid records make the whole body fall back to its text. Use Curl.iter_ndjson() to consume long streams record
+    by record instead.
+
+    Parameters:
+    - codec (object): The JSON codec.
+    """
+
+    def __call__(self, response):
+        parser = NdjsonParser(self.codec)
+        try:
+            records = parser.feed(response.content)
+            return records + parser.close()
+        except ValueError:
+            return response.text
+
+
+decode_json = JsonDecoder(JsonCodec())
+decode_ndjson = NdjsonDecoder(JsonCodec())
+
+
+def decode_text(response):
+    """
+    Decode a body as text.
+    """
+    return response.text
+
+
+def decode_xml(response):
+    """
+    Parse an XML body into an Element, falling back to its text if it is not well-formed.
+    """
+    try:
+        return ET.fromstring(response.content)
+    except ET.ParseError:
+        return response.text
+
+
+def decode_raw(response):
+    """
+    Return the body undecoded: bytes, or a memoryview if it was spooled to disk (see Spool.BodyLimits).
+    """
+    content = response.content
+    return memoryview(content) if is_spooled(content) else content
+
+
+DEFAULT_DECODERS = {
+    'application/json': decode_json,
+    '+json': decode_json,
+    'application/x-ndjson': decode_ndjson,
+    'application/ndjson': decode_ndjson,
+    'application/jsonl': decode_ndjson,
+    'application/x-jsonlines': decode_ndjson,
+    'text/html': decode_text,
+    'application/xml': decode_xml,
+    'text/xml': decode_xml,
+    '+xml': decode_xml,
+}
+
+
+class DecoderRegistry:
+    """
+    Maps media types to the functions decoding the bodies of responses.
+
+    A decoder is a function receiving the requests.Response and returning the decoded body; it handles its own
+    fallbacks. Keys are exact media types ('application/json'), structured syntax suffixes ('+json' matches
+    'application/problem+json') or wildcards ('text/*'), tried in that order; bodies matching none are returned
+    undecoded. The decoder of every Content-Type value seen is remembered, so a lookup is a single dictionary access.
+
+    Parameters:
+    - decoders (dict, optional): The {media type: decoder} mapping. Defaults to DEFAULT_DECODERS.
+    - default (callable, optional): The decoder of the other media types. Defaults to decode_raw.
+    - json_codec (object, optional): The codec of the JSON decoders of the mapping (see set_json_codec()). Defaults to None (the codec they were built with).
+    """
+
+    def __init__(self, decoders=None, default=decode_raw, json_codec=None):
+        self._decoders = {self._normalize(key): decoder
+                          for key, decoder in (DEFAULT_DECODERS if decoders is None else decoders).items()}
+        self.default = default
+        self._resolved = {}
+        if json_codec is not None:
+            self.set_json_codec(json_codec)
+
+    @staticmethod
+    def _normalize(media_type):
+        return media_type.strip().lower()
+
+    def copy(self):
+        """
+        Create an independent registry with the same decoders.
+
+        Returns:
+        DecoderRegistry: The copy.
+        """
+        return DecoderRegistry(self._decoders, self.default)
+
+    def set_json_codec(self, codec):
+        """
+        Make the JSON decoders of the registry (JsonDecoder and NdjsonDecoder instances) use a codec. Other decoders are kept.
+
+        Parameters:
+        - codec (object): The JSON codec.
+
+        Returns:
+        None
+        """
+        replacements = {}
+        for media_type, previous in list(self._decoders.items()):
+            if isinstance(previous, JsonDecoder):
+                decoder_class = type(previous)
+                if decoder_class not in replacements:
+                    replacements[decoder_class] = decoder_class(codec)
+                self._decoders[media_type] = replacements[decoder_class]
+        self._resolved = {}
+
+    def register(self, media_type, decoder):
+        """
+        Register the decoder of a media type, replacing the previous one.
+
+        Parameters:
+        - media_type (str): An exact media type, a '+suffix' or a 'type/*' wildcard.
+        - decoder (callable): The function decoding a requests.Response.
+
+        Returns:
+        None
+        """
+        self._decoders[self._normalize(media_type)] = decoder
+        self._resolved = {}
+
+    def unregister(self, media_type):
+        """
+        Remove the decoder of a media type, if any.
+
+        Parameters:
+        - media_type (str): The key given to register().
+
+        Returns:
+        None
+        """
+        self._decoders.pop(self._normalize(media_type), None)
+        self._resolved = {}
+
+    def _lookup(self, content_type):
+        media_type = content_type.partition(';')[0].strip().lower()
+        decoders = self._decoders
+        decoder = decoders.get(media_type)
+        if decoder is not None:
+            return decoder
+        main_type, _, subtype = media_type.partition('/')
+        _, plus, suffix = subtype.rpartition('+')
+        if plus:
+            decoder = decoders.get('+' + suffix)
+            if decoder is not None:
+                return decoder
+        return decoders.get(main_type + '/*', self.default)
+
+    def resolve(self, content_type):
+        """
+        Find the decoder of a Content-Type header value.
+
+        Parameters:
+        - content_type (str): The header value, parameters included.
+
+        Returns:
+        callable: The decoder.
+        """
+        decoder = self._resolved.get(content_type)
+        if decoder is None:
+            decoder = self._lookup(content_type)
+            resolved = self._resolved
+            if len(resolved) >= MAX_RESOLVED:
+                resolved = self._resolved = {}
+            resolved[content_type] = decoder
+        return decoder
+
+    def decode(self, response):
+        """
+        Decode the body of a response, once.
+
+        The result is memoized on the response with the decoder that produced it, so later calls return the same
+        object (to be treated as read-only) unless the decoder of its media type changed meanwhile.
+
+        Parameters:
+        - response (requests.Response): The response.
+
+        Returns:
+        object: The decoded body.
+        """
+        decoder = self.resolve(response.headers.get('Content-Type', ''))
+        memo = response.__dict__.get('_decoded')
+        if memo is not None and memo[0] is decoder:
+            return memo[1]
+        decoded = decoder(response)
+        response._decoded = (decoder, decoded)
+        return decoded
@@ -0,0 +1,43 @@
+from types import MappingProxyType
+
+
+class Defaults:
+    """
+    An immutable snapshot of the client-level defaults of a BaseCurl instance.
+
+    BaseCurl rebuilds this snapshot only when a default changes, so every request merges a ready-made, frozen set of
+    headers and cookies instead of re-applying setters. Options staged for a request and per-call arguments are
+    layered on top of it.
+
+    Attributes:
+        headers: The default headers, including the Authorization header set by the default authentication setters.
+        cookies: The default cookies.
+        timeout: The default timeout in seconds, or None.
+        follow_location: The default redirect policy, or None.
+    """
+
+    __slots__ = ('headers', 'cookies', 'timeout', 'follow_location')
+
+    def __init__(self, headers=None, cookies=None, timeout=None, follow_location=None):
+        set_ = object.__setattr__
+        set_(self, 'headers', MappingProxyType(dict(headers or {})))
+        set_(self, 'cookies', MappingProxyType(dict(cookies or {})))
+        set_(self, 'timeout', timeout)
+        set_(self, 'follow_location', follow_location)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Defaults objects are immutable")
+
+    def replace(self, **changes):
+        """
+        Build a new snapshot with some values replaced.
+
+        Parameters:
+        - **changes: The values to replace (headers, cookies, timeout, follow_location).
+
+        Returns:
+        Defaults: The new snapshot.
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return Defaults(**values)
@@ -0,0 +1,410 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .Cache import CacheEntry
+
+# Seconds between two updates of the last access time of an entry, so that reads rarely write to the index
+ACCESS_RESOLUTION = 60
+# Seconds a connection waits for a lock held by another process before failing
+BUSY_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT NOT NULL,
+    vary TEXT NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    reason TEXT,
+    headers TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    request_time REAL NOT NULL,
+    response_time REAL NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (key, vary)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at);
+"""
+
+
+class _BlobFile:
+    """
+    A blob file opened for reading that closes itself once its end is reached, since requests.Response does not close
+    raw bodies that are not urllib3 responses.
+
+    Parameters:
+    - path (str): The path of the blob file.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def read(self, amt=None):
+        if self._file.closed:
+            return b''
+        data = self._file.read(amt)
+        if amt is None or len(data) < amt:
+            self._file.close()
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+class DiskCacheEntry(CacheEntry):
+    """
+    A cache entry whose body stays in a blob file of a DiskStore.
+
+    The body is not read when the entry is loaded from the index: to_response() returns a response streaming the blob
+    file, so iter_content() reads it in chunks and only accessing response.content loads it in memory.
+
+    Attributes:
+        path: The path of the blob file holding the body.
+        body_size: The size of the body, in bytes.
+    """
+
+    __slots__ = ('path', 'body_size')
+
+    def __init__(self, method, url, status_code, reason, headers, path, body_size, vary, request_time,
+                 response_time):
+        super().__init__(method, url, status_code, reason, headers, None, vary, request_time, response_time)
+        self.path = path
+        self.body_size = body_size
+
+    @property
+    def size(self):
+        return self.body_size + sum(len(key) + len(value) for key, value in self.headers.items())
+
+    def refreshed(self, headers, request_time, response_time):
+        return DiskCacheEntry(self.method, self.url, self.status_code, self.reason, headers, self.path,
+                              self.body_size, self.vary, request_time, response_time)
+
+    def to_response(self, now):
+        """
+        Build a requests.Response streaming the body from the blob file.
+
+        Parameters:
+        - now (float): The current time, used to set the Age header.
+
+        Returns:
+        requests.Response: A new response object whose raw attribute is the open blob file, closed once read to the end or when the response is closed.
+
+        Raises:
+        FileNotFoundError: If the blob file was removed by another process.
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers['Age'] = str(int(self.current_age(now)))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        if self.body_size:
+            response.raw = _BlobFile(self.path)
+        else:
+            response._content = b''
+            response._content_consumed = True
+        return response
+
+
+class DiskStore:
+    """
+    A persistent store of cache entries, shared by the threads and processes using the same directory.
+
+    The index is a SQLite database in WAL mode (index.sqlite3) and every body is a blob file under blobs/, written to a
+    temporary file and renamed in place, so readers never see a partial body. Entries are evicted by least recent
+    access once the total size exceeds max_bytes, and entries older than ttl are dropped whatever their HTTP freshness.
+    The last access time is updated at most once per minute per entry, so eviction order is approximate.
+
+    Parameters:
+    - path (str): The directory of the store, created if needed.
+    - max_bytes (int, optional): The maximum total size of the entries, in bytes. Defaults to 1 GiB.
+    - ttl (int or float, optional): The maximum time an entry is kept, in seconds. Defaults to None (no limit).
+    """
+
+    def __init__(self, path, max_bytes=1024 * 1024 * 1024, ttl=None):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._blobs = os.path.join(self.path, 'blobs')
+        os.makedirs(self._blobs, exist_ok=True)
+        self._local = threading.local()
+        self.evictions = 0
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(os.path.join(self.path, 'index.sqlite3'), timeout=BUSY_TIMEOUT,
+                                         isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    @staticmethod
+    def _key(key):
+        return f'{key[0]} {key[1]}'
+
+    def _expired_before(self):
+        return time.time() - self.ttl if self.ttl is not None else None
+
+    def _unlink(self, blobs):
+        for blob in blobs:
+            try:
+                os.remove(os.path.join(self._blobs, blob[:2], blob))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key):
+        """
+        Retrieve the variants stored for a key, without reading their bodies.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+
+        Returns:
+        list: The stored DiskCacheEntry variants (empty if none).
+        """
+        now = time.time()
+        expired_before = self._expired_before()
+        rows = self._connection().execute(
+            'SELECT vary, method, url, status_code, reason, headers, blob, size, request_time, response_time, '
+            'stored_at, accessed_at FROM entries WHERE key = ?', (self._key(key),)).fetchall()
+        stale = [row[0] for row in rows if row[11] < now - ACCESS_RESOLUTION]
+        if stale:
+            with self._transaction() as connection:
+                connection.executemany('UPDATE entries SET accessed_at = ? WHERE key = ? AND vary = ?',
+                                       [(now, self._key(key), vary) for vary in stale])
+        entries = []
+        for vary, method, url, status_code, reason, headers, blob, size, request_time, response_time, stored_at, _ \
+                in rows:
+            if expired_before is not None and stored_at < expired_before:
+                continue
+            entries.append(DiskCacheEntry(
+                method, url, status_code, reason, CaseInsensitiveDict(json.loads(headers)),
+                os.path.join(self._blobs, blob[:2], blob), size, tuple(tuple(item) for item in json.loads(vary)),
+                request_time, response_time))
+        return entries
+
+    def put(self, key, entry):
+        """
+        Store an entry, replacing the variant with the same Vary values, and evict entries above the limits.
+
+        An entry loaded from this store (after a revalidation) keeps its blob file, so only its index row is updated.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+        - entry (CacheEntry): The entry to store.
+
+        Returns:
+        None
+        """
+        vary = json.dumps(entry.vary)
+        if entry.size > self.max_bytes:
+            with self._transaction() as connection:
+                removed = [row[0] for row in connection.execute(
+                    'SELECT blob FROM entries WHERE key = ? AND vary = ?', (self._key(key), vary))]
+                connection.execute('DELETE FROM entries WHERE key = ? AND vary = ?', (self._key(key), vary))
+            self._unlink(removed)
+            return
+
+        if isinstance(entry, DiskCacheEntry) and os.path.dirname(os.path.dirname(entry.path)) == self._blobs:
+            blob = os.path.basename(entry.path)
+            size = entry.body_size
+        else:
+            blob = uuid.uuid4().hex
+            directory = os.path.join(self._blobs, blob[:2])
+            os.makedirs(directory, exist_ok=True)
+            temporary = os.path.join(directory, f'.{blob}.tmp')
+            with open(temporary, 'wb') as file:
+                file.write(entry.content)
+            os.replace(temporary, os.path.join(directory, blob))
+            size = len(entry.content)
+
+        now = time.time()
+        with self._transaction() as connection:
+            previous = connection.execute('SELECT blob FROM entries WHERE key = ? AND vary = ?',
+                                          (self._key(key), vary)).fetchone()
+            connection.execute(
+                'INSERT OR REPLACE INTO entries (key, vary, method, url, status_code, reason, headers, blob, size, '
+                'request_time, response_time, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (self._key(key), vary, entry.method, entry.url, entry.status_code, entry.reason,
+                 json.dumps(list(entry.headers.items())), blob, size, entry.request_time, entry.response_time, now,
+                 now))
+        if previous is not None and previous[0] != blob:
+            self._unlink([previous[0]])
+        self._evict()
+
+    def _evict(self):
+        expired_before = self._expired_before()
+        with self._transaction() as connection:
+            removed = []
+            if expired_before is not None:
+                removed += [row[0] for row in connection.execute(
+                    'SELECT blob FROM entries WHERE stored_at < ?', (expired_before,))]
+                connection.execute('DELETE FROM entries WHERE stored_at < ?', (expired_before,))
+            total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total > self.max_bytes:
+                victims = []
+                for key, vary, blob, size in connection.execute(
+                        'SELECT key, vary, blob, size FROM entries ORDER BY accessed_at'):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append((key, vary))
+                    removed.append(blob)
+                    total -= size
+                connection.executemany('DELETE FROM entries WHERE key = ? AND vary = ?', victims)
+                self.evictions += len(victims)
+        self._unlink(removed)
+
+    def remove(self, key):
+        """
+        Remove all the variants stored for a key.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+
+        Returns:
+        None
+        """
+        with self._transaction() as connection:
+            removed = [row[0] for row in connection.execute(
+                'SELECT blob FROM entries WHERE key = ?', (self._key(key),))]
+            connection.execute('DELETE FROM entries WHERE key = ?', (self._key(key),))
+        self._unlink(removed)
+
+    def clear(self):
+        """
+        Remove all the entries.
+
+        Returns:
+        None
+        """
+        with self._transaction() as connection:
+            removed = [row[0] for row in connection.execute('SELECT blob FROM entries')]
+            connection.execute('DELETE FROM entries')
+        self._unlink(removed)
+
+    def stats(self):
+        """
+        Retrieve the size of the store.
+
+        Returns:
+        dict: The 'entries' and 'bytes' of the store, shared by all the processes, and the 'evictions' made by this process.
+        """
+        with self._transaction() as connection:
+            entries, size = connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return {'entries': entries, 'bytes': size, 'evictions': self.evictions}
+
+
+class _Transaction:
+    """
+    Runs the statements of a with block in one immediate transaction, so concurrent writers wait for each other.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+        return False
+
+
+class TieredStore:
+    """
+    A memory store in front of a disk store.
+
+    Entries are written to both tiers; lookups try the memory tier first and fall back to the disk tier, whose
+    bodies are streamed from disk. Entries larger than the memory tier limits are kept on disk only.
+
+    Parameters:
+    - memory (Cache.MemoryStore): The in-memory tier.
+    - disk (DiskStore): The persistent tier.
+    """
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        """
+        Retrieve the variants stored for a key, from the memory tier if it has any.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+
+        Returns:
+        list: The stored CacheEntry variants (empty if none).
+        """
+        return self.memory.get(key) or self.disk.get(key)
+
+    def put(self, key, entry):
+        """
+        Store an entry in both tiers. Entries loaded from the disk tier are only updated there.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+        - entry (CacheEntry): The entry to store.
+
+        Returns:
+        None
+        """
+        self.disk.put(key, entry)
+        if isinstance(entry, DiskCacheEntry):
+            self.memory.remove(key)
+        else:
+            self.memory.put(key, entry)
+
+    def remove(self, key):
+        """
+        Remove all the variants stored for a key from both tiers.
+
+        Parameters:
+        - key (tuple): The (method, url) key.
+
+        Returns:
+        None
+        """
+        self.memory.remove(key)
+        self.disk.remove(key)
+
+    def clear(self):
+        """
+        Remove all the entries from both tiers.
+
+        Returns:
+        None
+        """
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self):
+        """
+        Retrieve the size of both tiers.
+
+        Returns:
+        dict: The disk tier 'entries', 'bytes' and 'evictions', with the memory tier counters prefixed by 'memory_'.
+        """
+        return {**self.disk.stats(), **{f'memory_{name}': value for name, value in self.memory.stats().items()}}
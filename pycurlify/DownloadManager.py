@@ -0,0 +1,384 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from urllib.parse import urlsplit
+from tqdm import tqdm
+
+from .Curl import Curl
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    destination TEXT NOT NULL UNIQUE,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    file_size INTEGER,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+
+class DownloadManager:
+    """
+    Downloads a queue of files with Curl.download_file(), with global, per-host and per-device limits.
+
+    Jobs are (url, destination) pairs queued with add() or add_many() and executed by run(), which yields one result
+    per job as it completes, or by perform(), which only invokes the callback. At most `concurrency` downloads run at
+    once, at most `max_host_downloads` of them from the same host and at most `max_device_writers` of them writing to
+    the same storage device, so a slow disk is not flooded with concurrent writers. A host or device at its limit
+    does not hold up the jobs of the others: the next job is taken from the hosts in turn.
+
+    The jobs and their status are kept in a SQLite file when state_path is given. Creating a manager on the same file
+    after a crash or an interruption queues again the jobs that were queued or running (and the failed ones, with
+    retry_failed=True), and add() ignores the destinations already known, so a run can simply be restarted. Combine
+    it with resume=True to also keep the bytes of interrupted files.
+
+    Instead of one progress bar per file, a single bar reports the completed files, the aggregate throughput and the
+    estimated time left, every report_interval seconds; pass progress to receive the same figures (see stats()).
+
+    Example Usage:
+    ```
+    manager = DownloadManager(PyCurlify(), concurrency=32, max_host_downloads=4, state_path='downloads.sqlite3')
+    manager.add_many((url, os.path.join('/data', url.rsplit('/', 1)[-1])) for url in urls)
+    for result in manager.run():
+        if result['error']:
+            print(result['url'], result['error'])
+    ```
+    """
+
+    def __init__(self, curl=None, concurrency=16, max_host_downloads=4, max_device_writers=8, state_path=None,
+                 retry_failed=True, report_interval=1.0, progress=None, callback=None, **options):
+        """
+        Initializes a new instance of the DownloadManager class.
+
+        Parameters:
+        - curl (Curl, optional): The client running the downloads. Its defaults and staged options (headers, cookies, timeout, follow location) apply to every job; the staged options are consumed as by a request. Defaults to a new client with a pool of `concurrency` connections per host.
+        - concurrency (int, optional): The maximum number of downloads running at once. Defaults to 16.
+        - max_host_downloads (int, optional): The maximum number of downloads running at once from the same host. Defaults to 4.
+        - max_device_writers (int, optional): The maximum number of downloads writing at once to the same storage device. Defaults to 8.
+        - state_path (str, optional): The SQLite file persisting the jobs and their status. Defaults to None (kept in memory).
+        - retry_failed (bool, optional): Whether the failed jobs of a previous run are queued again. Defaults to True.
+        - report_interval (float, optional): Seconds between two progress reports. Defaults to 1.0.
+        - progress (callable, optional): A function called with stats() every report_interval seconds, instead of displaying a progress bar. Defaults to None.
+        - callback (callable, optional): A function called with the result of every job. Defaults to None.
+        - **options: Default arguments of Curl.download_file() for every job (e.g. connections, resume, digests, headers).
+
+        Returns:
+        None
+
+        Raises:
+        ValueError: If a limit is lower than 1.
+        """
+        if min(concurrency, max_host_downloads, max_device_writers) < 1:
+            raise ValueError("concurrency, max_host_downloads and max_device_writers must be at least 1")
+        if curl is None:
+            curl = Curl()
+            curl.set_pool_config(pool_maxsize=concurrency)
+        self.curl = curl
+        self.concurrency = concurrency
+        self.max_host_downloads = max_host_downloads
+        self.max_device_writers = max_device_writers
+        self.report_interval = report_interval
+        self.progress = progress
+        self.callback = callback
+        self.options = options
+
+        self._staged = curl._request_options(curl._context())
+        curl.close()
+
+        self._lock = threading.Lock()
+        self._hosts = OrderedDict()
+        self._host_running = Counter()
+        self._device_running = Counter()
+        self._devices = {}
+        self._running = {}
+        self._queued = 0
+        self._written = 0
+        self._completed_bytes = 0
+        self._completed_files = 0
+        self._started_at = None
+
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(state_path or ':memory:', check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        if state_path is not None:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+        requeued = ('queued', 'running', 'failed') if retry_failed else ('queued', 'running')
+        with self._db:
+            self._db.execute(f"UPDATE jobs SET status = 'queued' WHERE status IN ({', '.join('?' * len(requeued))})",
+                             requeued)
+        for job in self._db.execute("SELECT id, url, destination, options FROM jobs WHERE status = 'queued' "
+                                    "ORDER BY id"):
+            self._enqueue(job[0], job[1], job[2], json.loads(job[3]))
+        counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs WHERE status != 'queued' GROUP BY status"))
+        self._done = counts.get('done', 0)
+        self._failed = counts.get('failed', 0)
+
+    def _device(self, destination):
+        """
+        Identify the storage device of a destination, from its nearest existing directory.
+        """
+        directory = os.path.dirname(os.path.abspath(destination))
+        device = self._devices.get(directory)
+        if device is None:
+            existing = directory
+            while not os.path.isdir(existing) and os.path.dirname(existing) != existing:
+                existing = os.path.dirname(existing)
+            device = self._devices[directory] = os.stat(existing).st_dev
+        return device
+
+    def _enqueue(self, index, url, destination, options):
+        host = (urlsplit(url).hostname or '').lower()
+        job = (index, url, destination, options, host, self._device(destination))
+        with self._lock:
+            self._hosts.setdefault(host, deque()).append(job)
+            self._queued += 1
+
+    def add(self, url, destination, **options):
+        """
+        Queue a file download.
+
+        Parameters:
+        - url (str): The URL from which to download the file.
+        - destination (str): The path of the file. Missing directories are created.
+        - **options: Arguments of Curl.download_file() for this job, over the manager defaults. They must be JSON-serializable.
+
+        Returns:
+        int: The index of the job, reported in its result. A destination already known (queued, running, done or failed) is not queued again and keeps its index.
+        """
+        return self.add_many([(url, destination, options)])[0]
+
+    def add_many(self, jobs):
+        """
+        Queue file downloads in one transaction.
+
+        Parameters:
+        - jobs (iterable): (url, destination) or (url, destination, options) tuples (see add()).
+
+        Returns:
+        list: The index of every job, in order.
+        """
+        indexes = []
+        added = []
+        now = time.time()
+        with self._db_lock, self._db:
+            for job in jobs:
+                url, destination = job[0], os.path.abspath(job[1])
+                options = job[2] if len(job) > 2 else {}
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO jobs (url, destination, options, status, updated_at) "
+                    "VALUES (?, ?, ?, 'queued', ?)", (url, destination, json.dumps(options), now))
+                if cursor.rowcount:
+                    indexes.append(cursor.lastrowid)
+                    added.append((cursor.lastrowid, url, destination, options))
+                else:
+                    indexes.append(self._db.execute('SELECT id FROM jobs WHERE destination = ?',
+                                                    (destination,)).fetchone()[0])
+        for job in added:
+            self._enqueue(*job)
+        return indexes
+
+    def _update(self, index, status, file_size=None, error=None):
+        with self._db_lock, self._db:
+            self._db.execute('UPDATE jobs SET status = ?, file_size = ?, error = ?, updated_at = ? WHERE id = ?',
+                             (status, file_size, error, time.time(), index))
+
+    def _next_job(self):
+        """
+        Take the next queued job whose host and device are below their limits, visiting the hosts in turn.
+
+        Returns:
+        tuple or None: The job, or None if every queued job waits for a limit.
+        """
+        with self._lock:
+            for host, queue in self._hosts.items():
+                if self._host_running[host] >= self.max_host_downloads:
+                    continue
+                job = queue[0]
+                if self._device_running[job[5]] >= self.max_device_writers:
+                    continue
+                queue.popleft()
+                if queue:
+                    self._hosts.move_to_end(host)
+                else:
+                    del self._hosts[host]
+                self._queued -= 1
+                self._host_running[host] += 1
+                self._device_running[job[5]] += 1
+                self._running[job[0]] = [0, 0]
+                return job
+            return None
+
+    def _requeue(self, job):
+        with self._lock:
+            self._hosts.setdefault(job[4], deque()).appendleft(job)
+            self._hosts.move_to_end(job[4], last=False)
+            self._queued += 1
+            self._release(job)
+
+    def _release(self, job):
+        self._host_running[job[4]] -= 1
+        self._device_running[job[5]] -= 1
+        return self._running.pop(job[0])
+
+    def _report_bytes(self, index, size, total_size):
+        with self._lock:
+            self._written += size
+            state = self._running.get(index)
+            if state is not None:
+                state[0] += size
+                state[1] = total_size
+
+    def _download(self, job):
+        """
+        Run one job in the calling worker thread.
+
+        Returns:
+        tuple: The information returned by Curl.download_file() (None on failure) and the error message.
+        """
+        index, url, destination, options = job[:4]
+        curl = self.curl
+        try:
+            curl.set_headers(self._staged['headers'])
+            curl.set_cookies(self._staged['cookies'])
+            curl.set_timeout(self._staged['timeout'])
+            curl.set_follow_location(self._staged['follow_location'])
+            dir_path, file_name = os.path.split(destination)
+            os.makedirs(dir_path, exist_ok=True)
+            info = curl.download_file(url, dir_path, file_name, progress=partial(self._report_bytes, index),
+                                      **{**self.options, **options})
+        except Exception as e:
+            curl.close()
+            return None, str(e)
+        return info, None if info is not None else (curl._context().error or "The download failed.")
+
+    def _complete(self, job, info, error):
+        index, url, destination = job[:3]
+        with self._lock:
+            self._release(job)
+            if info is not None:
+                self._done += 1
+                self._completed_files += 1
+                self._completed_bytes += info['file_size']
+            else:
+                self._failed += 1
+        self._update(index, 'done' if info is not None else 'failed', info['file_size'] if info else None, error)
+        result = {'index': index, 'url': url, 'file_path': None, 'file_size': 0, **(info or {}), 'error': error}
+        if self.callback:
+            self.callback(result)
+        return result
+
+    def stats(self):
+        """
+        Retrieve the aggregate progress of the manager.
+
+        The throughput is averaged since run() started. The time left is estimated from the bytes left in the running
+        downloads and, for the queued jobs, the average size of the files completed so far.
+
+        Returns:
+        dict: A dictionary with the number of 'queued', 'running', 'done' and 'failed' jobs, the 'bytes' written since run() started, the 'rate' in bytes per second and the estimated 'eta' in seconds (None while unknown).
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self._started_at if self._started_at is not None else 0
+            rate = self._written / elapsed if elapsed > 0 else 0.0
+            left = sum(max(total - written, 0) for written, total in self._running.values())
+            sizes = [total for _, total in self._running.values() if total]
+            if self._completed_files:
+                average = self._completed_bytes / self._completed_files
+            else:
+                average = sum(sizes) / len(sizes) if sizes else None
+            eta = None
+            if rate > 0 and (average is not None or not self._queued):
+                eta = (left + self._queued * (average or 0)) / rate
+            return {'queued': self._queued, 'running': len(self._running), 'done': self._done,
+                    'failed': self._failed, 'bytes': self._written, 'rate': rate, 'eta': eta}
+
+    def _report(self, bar):
+        stats = self.stats()
+        if bar is None:
+            self.progress(stats)
+            return
+        bar.total = stats['queued'] + stats['running'] + stats['done'] + stats['failed']
+        bar.n = stats['done'] + stats['failed']
+        eta = tqdm.format_interval(stats['eta']) if stats['eta'] is not None else '?'
+        bar.set_postfix_str(f"{tqdm.format_sizeof(stats['rate'], 'B/s', 1024)}, ETA {eta}, "
+                            f"{stats['failed']} failed", refresh=False)
+        bar.refresh()
+
+    def run(self):
+        """
+        Execute the queued jobs, yielding their results as they complete.
+
+        Jobs may be added while iterating. A failed job is reported in its result and never aborts the others. If the
+        iteration is stopped early, the jobs not started stay queued and the running ones complete.
+
+        Yields:
+        dict: A dictionary with the keys 'index', 'url', 'file_path' (None on failure), 'file_size' and 'error' (error message or None), plus the other keys returned by Curl.download_file().
+        """
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        bar = None
+        if self.progress is None:
+            bar = tqdm(desc="Downloading", unit='file', colour='green',
+                       bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} files [{elapsed}{postfix}]")
+        pending = {}
+        try:
+            self._report(bar)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                try:
+                    while True:
+                        while len(pending) < self.concurrency:
+                            job = self._next_job()
+                            if job is None:
+                                break
+                            self._update(job[0], 'running')
+                            pending[executor.submit(self._download, job)] = job
+
+                        if not pending:
+                            break
+
+                        done, _ = wait(pending, timeout=self.report_interval, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield self._complete(pending.pop(future), *future.result())
+                        self._report(bar)
+                finally:
+                    for future, job in pending.items():
+                        if future.cancel():
+                            self._requeue(job)
+                            self._update(job[0], 'queued')
+                        else:
+                            self._complete(job, *future.result())
+            self._report(bar)
+        finally:
+            if bar is not None:
+                bar.close()
+
+    def perform(self):
+        """
+        Execute all the queued jobs, delivering the results only through the callback.
+
+        Returns:
+        int: The number of jobs executed.
+        """
+        count = 0
+        for _ in self.run():
+            count += 1
+        return count
+
+    def close(self):
+        """
+        Close the state file.
+
+        Returns:
+        None
+        """
+        self._db.close()
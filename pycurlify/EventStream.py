@@ -0,0 +1,330 @@
+import re
+import threading
+import time
+import requests
+
+from .Streaming import MIN_CHUNK_SIZE, iter_body
+
+_LINE_END = re.compile(rb'\r\n|\r|\n')
+_BOM = b'\xef\xbb\xbf'
+
+
+class ServerSentEvent:
+    """
+    An event received from a text/event-stream response.
+
+    Attributes:
+    - event (str): The event type, 'message' unless the server named it.
+    - data (str): The data of the event, its data lines joined with newlines.
+    - id (str): The last event ID of the stream when the event was dispatched ('' if none).
+    - lag (float): The seconds between the arrival of the event and its dispatch to the consumer.
+    """
+
+    __slots__ = ('event', 'data', 'id', 'lag')
+
+    def __init__(self, event, data, id='', lag=0.0):
+        self.event = event
+        self.data = data
+        self.id = id
+        self.lag = lag
+
+    def __eq__(self, other):
+        if not isinstance(other, ServerSentEvent):
+            return NotImplemented
+        return (self.event, self.data, self.id) == (other.event, other.data, other.id)
+
+    def __repr__(self):
+        return f"ServerSentEvent(event={self.event!r}, data={self.data!r}, id={self.id!r})"
+
+
+class EventStreamParser:
+    """
+    Parses a text/event-stream body fed in chunks, following the HTML Living Standard.
+
+    Lines are located in the received buffer and their fields compared in place; only the values of the fields are
+    decoded into strings. Lines may end with CRLF, LF or CR, comments are ignored, and an event is dispatched at each
+    blank line that follows at least one data line.
+
+    Parameters:
+    - last_event_id (str, optional): The last event ID carried over from a previous connection. Defaults to ''.
+
+    Attributes:
+    - last_event_id (str): The ID set by the latest id field.
+    - retry (int or None): The reconnection time in milliseconds set by the latest retry field, if any.
+    """
+
+    def __init__(self, last_event_id=''):
+        self.last_event_id = last_event_id
+        self.retry = None
+        self._buffer = bytearray()
+        self._started = False
+        self._event = ''
+        self._data = []
+
+    def _field(self, buffer, view, start, end, events):
+        if start == end:
+            if self._data:
+                events.append(ServerSentEvent(self._event or 'message', '\n'.join(self._data), self.last_event_id))
+                self._data = []
+            self._event = ''
+            return
+        colon = buffer.find(b':', start, end)
+        if colon == start:
+            return
+        if colon < 0:
+            name_end = value_start = end
+        else:
+            name_end, value_start = colon, colon + 1
+            if value_start < end and buffer[value_start] == ord(' '):
+                value_start += 1
+        length = name_end - start
+        if length == 4 and buffer.startswith(b'data', start):
+            self._data.append(str(view[value_start:end], 'utf-8', 'replace'))
+        elif length == 5 and buffer.startswith(b'event', start):
+            self._event = str(view[value_start:end], 'utf-8', 'replace')
+        elif length == 2 and buffer.startswith(b'id', start):
+            if buffer.find(b'\0', value_start, end) < 0:
+                self.last_event_id = str(view[value_start:end], 'utf-8', 'replace')
+        elif length == 5 and buffer.startswith(b'retry', start):
+            value = bytes(view[value_start:end])
+            if value.isdigit():
+                self.retry = int(value)
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the stream.
+
+        Parameters:
+        - data (bytes-like): The chunk.
+
+        Returns:
+        list: The ServerSentEvent objects completed by the chunk.
+        """
+        buffer = self._buffer
+        buffer += data
+        if not self._started:
+            if len(buffer) < len(_BOM) and _BOM.startswith(buffer):
+                return []
+            if buffer.startswith(_BOM):
+                del buffer[:len(_BOM)]
+            self._started = True
+        events = []
+        pos = 0
+        size = len(buffer)
+        with memoryview(buffer) as view:
+            while True:
+                match = _LINE_END.search(buffer, pos)
+                if match is None or (match.start() == size - 1 and buffer[-1] == ord('\r')):
+                    # A CR ending the chunk may be the first half of a CRLF
+                    break
+                self._field(buffer, view, pos, match.start(), events)
+                pos = match.end()
+        del buffer[:pos]
+        return events
+
+
+class EventSource:
+    """
+    Consumes a Server-Sent Events stream, reconnecting automatically.
+
+    Created by Curl.event_source(). Iterating over the source yields ServerSentEvent objects as they arrive; run()
+    dispatches them to the callbacks registered with on() instead. When the connection drops, fails or is closed by
+    the server, the source waits for the reconnection time (which the server may change with a retry field) and
+    reconnects with a Last-Event-ID header, so the server can resume the stream. A 204 No Content response ends the
+    stream, and other error statuses raise requests.HTTPError.
+
+    stats() reports the event and byte throughput, the reconnections and the lag: the time events wait between their
+    arrival and their dispatch, which grows when the consumer cannot keep up.
+
+    Example Usage:
+    ```
+    for event in curl.event_source('https://example.com/updates'):
+        print(event.event, event.data)
+    ```
+    """
+
+    def __init__(self, curl, url, headers=None, cookies=None, params=None, last_event_id='', retry=3.0,
+                 max_retries=None, chunk_size=MIN_CHUNK_SIZE):
+        """
+        Initializes a new instance of the EventSource class.
+
+        Parameters:
+        - curl (Curl): The client sending the requests. The options staged on it (headers, cookies, timeout, follow location) apply to every connection; they are consumed as by a request.
+        - url (str): The URL of the stream.
+        - headers (dict, optional): Additional headers to be included in the requests.
+        - cookies (dict, optional): Cookies to be included in the requests.
+        - params (dict, optional): Query parameters to be included in the requests.
+        - last_event_id (str, optional): The ID of the last event already received, sent with the first request. Defaults to ''.
+        - retry (float, optional): The reconnection time in seconds, until the server sets one. Defaults to 3.0.
+        - max_retries (int, optional): The number of consecutive reconnections without receiving an event after which the source gives up. Defaults to None (never).
+        - chunk_size (int, optional): The maximum size of the reads from the connection. Defaults to 64 KiB.
+
+        Returns:
+        None
+        """
+        self._curl = curl
+        self.url = url
+        self._headers = headers or {}
+        self._cookies = cookies
+        self._params = params
+        self.last_event_id = last_event_id
+        self.retry = retry
+        self.max_retries = max_retries
+        self._chunk_size = chunk_size
+        self._staged = curl._request_options(curl._context())
+        curl.close()
+        self._callbacks = {}
+        self._closed = threading.Event()
+        self._response = None
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._events = 0
+        self._bytes = 0
+        self._reconnects = 0
+        self._lag = 0.0
+        self._max_lag = 0.0
+
+    def on(self, event, callback):
+        """
+        Register the callback of an event type, used by run().
+
+        Parameters:
+        - event (str): The event type ('message' for unnamed events), or '*' for every event without a callback of its own.
+        - callback (callable): A function called with each ServerSentEvent of that type.
+
+        Returns:
+        EventSource: The source, so registrations can be chained.
+        """
+        self._callbacks[event] = callback
+        return self
+
+    def _connect(self):
+        curl = self._curl
+        staged = self._staged
+        curl.set_headers(staged['headers'])
+        curl.set_cookies(staged['cookies'])
+        curl.set_timeout(staged['timeout'])
+        curl.set_follow_location(staged['follow_location'])
+        headers = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache', **self._headers}
+        if self.last_event_id:
+            headers['Last-Event-ID'] = self.last_event_id
+        response = curl._open_stream('get', self.url, headers, self._cookies, self._params)
+        content_type = response.headers.get('Content-Type', '').partition(';')[0].strip().lower()
+        if response.status_code != 204 and content_type != 'text/event-stream':
+            response.close()
+            raise requests.RequestException(f"Expected a text/event-stream response, got '{content_type}'.",
+                                            response=response)
+        return response
+
+    def __iter__(self):
+        """
+        Receive the events of the stream, reconnecting as needed.
+
+        Yields:
+        ServerSentEvent: The events, as they arrive.
+
+        Raises:
+        requests.HTTPError: If the server answers with an error status.
+        requests.RequestException: If the response is not an event stream, or the last error once max_retries consecutive reconnections failed.
+        """
+        failures = 0
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        while not self._closed.is_set():
+            error = None
+            try:
+                response = self._connect()
+            except requests.HTTPError:
+                raise
+            except requests.RequestException as e:
+                if e.response is not None:
+                    raise
+                error = e
+            else:
+                if response.status_code == 204:
+                    response.close()
+                    return
+                parser = EventStreamParser(self.last_event_id)
+                chunks = iter_body(response, self._chunk_size)
+                with self._lock:
+                    self._response = response
+                try:
+                    for chunk in chunks:
+                        received_at = time.perf_counter()
+                        self._bytes += len(chunk)
+                        events = parser.feed(chunk)
+                        if parser.retry is not None:
+                            self.retry = parser.retry / 1000
+                        for event in events:
+                            failures = 0
+                            self.last_event_id = event.id
+                            event.lag = lag = time.perf_counter() - received_at
+                            self._lag = lag
+                            if lag > self._max_lag:
+                                self._max_lag = lag
+                            self._events += 1
+                            yield event
+                        self.last_event_id = parser.last_event_id
+                except requests.RequestException as e:
+                    error = e
+                finally:
+                    with self._lock:
+                        self._response = None
+                    chunks.close()
+            failures += 1
+            if self.max_retries is not None and failures > self.max_retries:
+                if error is not None:
+                    raise error
+                return
+            if self._closed.wait(self.retry):
+                return
+            self._reconnects += 1
+
+    def run(self):
+        """
+        Receive the events of the stream and dispatch them to the callbacks registered with on(), until the stream ends or close() is called.
+
+        Returns:
+        None
+
+        Raises:
+        requests.RequestException: As the iteration (see __iter__()).
+        """
+        callbacks = self._callbacks
+        for event in self:
+            callback = callbacks.get(event.event) or callbacks.get('*')
+            if callback is not None:
+                callback(event)
+
+    def close(self):
+        """
+        Stop the source. The iteration ends at the next event, or at once if it is waiting to reconnect; the current connection is closed.
+
+        Returns:
+        None
+        """
+        self._closed.set()
+        with self._lock:
+            response = self._response
+        if response is not None:
+            response.close()
+
+    def stats(self):
+        """
+        Retrieve the statistics of the source.
+
+        Returns:
+        dict: A dictionary with the 'events' and 'bytes' received, the 'events_per_second' and 'bytes_per_second' since the first connection, the 'reconnects', the 'lag' of the latest event and the 'max_lag', in seconds, the 'last_event_id' and the 'retry' time in seconds.
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at is not None else 0.0
+        return {
+            'events': self._events,
+            'bytes': self._bytes,
+            'events_per_second': self._events / elapsed if elapsed > 0 else 0.0,
+            'bytes_per_second': self._bytes / elapsed if elapsed > 0 else 0.0,
+            'reconnects': self._reconnects,
+            'lag': self._lag,
+            'max_lag': self._max_lag,
+            'last_event_id': self.last_event_id,
+            'retry': self.retry,
+        }
@@ -0,0 +1,252 @@
+import base64
+import binascii
+import hashlib
+import re
+import threading
+
+# Names of the digest algorithms in the Digest (RFC 3230) and Repr-Digest (RFC 9530) headers, mapped to hashlib
+HEADER_ALGORITHMS = {
+    'md5': 'md5',
+    'sha': 'sha1',
+    'sha-256': 'sha256',
+    'sha-512': 'sha512',
+}
+# Size of the reads when hashing data already written to the file
+READ_BACK_SIZE = 1024 * 1024
+
+_REPR_DIGEST_MEMBER = re.compile(r'\s*([a-z0-9_.*-]+)\s*=\s*:([A-Za-z0-9+/=]*):\s*')
+
+
+class IntegrityError(ValueError):
+    """
+    Raised when a downloaded file does not match an expected digest.
+
+    Attributes:
+        mismatches: The {algorithm: (expected, actual)} hexadecimal digests that differ.
+    """
+
+    def __init__(self, mismatches):
+        super().__init__("Digest mismatch: " + ", ".join(
+            f"{name} expected {expected}, got {actual}" for name, (expected, actual) in mismatches.items()))
+        self.mismatches = mismatches
+
+
+def normalize_algorithm(name):
+    """
+    Map a digest algorithm name ('SHA-256', 'sha256', 'md5', ...) to its hashlib name.
+
+    Parameters:
+    - name (str): The algorithm name.
+
+    Returns:
+    str: The hashlib name.
+
+    Raises:
+    ValueError: If hashlib does not support the algorithm.
+    """
+    lowered = name.strip().lower()
+    normalized = HEADER_ALGORITHMS.get(lowered, lowered.replace('-', ''))
+    if normalized not in hashlib.algorithms_available:
+        raise ValueError(f"Unsupported digest algorithm '{name}'.")
+    return normalized
+
+
+def _decode_base64(value):
+    try:
+        return base64.b64decode(value.strip(), validate=True).hex()
+    except (binascii.Error, ValueError):
+        return None
+
+
+def parse_digest_headers(headers, partial=False):
+    """
+    Extract the expected digests of the whole file from response headers.
+
+    Repr-Digest (RFC 9530) and Digest (RFC 3230) describe the whole representation, so they apply to the file even
+    in a 206 response; Content-MD5 only describes the body of the response, so it is ignored in a 206 response.
+    Content-coded responses are ignored, as the digests describe the coded bytes. Unknown or unsupported algorithms
+    are skipped.
+
+    Parameters:
+    - headers (dict): The response headers.
+    - partial (bool, optional): Whether the response is a 206 Partial Content. Defaults to False.
+
+    Returns:
+    dict: The expected {hashlib name: hexadecimal digest}.
+    """
+    if headers.get('Content-Encoding', 'identity').strip().lower() != 'identity':
+        return {}
+    expected = {}
+
+    content_md5 = headers.get('Content-MD5')
+    if content_md5 and not partial:
+        digest = _decode_base64(content_md5)
+        if digest:
+            expected['md5'] = digest
+
+    for member in (headers.get('Digest') or '').split(','):
+        name, _, value = member.partition('=')
+        algorithm = HEADER_ALGORITHMS.get(name.strip().lower())
+        digest = _decode_base64(value) if algorithm and value else None
+        if digest:
+            expected[algorithm] = digest
+
+    for match in _REPR_DIGEST_MEMBER.finditer(headers.get('Repr-Digest') or ''):
+        algorithm = HEADER_ALGORITHMS.get(match.group(1))
+        digest = _decode_base64(match.group(2)) if algorithm else None
+        if digest:
+            expected[algorithm] = digest
+
+    return {name: digest for name, digest in expected.items() if name in hashlib.algorithms_available}
+
+
+class StreamHasher:
+    """
+    Computes digests of a file while it is written, and checks them against expected values.
+
+    Sequential writes are hashed with update(). Writes at arbitrary offsets (parallel byte ranges) go through
+    update_at(): data at the hashed position is hashed immediately, data written ahead of it is only recorded and read
+    back from the file at path (usually from the page cache) once the hashed position reaches it.
+
+    Parameters:
+    - algorithms (iterable, optional): The algorithms to compute. Defaults to none.
+    - expected (dict, optional): Expected {algorithm: hexadecimal digest}; their algorithms are computed too. Defaults to None.
+    """
+
+    def __init__(self, algorithms=(), expected=None):
+        self.expected = {normalize_algorithm(name): digest.lower()
+                         for name, digest in (expected or {}).items() if digest}
+        names = [normalize_algorithm(name) for name in algorithms] + list(self.expected)
+        self._hashes = {name: hashlib.new(name) for name in names}
+        self.path = None
+        self.position = 0
+        self._ahead = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        Whether any digest is computed.
+        """
+        return bool(self._hashes)
+
+    def expect_headers(self, headers, partial=False):
+        """
+        Add the digests announced by response headers (see parse_digest_headers()) to the expected ones.
+
+        Explicitly expected digests take precedence. Must be called before any data is hashed.
+
+        Parameters:
+        - headers (dict): The response headers.
+        - partial (bool, optional): Whether the response is a 206 Partial Content. Defaults to False.
+
+        Returns:
+        None
+        """
+        for name, digest in parse_digest_headers(headers, partial).items():
+            self.expected.setdefault(name, digest)
+            if name not in self._hashes:
+                self._hashes[name] = hashlib.new(name)
+
+    def reset(self):
+        """
+        Restart the digests from an empty file, e.g. when a download restarts from zero.
+
+        Returns:
+        None
+        """
+        with self._lock:
+            self._hashes = {name: hashlib.new(name) for name in self._hashes}
+            self.position = 0
+            self._ahead = []
+
+    def _hash(self, data):
+        for digest in self._hashes.values():
+            digest.update(data)
+        self.position += len(data)
+
+    def update(self, data):
+        """
+        Hash the next bytes of a sequentially written file.
+
+        Parameters:
+        - data (bytes-like): The bytes.
+
+        Returns:
+        None
+        """
+        self._hash(data)
+
+    def update_at(self, offset, data):
+        """
+        Hash bytes written at an offset of the file.
+
+        Parameters:
+        - offset (int): The offset of the bytes in the file.
+        - data (bytes-like): The bytes, already written to the file.
+
+        Returns:
+        None
+        """
+        with self._lock:
+            if offset == self.position:
+                self._hash(data)
+            else:
+                self._ahead.append((offset, offset + len(data)))
+                self._ahead.sort()
+            self._catch_up()
+
+    def mark_written(self, start, end):
+        """
+        Record bytes already present in the file, to be read back and hashed in order.
+
+        Parameters:
+        - start (int): The first byte.
+        - end (int): The last byte.
+
+        Returns:
+        None
+        """
+        with self._lock:
+            self._ahead.append((start, end + 1))
+            self._ahead.sort()
+            self._catch_up()
+
+    def _catch_up(self):
+        if not self._ahead or self._ahead[0][0] > self.position:
+            return
+        with open(self.path, 'rb') as file:
+            while self._ahead and self._ahead[0][0] <= self.position:
+                _, stop = self._ahead.pop(0)
+                file.seek(self.position)
+                while self.position < stop:
+                    data = file.read(min(READ_BACK_SIZE, stop - self.position))
+                    if not data:
+                        break
+                    self._hash(data)
+
+    def digests(self):
+        """
+        Retrieve the computed digests.
+
+        Returns:
+        dict: The {algorithm: hexadecimal digest} of the bytes hashed so far.
+        """
+        return {name: digest.hexdigest() for name, digest in self._hashes.items()}
+
+    def verify(self):
+        """
+        Compare the computed digests with the expected ones.
+
+        Returns:
+        dict: The computed {algorithm: hexadecimal digest}.
+
+        Raises:
+        IntegrityError: If a digest differs from its expected value.
+        """
+        digests = self.digests()
+        mismatches = {name: (expected, digests[name]) for name, expected in self.expected.items()
+                      if digests[name] != expected}
+        if mismatches:
+            raise IntegrityError(mismatches)
+        return digests
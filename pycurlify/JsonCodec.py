@@ -0,0 +1,202 @@
+import json
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JsonCodec:
+    """
+    Encodes request payloads and decodes response bodies as JSON with the standard library.
+
+    This is the reference codec: it produces the same bytes as requests' json= argument. The faster codecs below
+    subclass it and fall back to it for the values they reject, so switching codecs never makes a request fail.
+    Custom codecs only need a name, dumps(obj) returning bytes and loads(data) accepting bytes, memoryview or str and
+    raising ValueError on invalid documents.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """
+        Encode a value.
+
+        Parameters:
+        - obj: The value.
+
+        Returns:
+        bytes: The UTF-8 JSON document.
+
+        Raises:
+        TypeError: If the value is not serializable.
+        ValueError: If the value contains NaN or infinite floats.
+        """
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+    def loads(self, data):
+        """
+        Decode a document.
+
+        Parameters:
+        - data (bytes, memoryview or str): The document.
+
+        Returns:
+        object: The decoded value.
+
+        Raises:
+        ValueError: If the document is not valid JSON.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def _has_non_finite(obj):
+    """
+    Tell whether a value holds NaN or infinite floats, in itself or in its dicts, lists and tuples.
+    """
+    kind = type(obj)
+    if kind is float:
+        # x - x is 0.0 for finite floats and NaN (truthy) otherwise
+        return bool(obj - obj)
+    if kind is not dict and kind is not list and kind is not tuple:
+        return False
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        for item in (value.values() if type(value) is dict else value):
+            kind = type(item)
+            if kind is float:
+                if item - item:
+                    return True
+            elif kind is dict or kind is list or kind is tuple:
+                stack.append(item)
+    return False
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    The orjson codec. Integers beyond 64 bits and the other values orjson rejects go through the standard library.
+
+    orjson encodes NaN and infinite floats as null; payloads holding them go through the standard library too, so they
+    raise ValueError as with the reference codec. They are only looked for when the document contains a null.
+    """
+
+    name = 'orjson'
+
+    def dumps(self, obj):
+        try:
+            encoded = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().dumps(obj)
+        if b'null' in encoded and _has_non_finite(obj):
+            return super().dumps(obj)
+        return encoded
+
+    def loads(self, data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """
+    The msgspec codec, falling back to the standard library for the values msgspec rejects and, as OrjsonCodec, for
+    the payloads holding NaN or infinite floats, which msgspec encodes as null.
+    """
+
+    name = 'msgspec'
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj):
+        try:
+            encoded = self._encoder.encode(obj)
+        except (TypeError, msgspec.EncodeError):
+            return super().dumps(obj)
+        if b'null' in encoded and _has_non_finite(obj):
+            return super().dumps(obj)
+        return encoded
+
+    def loads(self, data):
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError:
+            return super().loads(data)
+
+
+CODECS = {
+    JsonCodec.name: (JsonCodec, json),
+    OrjsonCodec.name: (OrjsonCodec, orjson),
+    MsgspecCodec.name: (MsgspecCodec, msgspec),
+}
+
+
+def get_codec(codec='auto'):
+    """
+    Resolve a JSON codec.
+
+    Parameters:
+    - codec (str or object, optional): 'auto' (orjson, else msgspec, else the standard library), a codec name ('json', 'orjson', 'msgspec') or a codec object with dumps() and loads(). Defaults to 'auto'.
+
+    Returns:
+    object: The codec.
+
+    Raises:
+    ImportError: If the package of the named codec is not installed.
+    ValueError: If the codec name is unknown.
+    """
+    if codec is None or codec == 'auto':
+        for name in (OrjsonCodec.name, MsgspecCodec.name):
+            codec_class, module = CODECS[name]
+            if module is not None:
+                return codec_class()
+        return JsonCodec()
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown JSON codec '{codec}'. Use one of: {', '.join(CODECS)}.")
+        codec_class, module = CODECS[codec]
+        if module is None:
+            raise ImportError(f"The '{codec}' JSON codec requires the '{codec}' package. "
+                              f"Install it with: pip install {codec}")
+        return codec_class()
+    return codec
+
+
+def encode_body(request_kwargs, codec):
+    """
+    Replace the JSON payload of request keyword arguments by its encoding.
+
+    Parameters:
+    - request_kwargs (dict): The request keyword arguments (see BaseCurl.exec()). They are not modified.
+    - codec (object): The JSON codec.
+
+    Returns:
+    dict: The keyword arguments with the encoded payload in 'data' and a Content-Type header, or the same dict if there is no payload.
+
+    Raises:
+    requests.exceptions.InvalidJSONError: If the payload cannot be encoded, as with requests' json= argument.
+    """
+    payload = request_kwargs.get('json')
+    if payload is None:
+        return request_kwargs
+    encoded = dict(request_kwargs)
+    del encoded['json']
+    try:
+        encoded['data'] = codec.dumps(payload)
+    except (TypeError, ValueError) as e:
+        raise requests.exceptions.InvalidJSONError(e) from e
+    headers = request_kwargs.get('headers') or {}
+    if not any(name.lower() == 'content-type' for name in headers):
+        encoded['headers'] = {**headers, 'Content-Type': 'application/json'}
+    return encoded
@@ -0,0 +1,427 @@
+import json
+import re
+import requests
+
+from .JsonCodec import JsonCodec
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+# A complete string, its content in group 1
+_STRING = re.compile(rb'"([^"\\]*+(?:\\.[^"\\]*+)*+)"', re.DOTALL)
+# The content of a string up to its closing quote, or up to the end of the data or a trailing escape
+_STRING_BODY = re.compile(rb'[^"\\]*+(?:\\.[^"\\]*+)*+', re.DOTALL)
+# Everything up to the next bracket, complete strings included, so only brackets are handled one at a time
+_UNTIL_BRACKET = re.compile(rb'[^"\[\]{}]*+(?:"[^"\\]*+(?:\\.[^"\\]*+)*+"[^"\[\]{}]*+)*+', re.DOTALL)
+_SCALAR_END = re.compile(rb'[,\]}: \t\n\r]')
+
+# Parser states
+_VALUE, _KEY, _COLON, _NEXT, _SKIP, _SCALAR, _DONE = range(7)
+
+
+class JsonItemParser:
+    """
+    Parses a JSON document fed in chunks and decodes the values found at a path, one at a time.
+
+    The path uses the prefix notation of ijson: object members are named by their key and array elements by 'item',
+    joined with dots. 'item' selects the elements of a top-level array, 'items.item' those of the array in the 'items'
+    member of a top-level object, and '' the whole document.
+
+    Only the structure leading to the path is tracked; other values are skipped with a scanner that does not decode
+    them, and only the bytes of the value being read are buffered. Memory is therefore bounded by the largest
+    selected value (or skipped string) plus a chunk, whatever the size of the document. Each selected value is
+    decoded by the JSON codec as soon as its last byte arrives.
+
+    Parameters:
+    - path (str, optional): The path of the values to decode. Defaults to 'item'.
+    - codec (object, optional): The JSON codec decoding the values (see JsonCodec). Defaults to the standard library.
+    """
+
+    def __init__(self, path='item', codec=None):
+        self.path = path
+        self.codec = JsonCodec() if codec is None else codec
+        self._target = path.split('.') if path else []
+        self._buffer = bytearray()
+        # Offset in the document of the first byte of the buffer
+        self._offset = 0
+        self._pos = 0
+        self._state = _VALUE
+        # Whether the container just opened may be closed at once
+        self._empty = False
+        self._containers = []
+        self._path = []
+        self._capture = False
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+
+    def _error(self, message, pos):
+        return requests.exceptions.JSONDecodeError(message, '', self._offset + pos)
+
+    def _selected(self):
+        path, target = self._path, self._target
+        if len(path) == len(target):
+            return not path or path[-1] == target[-1]
+        return False
+
+    def _descends(self):
+        path, target = self._path, self._target
+        return len(path) < len(target) and (not path or path[-1] == target[len(path) - 1])
+
+    def _end_value(self):
+        self._state = _NEXT if self._containers else _DONE
+
+    def _emit(self, end, items):
+        try:
+            items.append(self.codec.loads(bytes(self._buffer[self._start:end])))
+        except ValueError as e:
+            raise self._error(f"Invalid value at path '{self.path}'", self._start) from e
+
+    def _start_value(self, pos):
+        """
+        Handle the first byte of a value. Returns the position after it, or the value start to resume a scalar.
+        """
+        char = self._buffer[pos]
+        if self._selected():
+            self._capture = True
+        elif char in b'{[' and self._descends():
+            self._containers.append(char)
+            self._path.append(None if char == ord('{') else 'item')
+            self._state = _KEY if char == ord('{') else _VALUE
+            self._empty = True
+            return pos + 1
+        else:
+            self._capture = False
+        self._start = pos
+        if char in b'{[':
+            self._state, self._depth, self._in_string = _SKIP, 1, False
+        elif char == ord('"'):
+            self._state, self._depth, self._in_string = _SKIP, 0, True
+        elif char in b'-0123456789tfn':
+            self._state = _SCALAR
+            return pos
+        else:
+            raise self._error(f"Unexpected character {chr(char)!r}", pos)
+        return pos + 1
+
+    def _skip(self, pos, items):
+        """
+        Scan a container or a string. Returns the position reached, and whether the value is complete.
+        """
+        buffer = self._buffer
+        depth = self._depth
+        in_string = self._in_string
+        end = len(buffer)
+        while True:
+            if in_string:
+                pos = _STRING_BODY.match(buffer, pos).end()
+                if pos == end or buffer[pos] == ord('\\'):
+                    # Resume at the end of the data, or at an escape once its next byte arrives
+                    break
+                pos += 1
+                in_string = False
+                if not depth:
+                    break
+                continue
+            pos = _UNTIL_BRACKET.match(buffer, pos).end()
+            if pos == end:
+                break
+            char = buffer[pos]
+            pos += 1
+            if char == ord('"'):
+                in_string = True
+            elif char in b'[{':
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    break
+        self._depth, self._in_string = depth, in_string
+        done = not depth and not in_string
+        if done:
+            if self._capture:
+                self._emit(pos, items)
+            self._end_value()
+        return pos, done
+
+    def _parse(self, final=False):
+        items = []
+        buffer = self._buffer
+        pos = self._pos
+        while True:
+            state = self._state
+            if state == _SKIP:
+                pos, done = self._skip(pos, items)
+                if not done:
+                    break
+                continue
+            if state == _SCALAR:
+                match = _SCALAR_END.search(buffer, pos)
+                if match is None and not final:
+                    break
+                end = len(buffer) if match is None else match.start()
+                if self._capture:
+                    self._emit(end, items)
+                elif buffer[self._start:end].strip(b'-+.0123456789eE') and \
+                        bytes(buffer[self._start:end]) not in (b'true', b'false', b'null'):
+                    raise self._error("Invalid literal", self._start)
+                pos = end
+                self._end_value()
+                continue
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if state == _VALUE:
+                if self._empty and char == ord(']'):
+                    pos = self._close(pos, char)
+                else:
+                    self._empty = False
+                    pos = self._start_value(pos)
+            elif state == _KEY:
+                if self._empty and char == ord('}'):
+                    pos = self._close(pos, char)
+                    continue
+                if char != ord('"'):
+                    raise self._error("Expecting property name enclosed in double quotes", pos)
+                match = _STRING.match(buffer, pos)
+                if match is None:
+                    break
+                key = match.group(1)
+                self._path[-1] = json.loads(match.group()) if b'\\' in key else key.decode('utf-8')
+                self._state = _COLON
+                pos = match.end()
+            elif state == _COLON:
+                if char != ord(':'):
+                    raise self._error("Expecting ':' delimiter", pos)
+                self._state = _VALUE
+                self._empty = False
+                pos += 1
+            elif state == _NEXT:
+                if char == ord(','):
+                    self._state = _KEY if self._containers[-1] == ord('{') else _VALUE
+                    self._empty = False
+                    pos += 1
+                else:
+                    pos = self._close(pos, char)
+            else:
+                raise self._error("Extra data", pos)
+
+        # Drop the bytes already parsed, keeping the value being captured or resumed
+        keep = self._start if self._state == _SCALAR or (self._state == _SKIP and self._capture) else pos
+        del buffer[:keep]
+        self._offset += keep
+        self._start -= keep
+        self._pos = pos - keep
+        return items
+
+    def _close(self, pos, char):
+        containers = self._containers
+        if not containers or char != containers[-1] + 2:
+            # ']' and '}' follow '[' and '{' by two code points
+            raise self._error(f"Unexpected character {chr(char)!r}", pos)
+        containers.pop()
+        self._path.pop()
+        self._end_value()
+        return pos + 1
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the document.
+
+        Parameters:
+        - data (bytes-like): The chunk.
+
+        Returns:
+        list: The values at the path completed by the chunk, decoded.
+
+        Raises:
+        requests.exceptions.JSONDecodeError: If the document is not valid JSON.
+        """
+        self._buffer += data
+        return self._parse()
+
+    def close(self):
+        """
+        Signal the end of the document.
+
+        Returns:
+        list: The last values at the path, decoded (a number ending the document).
+
+        Raises:
+        requests.exceptions.JSONDecodeError: If the document is incomplete or not valid JSON.
+        """
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise self._error("Unexpected end of document", len(self._buffer))
+        return items
+
+
+def _parse_chunks(parser, chunks):
+    for chunk in chunks:
+        yield parser.feed(chunk)
+    yield parser.close()
+
+
+def iter_json_items(chunks, path='item', codec=None):
+    """
+    Decode the values at a path of a JSON document received in chunks (see JsonItemParser).
+
+    Parameters:
+    - chunks (iterable): The bytes-like chunks of the document.
+    - path (str, optional): The path of the values to decode. Defaults to 'item'.
+    - codec (object, optional): The JSON codec decoding the values. Defaults to the standard library.
+
+    Yields:
+    object: The decoded values, in document order.
+
+    Raises:
+    requests.exceptions.JSONDecodeError: If the document is incomplete or not valid JSON.
+    """
+    for items in _parse_chunks(JsonItemParser(path, codec), chunks):
+        yield from items
+
+
+def _decode_lines(data, codec, records, line, offset, final=False):
+    """
+    Decode the complete lines of a buffer as JSON records.
+
+    Each record is handed to the codec as a memoryview of the buffer, so no bytes object is created per line (the
+    standard library codec copies it). Blank lines are skipped, and a carriage return before the newline is ignored.
+
+    Parameters:
+    - data (bytes-like): The buffer, starting at the beginning of a line.
+    - codec (object): The JSON codec.
+    - records (list): The list the decoded records are appended to.
+    - line (int): The number of lines before the buffer, for error messages.
+    - offset (int): The offset of the buffer in the stream, for error messages.
+    - final (bool, optional): Whether the buffer ends the stream, its last line being complete without a newline. Defaults to False.
+
+    Returns:
+    tuple: The offset after the last complete line, and the number of lines before it.
+
+    Raises:
+    requests.exceptions.JSONDecodeError: If a line is not valid JSON.
+    """
+    size = len(data)
+    start = 0
+    with memoryview(data) as view:
+        while start < size:
+            end = data.find(b'\n', start)
+            if end < 0:
+                if not final:
+                    break
+                end = size
+            line += 1
+            stop = end - 1 if end > start and data[end - 1] == ord('\r') else end
+            if stop > start:
+                try:
+                    records.append(codec.loads(view[start:stop]))
+                except ValueError as e:
+                    if _WHITESPACE.fullmatch(data, start, stop) is None:
+                        raise requests.exceptions.JSONDecodeError(f"Invalid record on line {line}", '',
+                                                                  offset + start) from e
+            start = end + 1
+    return min(start, size), line
+
+
+class NdjsonParser:
+    """
+    Parses newline-delimited JSON (NDJSON, JSON Lines) fed in chunks, decoding each record as soon as its line ends.
+
+    Only the incomplete last line is kept between chunks, so memory is constant whatever the length of the stream,
+    and a chunk without a newline is appended without being scanned again.
+
+    Parameters:
+    - codec (object, optional): The JSON codec decoding the records (see JsonCodec). Defaults to the standard library.
+    """
+
+    def __init__(self, codec=None):
+        self.codec = JsonCodec() if codec is None else codec
+        self._buffer = bytearray()
+        self._offset = 0
+        self._line = 0
+
+    def _parse(self, final=False):
+        records = []
+        consumed, self._line = _decode_lines(self._buffer, self.codec, records, self._line, self._offset, final)
+        del self._buffer[:consumed]
+        self._offset += consumed
+        return records
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the stream.
+
+        Parameters:
+        - data (bytes-like): The chunk.
+
+        Returns:
+        list: The records of the lines completed by the chunk, decoded.
+
+        Raises:
+        requests.exceptions.JSONDecodeError: If a line is not valid JSON.
+        """
+        self._buffer += data
+        if b'\n' not in data:
+            return []
+        return self._parse()
+
+    def close(self):
+        """
+        Signal the end of the stream.
+
+        Returns:
+        list: The record of the last line if it does not end with a newline, decoded.
+
+        Raises:
+        requests.exceptions.JSONDecodeError: If the line is not valid JSON.
+        """
+        return self._parse(final=True)
+
+
+def check_batch_size(batch_size):
+    """
+    Validate the batch size of an NDJSON iteration.
+
+    Parameters:
+    - batch_size (int or None): The batch size.
+
+    Returns:
+    None
+
+    Raises:
+    ValueError: If the batch size is neither None nor an integer of at least 1.
+    """
+    if batch_size is not None and (not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1):
+        raise ValueError(f"The batch size must be None or an integer of at least 1, not {batch_size!r}.")
+
+
+def iter_ndjson_records(chunks, codec=None, batch_size=None):
+    """
+    Decode the records of an NDJSON stream received in chunks (see NdjsonParser).
+
+    Parameters:
+    - chunks (iterable): The bytes-like chunks of the stream.
+    - codec (object, optional): The JSON codec decoding the records. Defaults to the standard library.
+    - batch_size (int, optional): Yield lists of up to this many records instead of single records. Defaults to None.
+
+    Yields:
+    object or list: The decoded records, or lists of batch_size records (the last one possibly shorter).
+
+    Raises:
+    ValueError: If batch_size is neither None nor an integer of at least 1.
+    requests.exceptions.JSONDecodeError: If a line is not valid JSON.
+    """
+    check_batch_size(batch_size)
+    parsed = _parse_chunks(NdjsonParser(codec), chunks)
+    if batch_size is None:
+        for records in parsed:
+            yield from records
+        return
+    batch = []
+    for records in parsed:
+        batch += records
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            del batch[:batch_size]
+    if batch:
+        yield batch
@@ -0,0 +1,267 @@
+import os
+from collections import deque
+
+from .JsonCodec import encode_body, get_codec
+from .Upload import set_payload
+from .Transport import CurlTransport, pycurl
+
+
+class MultiEngine:
+    """
+    Executes a queue of Curl-style requests through a single libcurl multi handle.
+
+    MultiEngine drives thousands of simultaneous transfers from one thread: requests and file downloads are queued
+    with add() and add_download(), then executed by run(), which yields one result per job as it completes, or by
+    perform(), which only invokes the callbacks. Connection limits are enforced by libcurl for the whole engine and
+    per host, and connections are reused across jobs.
+
+    Requests are prepared with the same rules as the 'curl' transport (see Transport.CurlTransport), so headers,
+    cookies, timeouts and redirects behave as with Curl. Options staged on the Curl instance passed to the
+    constructor (set_header, set_timeout, ...) apply to every job.
+
+    MultiEngine requires the optional pycurl package (pip install pycurl).
+
+    Example Usage:
+    ```
+    engine = MultiEngine(curl, max_total_connections=200, max_host_connections=8)
+    for url in urls:
+        engine.add('get', url)
+    for result in engine.run():
+        print(result['index'], result['response'].status_code if result['response'] else result['error'])
+    ```
+    """
+
+    def __init__(self, curl=None, max_total_connections=100, max_host_connections=6, max_transfers=1000,
+                 callback=None):
+        """
+        Initializes a new instance of the MultiEngine class.
+
+        Parameters:
+        - curl (BaseCurl, optional): A client whose defaults and staged options (headers, cookies, timeout, follow location) apply to every job. The staged options are consumed as by a request. Defaults to None.
+        - max_total_connections (int, optional): The maximum number of simultaneously open connections. Defaults to 100.
+        - max_host_connections (int, optional): The maximum number of simultaneously open connections per host. Defaults to 6.
+        - max_transfers (int, optional): The maximum number of transfers added to the multi handle at the same time; the rest wait in the queue. Defaults to 1000.
+        - callback (callable, optional): A function called with the result of every job. Defaults to None.
+
+        Returns:
+        None
+
+        Raises:
+        ImportError: If pycurl is not installed.
+        """
+        self._transport = CurlTransport()
+        self._multi = pycurl.CurlMulti()
+        self._multi.setopt(pycurl.M_MAX_TOTAL_CONNECTIONS, max_total_connections)
+        self._multi.setopt(pycurl.M_MAX_HOST_CONNECTIONS, max_host_connections)
+        self._max_transfers = max_transfers
+        self.callback = callback
+        self._queue = deque()
+        self._active = {}
+        self._handles = []
+        self._count = 0
+
+        self._staged = {'headers': {}, 'cookies': {}, 'timeout': None, 'follow_location': None}
+        self._json_codec = get_codec()
+        if curl is not None:
+            self._staged = curl._request_options(curl._context())
+            self._json_codec = curl.get_json_codec()
+            curl.close()
+
+    def add(self, method, url, headers=None, cookies=None, params=None, data=None, callback=None):
+        """
+        Queue a request.
+
+        Parameters:
+        - method (str): The HTTP method for the request (e.g., 'GET', 'POST').
+        - url (str): The URL to which the request will be sent.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Parameters to be included in the query string.
+        - data (dict, optional): The request payload, sent as JSON for post, put and patch.
+        - callback (callable, optional): A function called with the result of this job. Defaults to None.
+
+        Returns:
+        int: The index of the job, reported in its result.
+        """
+        return self._add({
+            'method': method,
+            'url': url,
+            'headers': headers,
+            'cookies': cookies,
+            'params': params,
+            'data': data
+        }, None, callback)
+
+    def add_download(self, url, dir_path, file_name, method='get', headers=None, cookies=None, params=None,
+                     data=None, callback=None):
+        """
+        Queue a file download, with the same arguments as Curl.download_file().
+
+        Parameters:
+        - url (str): The URL from which to download the file.
+        - dir_path (str): The directory path where the file will be saved.
+        - file_name (str): The name of the file to be saved.
+        - method (str, optional): The HTTP method to use for the request. Defaults to 'get'.
+        - headers (dict, optional): Additional headers to be included in the request.
+        - cookies (dict, optional): Cookies to be included in the request.
+        - params (dict, optional): Query parameters to be included in the request.
+        - data (dict, optional): The data payload to be sent with the request.
+        - callback (callable, optional): A function called with the result of this job. Defaults to None.
+
+        Returns:
+        int: The index of the job, reported in its result.
+
+        Raises:
+        FileNotFoundError: If the specified directory does not exist.
+        ValueError: If an unsupported HTTP method is provided. Only 'get' and 'post' are supported.
+        """
+        if not os.path.exists(dir_path):
+            raise FileNotFoundError(f"The specified directory '{dir_path}' does not exist.")
+        if method.lower() not in ('get', 'post'):
+            raise ValueError("Unsupported HTTP method. Only 'get' and 'post' are supported.")
+        return self._add({
+            'method': method,
+            'url': url,
+            'headers': headers,
+            'cookies': cookies,
+            'params': params,
+            'data': data
+        }, os.path.join(dir_path, file_name), callback)
+
+    def _add(self, request, file_path, callback):
+        index = self._count
+        self._count += 1
+        self._queue.append((index, request, file_path, callback))
+        return index
+
+    def pending(self):
+        """
+        Retrieve the number of jobs that have not completed yet.
+
+        Returns:
+        int: The number of queued and active jobs.
+        """
+        return len(self._queue) + len(self._active)
+
+    def _start(self, index, request, file_path, callback):
+        request_kwargs = {
+            'method': request['method'],
+            'url': request['url'],
+            'headers': {**self._staged['headers'], **(request.get('headers') or {})},
+            'cookies': {**self._staged['cookies'], **(request.get('cookies') or {})},
+            'timeout': self._staged['timeout'],
+            'allow_redirects': self._staged['follow_location'],
+            'params': request.get('params'),
+        }
+        if request['method'].lower() in ['post', 'put', 'patch']:
+            set_payload(request_kwargs, request.get('data'))
+
+        job = {'index': index, 'request': request, 'file_path': file_path, 'callback': callback,
+               'file': None, 'body': [], 'header_lines': []}
+        try:
+            request_kwargs = encode_body(request_kwargs, self._json_codec)
+            job['prepared'] = self._transport._prepare(request_kwargs)
+            if file_path is not None:
+                job['file'] = open(file_path, 'wb')
+                on_data = job['file'].write
+            else:
+                on_data = job['body'].append
+            handle = self._handles.pop() if self._handles else pycurl.Curl()
+            handle.reset()
+            self._transport._setup(handle, job['prepared'], request_kwargs, job['header_lines'], on_data)
+        except Exception as e:
+            if job['file'] is not None:
+                job['file'].close()
+            return self._result(job, None, str(e))
+
+        self._active[handle] = job
+        self._multi.add_handle(handle)
+        return None
+
+    def _complete(self, handle, code=None, message=None):
+        job = self._active.pop(handle)
+        self._multi.remove_handle(handle)
+        if job['file'] is not None:
+            job['file'].close()
+
+        if code is not None:
+            error = str(self._transport._error(code, message))
+            response = None
+            if job['file_path'] is not None and os.path.exists(job['file_path']):
+                os.remove(job['file_path'])
+        else:
+            error = None
+            response = self._transport._make_response(handle, job['prepared'], job['header_lines'], None)
+            response._content = b''.join(job['body']) if job['file_path'] is None else b''
+            response._content_consumed = True
+        self._handles.append(handle)
+        return self._result(job, response, error)
+
+    def _result(self, job, response, error):
+        result = {'index': job['index'], 'request': job['request'], 'response': response, 'error': error}
+        if job['file_path'] is not None:
+            result['file_path'] = job['file_path'] if error is None else None
+            result['file_size'] = os.path.getsize(job['file_path']) if error is None else 0
+        for callback in (job['callback'], self.callback):
+            if callback:
+                callback(result)
+        return result
+
+    def run(self):
+        """
+        Execute the queued jobs, yielding their results as they complete.
+
+        Jobs may be added while iterating. A failed job is reported in its result and never aborts the others; a failed download does not leave a partial file behind.
+
+        Yields:
+        dict: A dictionary with the keys 'index', 'request', 'response' (requests.Response with the body loaded, or None) and 'error' (error message or None). Download results also have 'file_path' and 'file_size'.
+        """
+        try:
+            while self._queue or self._active:
+                while self._queue and len(self._active) < self._max_transfers:
+                    result = self._start(*self._queue.popleft())
+                    if result is not None:
+                        yield result
+
+                status, _ = self._multi.perform()
+                while status == pycurl.E_CALL_MULTI_PERFORM:
+                    status, _ = self._multi.perform()
+
+                while True:
+                    queued, succeeded, failed = self._multi.info_read()
+                    for handle in succeeded:
+                        yield self._complete(handle)
+                    for handle, code, message in failed:
+                        yield self._complete(handle, code, message)
+                    if queued == 0:
+                        break
+
+                if self._active:
+                    self._multi.select(1.0)
+        finally:
+            for handle in list(self._active):
+                self._complete(handle, pycurl.E_ABORTED_BY_CALLBACK, 'Transfer aborted')
+
+    def perform(self):
+        """
+        Execute all the queued jobs, delivering the results only through the callbacks.
+
+        Returns:
+        int: The number of jobs executed.
+        """
+        count = 0
+        for _ in self.run():
+            count += 1
+        return count
+
+    def close(self):
+        """
+        Release the multi handle and all the easy handles.
+
+        Returns:
+        None
+        """
+        for handle in self._handles:
+            handle.close()
+        self._handles = []
+        self._multi.close()
@@ -0,0 +1,264 @@
+import threading
+import time
+import weakref
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.poolmanager import PoolManager
+
+
+class PoolMonitor:
+    """
+    Shared state for every connection pool created by a PoolAdapter.
+
+    PoolMonitor holds the pool policy that urllib3 does not provide by itself (a total connection limit across
+    all hosts and an idle timeout for kept-alive connections) together with the counters used to build the
+    statistics returned by BaseCurl.get_pool_stats().
+
+    Attributes:
+        max_connections: Maximum number of connections checked out at the same time across all hosts, or None for no limit.
+        block: Whether to wait for a free connection when a limit is reached instead of opening an overflow connection.
+        idle_timeout: Seconds a kept-alive connection may sit idle before it is closed instead of being reused, or None.
+    """
+
+    def __init__(self, max_connections=None, block=False, idle_timeout=None):
+        self.max_connections = max_connections
+        self.block = block
+        self.idle_timeout = idle_timeout
+        self._condition = threading.Condition()
+        self._pools = weakref.WeakSet()
+        self._in_use = 0
+        self._checkouts = 0
+        self._reused = 0
+        self._created = 0
+        self._waits = 0
+        self._overflows = 0
+        self._discarded = 0
+        self._expired = 0
+
+    def register(self, pool):
+        """
+        Register a connection pool so its idle connections are included in the statistics.
+
+        Parameters:
+        - pool (HTTPConnectionPool): The pool created by the pool manager.
+
+        Returns:
+        None
+        """
+        pool._pycurlify_monitor = self
+        with self._condition:
+            self._pools.add(pool)
+
+    def acquire(self, pool, timeout=None):
+        """
+        Reserve a connection slot before a connection is taken from a pool.
+
+        Waits while the total limit is reached when blocking is enabled, otherwise records an overflow.
+
+        Parameters:
+        - pool (HTTPConnectionPool): The pool requesting the slot.
+        - timeout (float, optional): Maximum seconds to wait for a slot. None waits indefinitely.
+
+        Returns:
+        None
+
+        Raises:
+        EmptyPoolError: If blocking is enabled and no slot became available within the timeout.
+        """
+        with self._condition:
+            if self.max_connections is not None and self._in_use >= self.max_connections:
+                if self.block:
+                    self._waits += 1
+                    if not self._condition.wait_for(lambda: self._in_use < self.max_connections, timeout):
+                        raise EmptyPoolError(pool, "Total connection limit reached and no connection was released in time.")
+                else:
+                    self._overflows += 1
+            elif pool.pool is not None and pool.pool.empty():
+                if self.block:
+                    self._waits += 1
+                else:
+                    self._overflows += 1
+            self._in_use += 1
+            self._checkouts += 1
+
+    def checked_out(self, conn):
+        """
+        Record a connection handed out by a pool, closing it first if it has been idle for too long.
+
+        Parameters:
+        - conn (HTTPConnection): The connection returned by the pool.
+
+        Returns:
+        None
+        """
+        with self._condition:
+            if getattr(conn, 'sock', None) is not None:
+                idle_since = getattr(conn, '_pycurlify_idle_since', None)
+                if self.idle_timeout is not None and idle_since is not None \
+                        and time.monotonic() - idle_since > self.idle_timeout:
+                    self._expired += 1
+                    conn.close()
+                else:
+                    self._reused += 1
+
+    def created(self):
+        """
+        Record a new connection opened by a pool.
+
+        Returns:
+        None
+        """
+        with self._condition:
+            self._created += 1
+
+    def release(self, pool, conn):
+        """
+        Release the slot taken by acquire() when a connection goes back to its pool.
+
+        Parameters:
+        - pool (HTTPConnectionPool): The pool the connection belongs to.
+        - conn (HTTPConnection or None): The connection being returned.
+
+        Returns:
+        None
+        """
+        with self._condition:
+            if conn is not None:
+                conn._pycurlify_idle_since = time.monotonic()
+                if pool.pool is not None and pool.pool.full():
+                    self._discarded += 1
+            self._in_use = max(self._in_use - 1, 0)
+            self._condition.notify()
+
+    def stats(self):
+        """
+        Build a snapshot of the pool statistics.
+
+        Returns:
+        dict: A dictionary with the following keys:
+            - open (int): Connections currently open, idle or in use.
+            - idle (int): Open connections waiting in a pool to be reused.
+            - in_use (int): Connections currently checked out by a request.
+            - requests (int): Total number of connection checkouts.
+            - created (int): Total number of connections opened.
+            - reused (int): Checkouts served by an already open connection.
+            - reuse_ratio (float): reused / requests, or 0.0 before the first request.
+            - waits (int): Checkouts that had to wait for a free connection.
+            - overflows (int): Checkouts that exceeded a limit and opened an extra connection.
+            - discarded (int): Connections closed because their pool was already full.
+            - expired (int): Connections closed because they exceeded the idle timeout.
+        """
+        with self._condition:
+            idle = 0
+            for pool in list(self._pools):
+                queue = pool.pool
+                if queue is None:
+                    continue
+                idle += sum(1 for conn in list(queue.queue) if conn is not None and conn.sock is not None)
+            return {
+                'open': idle + self._in_use,
+                'idle': idle,
+                'in_use': self._in_use,
+                'requests': self._checkouts,
+                'created': self._created,
+                'reused': self._reused,
+                'reuse_ratio': self._reused / self._checkouts if self._checkouts else 0.0,
+                'waits': self._waits,
+                'overflows': self._overflows,
+                'discarded': self._discarded,
+                'expired': self._expired,
+            }
+
+
+class _MonitoredPoolMixin:
+    """
+    Hooks the connection checkout/checkin path of a urllib3 connection pool into its PoolMonitor.
+    """
+
+    def _get_conn(self, timeout=None):
+        monitor = self._pycurlify_monitor
+        monitor.acquire(self, timeout)
+        try:
+            conn = super()._get_conn(timeout=timeout)
+        except Exception:
+            monitor.release(self, None)
+            raise
+        monitor.checked_out(conn)
+        return conn
+
+    def _new_conn(self):
+        self._pycurlify_monitor.created()
+        return super()._new_conn()
+
+    def _put_conn(self, conn):
+        self._pycurlify_monitor.release(self, conn)
+        super()._put_conn(conn)
+
+
+class MonitoredHTTPConnectionPool(_MonitoredPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class MonitoredHTTPSConnectionPool(_MonitoredPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class MonitoredPoolManager(PoolManager):
+    """
+    A urllib3 PoolManager whose per-host pools report to a PoolMonitor.
+    """
+
+    def __init__(self, monitor, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.monitor = monitor
+        self.pool_classes_by_scheme = {
+            'http': MonitoredHTTPConnectionPool,
+            'https': MonitoredHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        self.monitor.register(pool)
+        return pool
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    A requests transport adapter with a configurable and observable connection pool.
+
+    Parameters:
+    - pool_connections (int, optional): Number of per-host pools to keep cached. Defaults to 10.
+    - pool_maxsize (int, optional): Maximum number of connections kept per host. Defaults to 10.
+    - max_connections (int, optional): Maximum number of connections in use across all hosts. Defaults to None (no limit).
+    - pool_block (bool, optional): Wait for a free connection when a limit is reached instead of opening an
+      overflow connection that is discarded afterwards. Defaults to False.
+    - idle_timeout (float, optional): Seconds after which an idle kept-alive connection is closed instead of being
+      reused. Defaults to None (never).
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE, max_connections=None,
+                 pool_block=False, idle_timeout=None, **kwargs):
+        self.monitor = PoolMonitor(max_connections=max_connections, block=pool_block, idle_timeout=idle_timeout)
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = MonitoredPoolManager(
+            self.monitor,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def get_stats(self):
+        """
+        Retrieve the statistics of the connection pools managed by this adapter.
+
+        Returns:
+        dict: See PoolMonitor.stats().
+        """
+        return self.monitor.stats()
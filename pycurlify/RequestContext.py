@@ -0,0 +1,44 @@
+# Marks an option that was not staged for the next request, so the client default applies
+UNSET = object()
+
+
+class RequestContext:
+    """
+    Per-thread request state of a BaseCurl instance.
+
+    BaseCurl keeps one RequestContext per thread, so the options staged for the next request (headers, cookies,
+    timeout, follow location, streaming) and the last response are never shared between threads. This allows a
+    single client, and therefore its session and connection pool, to be used by many threads at the same time.
+
+    Attributes:
+        headers: Headers staged for the next request.
+        cookies: Cookies staged for the next request.
+        timeout: Timeout staged for the next request, or UNSET to use the client default.
+        follow_location: Redirect setting staged for the next request, or UNSET to use the client default.
+        stream: Whether the next request streams its response.
+        request_headers: Headers sent in the last request of this thread.
+        response: Last response received by this thread.
+        error: Message of the exception raised by the last request of this thread, or None if it got a response.
+    """
+
+    def __init__(self):
+        self.headers = {}
+        self.cookies = {}
+        self.timeout = UNSET
+        self.follow_location = UNSET
+        self.stream = False
+        self.request_headers = {}
+        self.response = None
+        self.error = None
+
+    def reset(self):
+        """
+        Clear the options staged for the next request, keeping the last request headers and response.
+
+        Returns:
+        None
+        """
+        self.headers = {}
+        self.cookies = {}
+        self.timeout = UNSET
+        self.follow_location = UNSET
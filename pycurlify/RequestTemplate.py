@@ -0,0 +1,139 @@
+from string import Formatter
+from types import MappingProxyType
+from urllib.parse import urlparse
+
+from .Upload import set_payload
+
+
+class RequestTemplate:
+    """
+    An immutable, reusable request created by Curl.prepare().
+
+    The invariant parts of a request (method, merged headers including Host and Connection, cookies, timeout, redirect
+    and streaming settings, and the parsed URL template) are computed once when the template is created. send() only
+    fills in the varying parts and hands the request to the client transport, skipping the per-call setup of
+    BaseCurl.exec(). Templates are safe to share between threads.
+
+    The URL may contain str.format() fields, e.g. 'https://api.example.com/items/{item_id}', filled by send().
+
+    Example Usage:
+    ```
+    template = curl.prepare('get', 'https://api.example.com/items/{item_id}', headers={'Accept': 'application/json'})
+    for item_id in ids:
+        response = template.send(item_id=item_id, params={'fields': 'name'})
+    ```
+    """
+
+    __slots__ = ('_client', '_method', '_url', '_url_fields', '_headers', '_cookies', '_timeout', '_follow_location',
+                 '_stream', '_has_body')
+
+    def __init__(self, client, method, url, headers=None, cookies=None, timeout=None, follow_location=None,
+                 stream=False):
+        """
+        Initializes a new instance of the RequestTemplate class.
+
+        Parameters:
+        - client (BaseCurl): The client whose transport and callbacks are used to send the request.
+        - method (str): The HTTP method for the request (e.g., 'GET', 'POST').
+        - url (str): The URL, optionally with str.format() fields.
+        - headers (dict, optional): The headers of the request.
+        - cookies (dict, optional): The cookies of the request.
+        - timeout (int or float, optional): The timeout of the request. Defaults to None.
+        - follow_location (bool, optional): Whether to follow redirects. Defaults to None.
+        - stream (bool, optional): Whether to stream the response. Defaults to False.
+
+        Returns:
+        None
+        """
+        url_fields = tuple(field for _, field, _, _ in Formatter().parse(url) if field is not None)
+        set_ = object.__setattr__
+        set_(self, '_client', client)
+        set_(self, '_method', method)
+        set_(self, '_url', url)
+        set_(self, '_url_fields', url_fields)
+        set_(self, '_cookies', MappingProxyType(dict(cookies or {})))
+        set_(self, '_timeout', timeout)
+        set_(self, '_follow_location', follow_location)
+        set_(self, '_stream', stream)
+        set_(self, '_has_body', method.lower() in ['post', 'put', 'patch'])
+
+        netloc = urlparse(url).netloc
+        if '{' in netloc:
+            # The host depends on the URL fields, so the Host header is computed by send()
+            fixed_headers = {"Connection": "keep-alive"}
+        else:
+            fixed_headers = {'Host': netloc, "Connection": "keep-alive"}
+        merged = {**fixed_headers, **(headers or {})}
+        set_(self, '_headers', MappingProxyType(merged))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RequestTemplate objects are immutable")
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def headers(self):
+        return self._headers
+
+    @property
+    def cookies(self):
+        return self._cookies
+
+    def send(self, params=None, data=None, headers=None, cookies=None, **url_fields):
+        """
+        Send the request, filling in its varying parts.
+
+        The response is recorded on the client as for any other request, so get_response(), response() and the callbacks work as usual. Options staged on the client are not used; they were captured by Curl.prepare().
+
+        Parameters:
+        - params (dict, optional): Parameters to be included in the query string.
+        - data (dict, optional): The request payload, sent as JSON for post, put and patch.
+        - headers (dict, optional): Additional headers for this request only.
+        - cookies (dict, optional): Additional cookies for this request only.
+        - **url_fields: Values of the URL template fields.
+
+        Returns:
+        requests.Response or None: The response, or None if the request was not successful.
+
+        Raises:
+        KeyError: If a URL template field is missing.
+        """
+        url = self._url.format(**url_fields) if self._url_fields else self._url
+
+        if headers or 'Host' not in self._headers:
+            final_headers = dict(self._headers)
+            if 'Host' not in final_headers:
+                final_headers['Host'] = urlparse(url).netloc
+            if headers:
+                final_headers.update(headers)
+        else:
+            final_headers = self._headers
+
+        request_kwargs = {
+            'method': self._method,
+            'url': url,
+            'headers': final_headers,
+            'cookies': {**self._cookies, **cookies} if cookies else self._cookies,
+            'timeout': self._timeout,
+            'allow_redirects': self._follow_location,
+            'params': params,
+            'stream': self._stream
+        }
+        if self._has_body:
+            set_payload(request_kwargs, data)
+
+        client = self._client
+        if client.before_send_callback:
+            # The callback may modify the request, so it gets its own copies
+            request_kwargs['headers'] = dict(request_kwargs['headers'])
+            request_kwargs['cookies'] = dict(request_kwargs['cookies'])
+
+        context = client._context()
+        client._dispatch(context, request_kwargs)
+        return context.response
@@ -0,0 +1,142 @@
+import copy
+import threading
+from requests.structures import CaseInsensitiveDict
+
+from .Transport import LeanTransport
+
+COALESCED_METHODS = frozenset(('GET', 'HEAD'))
+# Request headers that never change the response, left out of the coalescing key
+IGNORED_HEADERS = frozenset(('connection', 'keep-alive'))
+
+
+class _Flight:
+    """
+    A request in flight, awaited by the callers that joined it.
+    """
+
+    __slots__ = ('done', 'response', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+def _share(response):
+    """
+    Copy a response whose body is loaded, for one more caller of a coalesced request.
+
+    The copy shares the body with the original, which is never modified, and has its own headers, cookies and
+    history, so that a caller changing them or the encoding is not seen by the others.
+
+    Parameters:
+    - response (requests.Response): The response.
+
+    Returns:
+    requests.Response: The copy.
+    """
+    shared = copy.copy(response)
+    shared.headers = CaseInsensitiveDict(response.headers)
+    shared.cookies = response.cookies.copy()
+    shared.history = list(response.history)
+    return shared
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical GET and HEAD requests into one network round trip.
+
+    The first caller of a request (the leader) sends it; callers issuing an identical request while it is in flight
+    wait for it and receive a copy of its response, or the same exception. Requests are identical when they have
+    the same method, URL with query string, request headers, cookies and redirect policy, so every header a Vary
+    response header could name is part of the key. Streamed requests are never coalesced, and the body of a shared
+    response is loaded before it is handed out; the copies share the body but not the headers, cookies or encoding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.leaders = 0
+        self.collapsed = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def _key(request_kwargs):
+        method = request_kwargs['method'].upper()
+        if method not in COALESCED_METHODS or request_kwargs.get('stream'):
+            return None
+        headers = request_kwargs.get('headers') or {}
+        cookies = request_kwargs.get('cookies') or {}
+        return (
+            method,
+            LeanTransport._build_url(request_kwargs['url'], request_kwargs.get('params')),
+            tuple(sorted((name.lower(), value) for name, value in headers.items()
+                         if name.lower() not in IGNORED_HEADERS)),
+            tuple(sorted(cookies.items())),
+            request_kwargs.get('allow_redirects')
+        )
+
+    def stats(self):
+        """
+        Retrieve the coalescing counters.
+
+        Returns:
+        dict: The 'leaders' (requests sent), 'collapsed' (calls served by another caller's request), 'bypassed' (requests never coalesced) and 'in_flight' counters.
+        """
+        with self._lock:
+            return {
+                'leaders': self.leaders,
+                'collapsed': self.collapsed,
+                'bypassed': self.bypassed,
+                'in_flight': len(self._flights)
+            }
+
+    def send(self, request_kwargs, send):
+        """
+        Send a request, or wait for the identical request already in flight.
+
+        Parameters:
+        - request_kwargs (dict): The request keyword arguments built by BaseCurl.exec().
+        - send (callable): The function sending the request (Transport.send, or the cache in front of it).
+
+        Returns:
+        requests.Response: The response; the coalesced callers each receive a copy of it sharing its body.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        """
+        key = self._key(request_kwargs)
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return send(request_kwargs)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _share(flight.response)
+
+        try:
+            response = send(request_kwargs)
+            # Load the body now, so the followers never race on the connection
+            response.content
+            # The followers copy a snapshot, as the leader's caller may change the response meanwhile
+            flight.response = _share(response)
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,181 @@
+import mmap
+import tempfile
+import requests
+
+# Size of the chunks read from the connection while a body is loaded
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class BodyTooLargeError(requests.RequestException):
+    """
+    Raised when a response body exceeds the maximum body size. The transfer is aborted and its connection closed.
+    """
+
+
+def is_spooled(content):
+    """
+    Tell whether a response body was spooled to a temporary file.
+
+    Parameters:
+    - content (bytes-like): The response body.
+
+    Returns:
+    bool: True if the body is a read-only memory map of a temporary file.
+    """
+    return isinstance(content, mmap.mmap)
+
+
+class _Spool:
+    """
+    Accumulates a response body in memory, then in an anonymous temporary file once it exceeds the threshold.
+    """
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.chunks = []
+        self.size = 0
+        self.file = None
+
+    def write(self, chunk):
+        limits = self.limits
+        self.size += len(chunk)
+        if limits.max_body_size is not None and self.size > limits.max_body_size:
+            raise BodyTooLargeError(f"The response body exceeds the maximum size of {limits.max_body_size} bytes.")
+        if self.file is not None:
+            self.file.write(chunk)
+            return
+        self.chunks.append(chunk)
+        if limits.spool_threshold is not None and self.size > limits.spool_threshold:
+            self.file = tempfile.TemporaryFile(prefix='pycurlify-', dir=limits.spool_dir)
+            for buffered in self.chunks:
+                self.file.write(buffered)
+            self.chunks = []
+
+    def finish(self):
+        """
+        Retrieve the body.
+
+        Returns:
+        bytes or mmap.mmap: The body, or a read-only memory map of the temporary file if it was spooled.
+        """
+        if self.file is None:
+            return b''.join(self.chunks)
+        with self.file:
+            self.file.flush()
+            # The mapping stays valid once the (already unlinked) file is closed, and its pages are backed by the file
+            # rather than by the memory of the process
+            return mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+        self.chunks = []
+
+
+class BodyLimits:
+    """
+    Loads response bodies with a memory threshold above which they are spooled to disk, and a hard size limit.
+
+    The transport is asked to stream the response and the body is read in chunks: up to spool_threshold bytes it is
+    kept in memory as usual, beyond that it is written to an anonymous temporary file, memory-mapped once complete, so
+    a huge body never counts against the memory of the process. A body larger than max_body_size aborts the transfer
+    as soon as the limit is crossed, or before reading anything when the Content-Length announces it.
+
+    A spooled body is a read-only mmap.mmap set as response content: response.content, response.text and
+    iter_content() keep working, and BaseCurl.get_content() returns a memoryview over it. As charset detection would
+    scan the whole body, spooled responses without a declared charset are decoded as UTF-8.
+
+    Streamed requests (enable_stream()) are returned untouched.
+
+    Parameters:
+    - spool_threshold (int, optional): The body size, in bytes, above which a body is spooled to disk. Defaults to None (never).
+    - max_body_size (int, optional): The maximum body size, in bytes. Defaults to None (no limit).
+    - spool_dir (str, optional): The directory of the temporary files. Defaults to None (the system temporary directory).
+    """
+
+    def __init__(self, spool_threshold=None, max_body_size=None, spool_dir=None):
+        self.spool_threshold = spool_threshold
+        self.max_body_size = max_body_size
+        self.spool_dir = spool_dir
+
+    def _check_length(self, headers):
+        length = headers.get('Content-Length')
+        if self.max_body_size is not None and length and length.isdigit() and int(length) > self.max_body_size \
+                and headers.get('Content-Encoding', 'identity').strip().lower() == 'identity':
+            raise BodyTooLargeError(f"The response body of {length} bytes exceeds the maximum size of "
+                                    f"{self.max_body_size} bytes.")
+
+    @staticmethod
+    def set_content(response, content):
+        """
+        Install a loaded body on a response.
+
+        Parameters:
+        - response (requests.Response): The response.
+        - content (bytes or mmap.mmap): The body returned by the spool.
+
+        Returns:
+        requests.Response: The response.
+        """
+        response._content = content
+        response._content_consumed = True
+        if is_spooled(content) and response.encoding is None:
+            response.encoding = 'utf-8'
+        return response
+
+    def send(self, request_kwargs, send):
+        """
+        Send a request and load its body within the limits.
+
+        Parameters:
+        - request_kwargs (dict): The request keyword arguments (see BaseCurl.exec()).
+        - send (callable): The function sending the request, usually the transport.
+
+        Returns:
+        requests.Response: The response, with its body loaded.
+
+        Raises:
+        BodyTooLargeError: If the body exceeds max_body_size.
+        requests.RequestException: If the request fails.
+        """
+        if request_kwargs.get('stream'):
+            return send(request_kwargs)
+        response = send({**request_kwargs, 'stream': True})
+        spool = _Spool(self)
+        try:
+            self._check_length(response.headers)
+            for chunk in response.iter_content(READ_CHUNK_SIZE):
+                spool.write(chunk)
+        except BaseException:
+            spool.discard()
+            response.close()
+            raise
+        release = getattr(response.raw, 'release_conn', None)
+        if release is not None:
+            release()
+        return self.set_content(response, spool.finish())
+
+    async def aread(self, httpx_response):
+        """
+        Load the body of a streamed httpx response within the limits.
+
+        Parameters:
+        - httpx_response (httpx.Response): The streamed response. It is closed once read.
+
+        Returns:
+        bytes or mmap.mmap: The body.
+
+        Raises:
+        BodyTooLargeError: If the body exceeds max_body_size.
+        """
+        spool = _Spool(self)
+        try:
+            self._check_length(httpx_response.headers)
+            async for chunk in httpx_response.aiter_bytes(READ_CHUNK_SIZE):
+                spool.write(chunk)
+        except BaseException:
+            spool.discard()
+            raise
+        finally:
+            await httpx_response.aclose()
+        return spool.finish()
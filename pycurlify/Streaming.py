@@ -0,0 +1,307 @@
+import http.client
+import os
+import select
+import time
+import requests
+import urllib3
+
+try:
+    import fcntl
+    import ssl
+except ImportError:
+    fcntl = ssl = None
+
+# Bounds of the adaptive read size of copy_body()
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# The read size doubles while a full read takes less than this many seconds
+TARGET_READ_SECONDS = 0.01
+# Minimum interval between two progress reports, in seconds
+PROGRESS_INTERVAL = 0.1
+# Capacity requested for the pipe of splice_body(), in bytes
+PIPE_SIZE = 1024 * 1024
+# fcntl command setting the capacity of a pipe (Linux)
+F_SETPIPE_SZ = 1031
+
+
+def _readinto_function(response):
+    """
+    Find a function reading the body of a streamed response into a caller-provided buffer.
+
+    Plain (not content-coded) bodies of the requests and urllib3 transports are read straight from the http.client
+    response, which fills the buffer from the socket without allocating; other bodies are read with read() and
+    copied into the buffer.
+
+    Parameters:
+    - response (requests.Response): The streamed response.
+
+    Returns:
+    tuple: The readinto(buffer) function and the function releasing the connection once the body is exhausted.
+    """
+    raw = response.raw
+    encoding = response.headers.get('Content-Encoding', 'identity').strip().lower()
+    if isinstance(raw, urllib3.HTTPResponse):
+        fp = raw._fp
+        if encoding == 'identity' and isinstance(fp, http.client.HTTPResponse):
+            return fp.readinto, raw.release_conn
+
+        def read_decoded(buffer):
+            data = raw.read(len(buffer), decode_content=True)
+            buffer[:len(data)] = data
+            return len(data)
+        return read_decoded, raw.release_conn
+
+    if encoding == 'identity' and hasattr(raw, 'readinto'):
+        return raw.readinto, response.close
+
+    def read(buffer):
+        data = raw.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+    return read, response.close
+
+
+def copy_body(response, write, progress=None, size_hint=None):
+    """
+    Copy the body of a streamed response to a sink, with reused buffers and an adaptive read size.
+
+    The body is read into one preallocated buffer instead of a new bytes object per chunk. The read size starts at
+    MIN_CHUNK_SIZE and doubles, up to MAX_CHUNK_SIZE, while reads fill the buffer faster than TARGET_READ_SECONDS, so
+    fast transfers make few large reads and slow ones keep their latency low. Progress is reported at most every
+    PROGRESS_INTERVAL seconds, and once at the end.
+
+    Parameters:
+    - response (requests.Response): The streamed response. It is released (or closed) once the body is read.
+    - write (callable): A function called with a memoryview of every chunk. The memoryview is only valid during the call, because the buffer is reused.
+    - progress (callable, optional): A function called with the number of bytes copied since its previous call. Defaults to None.
+    - size_hint (int, optional): The expected body size, used to avoid allocating a buffer larger than the body. Defaults to None.
+
+    Returns:
+    int: The number of bytes copied.
+
+    Raises:
+    requests.exceptions.ChunkedEncodingError: If the connection is closed before the end of the body.
+    requests.ConnectionError: If reading from the connection fails.
+    """
+    readinto, release = _readinto_function(response)
+    capacity = MAX_CHUNK_SIZE if size_hint is None else max(min(size_hint, MAX_CHUNK_SIZE), 1)
+    view = memoryview(bytearray(capacity))
+    size = min(MIN_CHUNK_SIZE, capacity)
+    total = 0
+    unreported = 0
+    reported_at = time.perf_counter()
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                count = readinto(view[:size])
+            except http.client.IncompleteRead as e:
+                raise requests.exceptions.ChunkedEncodingError(f"Connection broken: {e!r}") from e
+            except (urllib3.exceptions.HTTPError, OSError) as e:
+                raise requests.ConnectionError(e) from e
+            if not count:
+                break
+            write(view[:count])
+            total += count
+            now = time.perf_counter()
+            if count == size and size < capacity and now - started < TARGET_READ_SECONDS:
+                size = min(size * 2, capacity)
+            if progress is not None:
+                unreported += count
+                if now - reported_at >= PROGRESS_INTERVAL:
+                    progress(unreported)
+                    unreported = 0
+                    reported_at = now
+    except BaseException:
+        response.close()
+        raise
+    finally:
+        if progress is not None and unreported:
+            progress(unreported)
+    release()
+    return total
+
+
+def iter_body(response, chunk_size=MIN_CHUNK_SIZE):
+    """
+    Iterate over the body of a streamed response as it arrives.
+
+    Unlike copy_body(), which fills its buffer before writing it, every read returns the bytes available on the
+    connection (up to chunk_size), so a consumer parsing a live feed sees each message as soon as it is received.
+    Plain bodies of the requests and urllib3 transports are read straight from the http.client response.
+
+    Parameters:
+    - response (requests.Response): The streamed response. It is released once the body is exhausted, and closed if the iteration fails or stops early.
+    - chunk_size (int, optional): The maximum size of a chunk. Defaults to MIN_CHUNK_SIZE.
+
+    Yields:
+    bytes: The chunks of the (content-decoded) body.
+
+    Raises:
+    requests.exceptions.ChunkedEncodingError: If the connection is closed before the end of the body.
+    requests.ConnectionError: If reading from the connection fails.
+    """
+    raw = response.raw
+    release = response.close
+    if isinstance(raw, urllib3.HTTPResponse):
+        release = raw.release_conn
+        fp = raw._fp
+        if response.headers.get('Content-Encoding', 'identity').strip().lower() == 'identity' \
+                and isinstance(fp, http.client.HTTPResponse):
+            read = fp.read1
+        else:
+            def read(size):
+                return raw.read1(size, decode_content=True)
+    elif hasattr(raw, 'release_conn'):
+        release = raw.release_conn
+
+        def read(size):
+            # The raw body of the curl transport returns what the next step of the transfer produced
+            return raw.read()
+    else:
+        read = raw.read
+    try:
+        while True:
+            try:
+                chunk = read(chunk_size)
+            except http.client.IncompleteRead as e:
+                raise requests.exceptions.ChunkedEncodingError(f"Connection broken: {e!r}") from e
+            except (urllib3.exceptions.HTTPError, OSError) as e:
+                raise requests.ConnectionError(e) from e
+            if not chunk:
+                break
+            yield chunk
+    except BaseException:
+        response.close()
+        raise
+    release()
+
+
+def _plain_socket(response):
+    """
+    Find the socket of a response body that can be moved by the kernel.
+
+    Parameters:
+    - response (requests.Response): The streamed response.
+
+    Returns:
+    tuple or None: The (socket, http.client response) pair, or None if the body is TLS-encrypted, content-coded, chunked, has no Content-Length or does not come from the requests or urllib3 transports.
+    """
+    raw = response.raw
+    if not hasattr(os, 'splice') or not isinstance(raw, urllib3.HTTPResponse):
+        return None
+    fp = raw._fp
+    if not isinstance(fp, http.client.HTTPResponse) or fp.fp is None or fp.chunked or fp.length is None:
+        return None
+    if response.headers.get('Content-Encoding', 'identity').strip().lower() != 'identity':
+        return None
+    sock = getattr(getattr(fp.fp, 'raw', None), '_sock', None)
+    if sock is None or (ssl is not None and isinstance(sock, ssl.SSLSocket)):
+        return None
+    return sock, fp
+
+
+def _wait_readable(sock):
+    poller = select.poll()
+    poller.register(sock, select.POLLIN)
+    timeout = sock.gettimeout()
+    if not poller.poll(None if timeout is None else timeout * 1000):
+        raise requests.ConnectionError("Read timed out.")
+
+
+def splice_body(response, descriptor, offset=0, progress=None):
+    """
+    Move the body of a plain HTTP response from the socket to a file without copying it through Python (Linux).
+
+    The bytes already buffered with the headers are written first; the rest is moved with os.splice() from the
+    socket to a pipe and from the pipe to the file, so the payload stays in the kernel. Only plain-text (not TLS),
+    identity-coded bodies with a Content-Length, received by the requests or urllib3 transports, are eligible.
+
+    Parameters:
+    - response (requests.Response): The streamed response. Its connection is released once the body is read.
+    - descriptor (int): The file descriptor of the destination file.
+    - offset (int, optional): The offset of the file at which the body is written. Defaults to 0.
+    - progress (callable, optional): A function called with the number of bytes written since its previous call. Defaults to None.
+
+    Returns:
+    int or None: The number of bytes written, or None if the response is not eligible (nothing was read).
+
+    Raises:
+    requests.exceptions.ChunkedEncodingError: If the connection is closed before the end of the body.
+    requests.ConnectionError: If reading from the connection fails or times out.
+    """
+    eligible = _plain_socket(response)
+    if eligible is None:
+        return None
+    sock, fp = eligible
+    remaining = fp.length
+    total = 0
+    unreported = 0
+    reported_at = time.perf_counter()
+    pipe_read = pipe_write = None
+    try:
+        if remaining:
+            # The body bytes read along with the headers are in the buffer of the socket file
+            try:
+                buffered = fp.fp.peek(1)[:remaining]
+                fp.fp.read(len(buffered))
+            except OSError as e:
+                raise requests.ConnectionError(e) from e
+            view = memoryview(buffered)
+            while view:
+                written = os.pwrite(descriptor, view, offset)
+                view = view[written:]
+                offset += written
+            remaining -= len(buffered)
+            total += len(buffered)
+            unreported += len(buffered)
+
+        if remaining:
+            pipe_read, pipe_write = os.pipe()
+            if fcntl is not None:
+                try:
+                    fcntl.fcntl(pipe_write, F_SETPIPE_SZ, PIPE_SIZE)
+                except OSError:
+                    pass
+            socket_fd = sock.fileno()
+        while remaining:
+            try:
+                moved = os.splice(socket_fd, pipe_write, min(remaining, PIPE_SIZE), flags=os.SPLICE_F_MOVE)
+            except BlockingIOError:
+                # A socket with a timeout is non-blocking at the OS level
+                _wait_readable(sock)
+                continue
+            except OSError as e:
+                raise requests.ConnectionError(e) from e
+            if not moved:
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"Connection broken: {total} bytes read, {remaining} more expected")
+            pending = moved
+            while pending:
+                written = os.splice(pipe_read, descriptor, pending, offset_dst=offset, flags=os.SPLICE_F_MOVE)
+                offset += written
+                pending -= written
+            remaining -= moved
+            total += moved
+            if progress is not None:
+                unreported += moved
+                now = time.perf_counter()
+                if now - reported_at >= PROGRESS_INTERVAL:
+                    progress(unreported)
+                    unreported = 0
+                    reported_at = now
+    except BaseException:
+        response.close()
+        raise
+    finally:
+        for pipe_fd in (pipe_read, pipe_write):
+            if pipe_fd is not None:
+                os.close(pipe_fd)
+        if progress is not None and unreported:
+            progress(unreported)
+
+    # Mark the body as read, so the connection can be reused
+    fp.length = 0
+    fp._close_conn()
+    response.raw.release_conn()
+    return total
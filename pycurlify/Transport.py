@@ -0,0 +1,708 @@
+import email.parser
+import http.client
+import io
+import threading
+from types import SimpleNamespace
+from urllib.parse import urljoin, urlparse
+import requests
+from requests import certs, compat
+from requests.cookies import RequestsCookieJar, cookiejar_from_dict, extract_cookies_to_jar, get_cookie_header
+from requests.models import RequestEncodingMixin
+from requests.sessions import SessionRedirectMixin
+from requests.structures import CaseInsensitiveDict
+from requests.utils import default_headers, get_encoding_from_headers, requote_uri
+import urllib3
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    HTTPError as Urllib3HTTPError,
+    MaxRetryError,
+    NewConnectionError,
+    ProtocolError,
+    ReadTimeoutError,
+    SSLError as Urllib3SSLError,
+)
+
+try:
+    import pycurl
+except ImportError:  # pragma: no cover - optional dependency
+    pycurl = None
+
+from .Pool import PoolAdapter, PoolMonitor, MonitoredPoolManager
+from .Upload import UploadBody
+
+# requests follows at most 30 redirects (requests.models.DEFAULT_REDIRECT_LIMIT)
+MAX_REDIRECTS = 30
+# The redirect rules of requests.Session (target, method rewriting, auth stripping) only depend on their arguments
+_REDIRECTS = SessionRedirectMixin()
+
+
+class Transport:
+    """
+    Base class of the transport backends used by BaseCurl.exec().
+
+    A transport receives the request keyword arguments built by exec() (method, url, headers, cookies, timeout,
+    allow_redirects, params, stream and, for post/put/patch, either json or data: the body already encoded by the
+    client JSON codec, or an Upload.UploadBody to stream) and returns a requests.Response. Every backend must keep the semantics of
+    requests.Session.request for headers, cookies, timeouts, redirects and streaming, and raise
+    requests.RequestException subclasses on failure.
+    """
+
+    name = None
+
+    def send(self, request_kwargs):
+        """
+        Send a request and return its response.
+
+        Parameters:
+        - request_kwargs (dict): The request keyword arguments built by BaseCurl.exec().
+
+        Returns:
+        requests.Response: The response. Its body is already loaded unless request_kwargs['stream'] is True.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        """
+        raise NotImplementedError
+
+    def configure_pool(self, pool_connections=10, pool_maxsize=10, max_connections=None, pool_block=False,
+                       idle_timeout=None):
+        """
+        Configure the connection pool of the transport. See BaseCurl.set_pool_config() for the parameters.
+
+        Returns:
+        None
+        """
+
+    def get_pool_stats(self):
+        """
+        Retrieve the connection pool statistics of the transport. See BaseCurl.get_pool_stats().
+
+        Returns:
+        dict: The pool statistics.
+        """
+        return {}
+
+    def close(self):
+        """
+        Release the connections held by the transport.
+
+        Returns:
+        None
+        """
+
+
+class _UnsizedBody:
+    """
+    An UploadBody of unknown length without __len__, which requests sends with chunked transfer encoding. Iterating
+    over it again, as requests does for a 307 or 308 redirect, raises if the body cannot be sent again.
+    """
+
+    def __init__(self, body):
+        self._body = body
+
+    def __iter__(self):
+        return iter(self._body)
+
+
+class RequestsTransport(Transport):
+    """
+    The default transport: requests.Session.request on a session with a PoolAdapter mounted.
+
+    Parameters:
+    - session (requests.Session, optional): The session used to send the requests. Defaults to a new session.
+    """
+
+    name = 'requests'
+
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
+        self.adapter = None
+        self.configure_pool()
+
+    def send(self, request_kwargs):
+        body = request_kwargs.get('data')
+        if isinstance(body, UploadBody) and body.length is None:
+            # requests only sends bodies without a length with chunked transfer encoding
+            request_kwargs = {**request_kwargs, 'data': _UnsizedBody(body)}
+        return self.session.request(**request_kwargs)
+
+    def configure_pool(self, pool_connections=10, pool_maxsize=10, max_connections=None, pool_block=False,
+                       idle_timeout=None):
+        adapter = PoolAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_connections=max_connections,
+            pool_block=pool_block,
+            idle_timeout=idle_timeout
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if self.adapter:
+            self.adapter.close()
+        self.adapter = adapter
+
+    def get_pool_stats(self):
+        return self.adapter.get_stats()
+
+    def close(self):
+        self.adapter.close()
+
+
+class LeanTransport(Transport):
+    """
+    Shared request preparation for the transports that bypass requests.Session.
+
+    Requests are prepared with the same rules as requests (default headers, query string encoding, JSON body,
+    cookie merging) but without hooks, settings merges or a PreparedRequest pipeline. Cookies received in responses
+    are kept in a session-like cookie jar, as requests.Session does. Redirects are followed hop by hop with the rules
+    of requests (see _redirect()) instead of by the backend.
+    """
+
+    def __init__(self):
+        self.cookies = RequestsCookieJar()
+        self._default_headers = default_headers()
+
+    @staticmethod
+    def _build_url(url, params):
+        if not params:
+            return url
+        query = RequestEncodingMixin._encode_params(params)
+        if not query:
+            return url
+        url, _, fragment = url.partition('#')
+        url = f"{url}{'&' if '?' in url else '?'}{query}"
+        return f"{url}#{fragment}" if fragment else url
+
+    def _prepare(self, request_kwargs):
+        """
+        Build the method, URL, headers and body of a request.
+
+        Parameters:
+        - request_kwargs (dict): The request keyword arguments built by BaseCurl.exec().
+
+        Returns:
+        requests.PreparedRequest: A prepared request holding method, url, headers and body.
+        """
+        request = requests.PreparedRequest()
+        request.method = request_kwargs['method'].upper()
+        request.url = self._build_url(request_kwargs['url'], request_kwargs.get('params'))
+        request.headers = CaseInsensitiveDict(self._default_headers)
+        for key, value in (request_kwargs.get('headers') or {}).items():
+            if value is None:
+                request.headers.pop(key, None)
+            else:
+                request.headers[key] = value
+
+        request.body = request_kwargs.get('data')
+        json_data = request_kwargs.get('json')
+        if json_data is not None:
+            request.body = compat.json.dumps(json_data, allow_nan=False).encode('utf-8')
+            request.headers.setdefault('Content-Type', 'application/json')
+        if isinstance(request.body, UploadBody):
+            if request.body.length is None:
+                request.headers['Transfer-Encoding'] = 'chunked'
+            else:
+                request.headers['Content-Length'] = str(request.body.length)
+        elif request.body is not None:
+            request.headers['Content-Length'] = str(len(request.body))
+        elif request.method not in ('GET', 'HEAD'):
+            request.headers['Content-Length'] = '0'
+
+        if 'Cookie' not in request.headers:
+            self._set_cookie_header(request, request_kwargs.get('cookies'))
+        return request
+
+    def _set_cookie_header(self, request, cookies):
+        jar = RequestsCookieJar()
+        jar.update(self.cookies)
+        cookiejar_from_dict(cookies or {}, cookiejar=jar)
+        cookie_header = get_cookie_header(jar, request)
+        if cookie_header:
+            request.headers['Cookie'] = cookie_header
+
+    def _send_once(self, request, request_kwargs):
+        """
+        Send a prepared request without following redirects.
+
+        Parameters:
+        - request (requests.PreparedRequest): The prepared request.
+        - request_kwargs (dict): The request keyword arguments built by BaseCurl.exec().
+
+        Returns:
+        requests.Response: The response, its body not loaded yet unless the backend always loads it.
+
+        Raises:
+        requests.RequestException: If the request fails.
+        """
+        raise NotImplementedError
+
+    def send(self, request_kwargs):
+        request = self._prepare(request_kwargs)
+        response = self._send_once(request, request_kwargs)
+        history = []
+        if request_kwargs.get('allow_redirects'):
+            # Redirects are followed here rather than by the backend, so every hop gets the semantics of requests
+            while response.is_redirect:
+                if len(history) >= MAX_REDIRECTS:
+                    response.close()
+                    raise requests.TooManyRedirects(f'Exceeded {MAX_REDIRECTS} redirects.', response=response)
+                # Read the body so the connection is released before the next hop
+                response.content
+                response.close()
+                history.append(response)
+                request = self._redirect(request, response, request_kwargs)
+                response = self._send_once(request, request_kwargs)
+        response.history = history
+        if not request_kwargs.get('stream'):
+            response.content
+        return response
+
+    def _redirect(self, request, response, request_kwargs):
+        """
+        Build the request following a redirect response, with the rules of requests.Session.resolve_redirects().
+
+        The method is rewritten as requests does (GET after a 303, and after a 301 or 302 for a POST), the body and
+        its headers are dropped unless the status is 307 or 308, the Cookie header is rebuilt from the jar, which holds
+        the cookies set by the previous hops, and the Authorization header is removed when the host changes.
+
+        Parameters:
+        - request (requests.PreparedRequest): The request that was redirected.
+        - response (requests.Response): The redirect response.
+        - request_kwargs (dict): The request keyword arguments built by BaseCurl.exec().
+
+        Returns:
+        requests.PreparedRequest: The redirected request.
+
+        Raises:
+        requests.exceptions.UnrewindableBodyError: If a 307 or 308 asks to send again a streamed body that cannot be.
+        """
+        url = _REDIRECTS.get_redirect_target(response)
+        previous = urlparse(request.url)
+        if url.startswith('//'):
+            url = f'{previous.scheme}:{url}'
+        parsed = urlparse(url)
+        if parsed.fragment == '' and previous.fragment:
+            parsed = parsed._replace(fragment=previous.fragment)
+        url = parsed.geturl()
+        url = urljoin(request.url, requote_uri(url)) if not parsed.netloc else requote_uri(url)
+
+        redirected = request.copy()
+        redirected.url = url
+        _REDIRECTS.rebuild_method(redirected, response)
+        if response.status_code not in (307, 308):
+            for header in ('Content-Length', 'Content-Type', 'Transfer-Encoding'):
+                redirected.headers.pop(header, None)
+            redirected.body = None
+        elif isinstance(redirected.body, UploadBody):
+            body = redirected.body
+            if not body.rewindable:
+                raise requests.exceptions.UnrewindableBodyError("Unable to rewind request body for redirect.")
+            redirected.body = UploadBody(body.source, body.length, body.progress, body.chunk_size)
+
+        redirected.headers.pop('Cookie', None)
+        self._set_cookie_header(redirected, request_kwargs.get('cookies'))
+        if 'Authorization' in redirected.headers and _REDIRECTS.should_strip_auth(request.url, url):
+            redirected.headers.pop('Authorization')
+        return redirected
+
+    def _build_response(self, request, status_code, reason, headers, url, raw, message):
+        """
+        Build a requests.Response and store the cookies it sets in the transport jar.
+
+        Parameters:
+        - request (requests.PreparedRequest): The request that produced the response.
+        - status_code (int): The HTTP status code.
+        - reason (str): The HTTP reason phrase.
+        - headers (dict): The response headers.
+        - url (str): The final URL, after redirects.
+        - raw (object): The file-like object the body is read from.
+        - message (http.client.HTTPMessage): The parsed response headers, used to extract cookies.
+
+        Returns:
+        requests.Response: The response.
+        """
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = raw
+        response.url = url
+        response.request = request
+        original = SimpleNamespace(_original_response=SimpleNamespace(msg=message))
+        extract_cookies_to_jar(response.cookies, request, original)
+        extract_cookies_to_jar(self.cookies, request, original)
+        return response
+
+
+class Urllib3Transport(LeanTransport):
+    """
+    A transport sending requests directly through a urllib3 PoolManager.
+
+    It skips the per-call overhead of requests.Session (hooks, settings merges, adapters) while keeping its request
+    and response semantics, and uses the same observable connection pool as the requests transport.
+    """
+
+    name = 'urllib3'
+
+    def __init__(self):
+        super().__init__()
+        self.monitor = None
+        self.pool_manager = None
+        self.configure_pool()
+
+    def configure_pool(self, pool_connections=10, pool_maxsize=10, max_connections=None, pool_block=False,
+                       idle_timeout=None):
+        previous = self.pool_manager
+        self.monitor = PoolMonitor(max_connections=max_connections, block=pool_block, idle_timeout=idle_timeout)
+        self.pool_manager = MonitoredPoolManager(
+            self.monitor,
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            block=pool_block,
+            ca_certs=certs.where()
+        )
+        if previous:
+            previous.clear()
+
+    def get_pool_stats(self):
+        return self.monitor.stats()
+
+    def close(self):
+        self.pool_manager.clear()
+
+    @staticmethod
+    def _timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return urllib3.Timeout(connect=connect, read=read)
+        return urllib3.Timeout(connect=timeout, read=timeout)
+
+    def _send_once(self, request, request_kwargs):
+        retries = urllib3.Retry(total=None, connect=0, read=False, other=0, redirect=False, raise_on_redirect=False)
+        try:
+            raw = self.pool_manager.urlopen(
+                request.method,
+                request.url,
+                body=request.body,
+                headers=dict(request.headers),
+                redirect=False,
+                retries=retries,
+                assert_same_host=False,
+                preload_content=False,
+                decode_content=False,
+                timeout=self._timeout(request_kwargs.get('timeout'))
+            )
+        except MaxRetryError as e:
+            if isinstance(e.reason, ConnectTimeoutError):
+                raise requests.ConnectTimeout(e, request=request)
+            if isinstance(e.reason, Urllib3SSLError):
+                raise requests.exceptions.SSLError(e, request=request)
+            raise requests.ConnectionError(e, request=request)
+        except (ProtocolError, OSError, NewConnectionError) as e:
+            raise requests.ConnectionError(e, request=request)
+        except ReadTimeoutError as e:
+            raise requests.ReadTimeout(e, request=request)
+        except Urllib3SSLError as e:
+            raise requests.exceptions.SSLError(e, request=request)
+        except Urllib3HTTPError as e:
+            raise requests.RequestException(e, request=request)
+
+        return self._build_response(
+            request,
+            raw.status,
+            raw.reason,
+            raw.headers,
+            request.url,
+            raw,
+            raw._original_response.msg if raw._original_response is not None else http.client.HTTPMessage()
+        )
+
+
+class _CurlStream:
+    """
+    A file-like view over a libcurl transfer driven by a multi handle, used as the raw body of streamed responses.
+    """
+
+    def __init__(self, transport, handle, multi, chunks, header_lines):
+        self._transport = transport
+        self._handle = handle
+        self._multi = multi
+        self._chunks = chunks
+        self._header_lines = header_lines
+        self._buffer = bytearray()
+        self._done = False
+
+    def _has_chunks(self):
+        return bool(self._chunks)
+
+    def _has_headers(self):
+        # The header block ends with a blank line; those of informational (1xx) responses are followed by others
+        lines = self._header_lines
+        if not lines or lines[-1] not in ('\r\n', '\n'):
+            return False
+        parts = lines[0].split(' ', 2)
+        return len(parts) < 2 or not parts[1].startswith('1')
+
+    def _drive(self, ready):
+        """
+        Run the transfer until a condition holds or the transfer ends.
+
+        Parameters:
+        - ready (callable): The condition.
+
+        Raises:
+        requests.RequestException: If the transfer failed.
+        """
+        while not ready() and not self._done:
+            status, active = self._multi.perform()
+            while status == pycurl.E_CALL_MULTI_PERFORM:
+                status, active = self._multi.perform()
+            if active == 0:
+                queued, succeeded, failed = self._multi.info_read()
+                self._done = True
+                self._transport._finish(self._handle)
+                if failed:
+                    _, code, message = failed[0]
+                    self.release_conn()
+                    raise self._transport._error(code, message)
+                break
+            if not ready():
+                self._multi.select(1.0)
+
+    def wait_for_headers(self):
+        """
+        Run the transfer until the response headers are complete, without waiting for the body.
+        """
+        self._drive(self._has_headers)
+
+    def read(self, amt=None):
+        # Without an amount, return whatever the next step of the transfer produced
+        while True:
+            while self._chunks:
+                self._buffer += self._chunks.pop(0)
+            if self._done or (len(self._buffer) >= amt if amt is not None else self._buffer):
+                break
+            self._drive(self._has_chunks)
+        if amt is None or amt >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:amt])
+            del self._buffer[:amt]
+        if self._done and not self._buffer:
+            self.release_conn()
+        return data
+
+    def release_conn(self):
+        if self._multi is not None:
+            self._multi.remove_handle(self._handle)
+            self._multi.close()
+            self._multi = None
+            self._transport._release(self._handle)
+
+    def close(self):
+        self._done = True
+        self.release_conn()
+
+
+class CurlTransport(LeanTransport):
+    """
+    A transport sending requests through libcurl (pycurl).
+
+    Each thread reuses its own easy handles, and all handles share libcurl's connection cache, DNS cache and TLS
+    sessions through a CurlShare object. Streamed responses are driven incrementally with a multi handle, so the body
+    is read from the socket only as it is consumed.
+
+    Requires the optional pycurl package (pip install pycurl).
+    """
+
+    name = 'curl'
+
+    def __init__(self):
+        if pycurl is None:
+            raise ImportError("The 'curl' transport requires the 'pycurl' package. Install it with: pip install pycurl")
+        super().__init__()
+        self._share = pycurl.CurlShare()
+        self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+        self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+        self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pool_options = {}
+        self._requests = 0
+        self._created = 0
+        self.configure_pool()
+
+    def configure_pool(self, pool_connections=10, pool_maxsize=10, max_connections=None, pool_block=False,
+                       idle_timeout=None):
+        self._pool_options = {pycurl.MAXCONNECTS: pool_maxsize}
+        if idle_timeout is not None:
+            self._pool_options[pycurl.MAXAGE_CONN] = max(int(idle_timeout), 1)
+
+    def get_pool_stats(self):
+        with self._lock:
+            reused = self._requests - self._created
+            return {
+                'requests': self._requests,
+                'created': self._created,
+                'reused': reused,
+                'reuse_ratio': reused / self._requests if self._requests else 0.0,
+            }
+
+    def close(self):
+        handles = getattr(self._local, 'handles', [])
+        while handles:
+            handles.pop().close()
+
+    def _acquire(self):
+        handles = getattr(self._local, 'handles', None)
+        if handles is None:
+            handles = self._local.handles = []
+        if handles:
+            handle = handles.pop()
+            # curl_easy_reset() keeps the live connections and the share
+            handle.reset()
+        else:
+            handle = pycurl.Curl()
+            handle.setopt(pycurl.SHARE, self._share)
+        return handle
+
+    def _release(self, handle):
+        handles = getattr(self._local, 'handles', None)
+        if handles is None:
+            handles = self._local.handles = []
+        handles.append(handle)
+
+    def _finish(self, handle):
+        with self._lock:
+            self._requests += 1
+            self._created += handle.getinfo(pycurl.NUM_CONNECTS)
+
+    @staticmethod
+    def _error(code, message):
+        if code == pycurl.E_OPERATION_TIMEDOUT:
+            return requests.Timeout(message)
+        if code in (pycurl.E_COULDNT_CONNECT, pycurl.E_COULDNT_RESOLVE_HOST, pycurl.E_COULDNT_RESOLVE_PROXY):
+            return requests.ConnectionError(message)
+        if code == pycurl.E_SSL_CONNECT_ERROR:
+            return requests.exceptions.SSLError(message)
+        if code == pycurl.E_TOO_MANY_REDIRECTS:
+            return requests.TooManyRedirects(message)
+        return requests.RequestException(message)
+
+    def _setup(self, handle, request, request_kwargs, header_lines, on_data, follow=True):
+        handle.setopt(pycurl.URL, request.url)
+        handle.setopt(pycurl.NOSIGNAL, 1)
+        handle.setopt(pycurl.CAINFO, certs.where())
+        for option, value in self._pool_options.items():
+            handle.setopt(option, value)
+
+        body = request.body
+        if request.method == 'GET':
+            handle.setopt(pycurl.HTTPGET, 1)
+        elif request.method == 'HEAD':
+            handle.setopt(pycurl.NOBODY, 1)
+        elif request.method == 'POST':
+            # libcurl keeps a custom method across redirects, but turns a POST into a GET after a 301, 302 or 303
+            # like requests does
+            handle.setopt(pycurl.POST, 1)
+        else:
+            handle.setopt(pycurl.CUSTOMREQUEST, request.method)
+        if isinstance(body, UploadBody):
+            # libcurl pulls the body as it sends it, with chunked transfer encoding if the size is unknown
+            handle.setopt(pycurl.READFUNCTION, body.read_chunk)
+            if request.method == 'POST':
+                handle.setopt(pycurl.POSTFIELDSIZE_LARGE, -1 if body.length is None else body.length)
+            else:
+                handle.setopt(pycurl.UPLOAD, 1)
+                if body.length is not None:
+                    handle.setopt(pycurl.INFILESIZE_LARGE, body.length)
+        elif body is not None or request.method == 'POST':
+            body = body or b''
+            handle.setopt(pycurl.POSTFIELDSIZE_LARGE, len(body))
+            handle.setopt(pycurl.COPYPOSTFIELDS, body)
+
+        headers = CaseInsensitiveDict(request.headers)
+        # Let libcurl negotiate and decode the content encodings, as urllib3 does for requests
+        accept_encoding = headers.pop('Accept-Encoding', None)
+        if accept_encoding is not None:
+            handle.setopt(pycurl.ACCEPT_ENCODING, accept_encoding)
+        headers.pop('Content-Length', None)
+        headers.pop('Transfer-Encoding', None)
+        handle.setopt(pycurl.HTTPHEADER, [f'{key}: {value}' for key, value in headers.items()] + ['Expect:'])
+
+        # CurlTransport follows redirects itself (see LeanTransport.send()); MultiEngine lets libcurl follow them
+        handle.setopt(pycurl.FOLLOWLOCATION, 1 if follow and request_kwargs.get('allow_redirects') else 0)
+        handle.setopt(pycurl.MAXREDIRS, MAX_REDIRECTS)
+
+        timeout = request_kwargs.get('timeout')
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        if connect is not None:
+            handle.setopt(pycurl.CONNECTTIMEOUT_MS, max(int(connect * 1000), 1))
+        if read is not None:
+            # requests' read timeout bounds the time between bytes, not the whole transfer
+            handle.setopt(pycurl.LOW_SPEED_LIMIT, 1)
+            handle.setopt(pycurl.LOW_SPEED_TIME, max(int(read + 0.999), 1))
+
+        def on_header(line):
+            line = line.decode('iso-8859-1')
+            if line.startswith('HTTP/'):
+                # A new status line starts the headers of the next response (redirects, 100 Continue)
+                header_lines.clear()
+            header_lines.append(line)
+
+        handle.setopt(pycurl.HEADERFUNCTION, on_header)
+        handle.setopt(pycurl.WRITEFUNCTION, on_data)
+
+    def _make_response(self, handle, request, header_lines, raw):
+        status_line = header_lines[0].rstrip('\r\n') if header_lines else ''
+        parts = status_line.split(' ', 2)
+        reason = parts[2] if len(parts) > 2 else ''
+        message = email.parser.Parser(_class=http.client.HTTPMessage).parsestr(''.join(header_lines[1:]))
+        headers = {}
+        for key, value in message.items():
+            headers[key] = f"{headers[key]}, {value}" if key in headers else value
+        return self._build_response(
+            request,
+            handle.getinfo(pycurl.RESPONSE_CODE),
+            reason,
+            headers,
+            handle.getinfo(pycurl.EFFECTIVE_URL),
+            raw,
+            message
+        )
+
+    def _send_once(self, request, request_kwargs):
+        handle = self._acquire()
+        header_lines = []
+
+        if not request_kwargs.get('stream'):
+            body = io.BytesIO()
+            self._setup(handle, request, request_kwargs, header_lines, body.write, follow=False)
+            try:
+                handle.perform()
+            except pycurl.error as e:
+                self._release(handle)
+                raise self._error(*e.args)
+            self._finish(handle)
+            response = self._make_response(handle, request, header_lines, None)
+            response._content = body.getvalue()
+            response._content_consumed = True
+            self._release(handle)
+            return response
+
+        chunks = []
+        self._setup(handle, request, request_kwargs, header_lines, chunks.append, follow=False)
+        multi = pycurl.CurlMulti()
+        multi.add_handle(handle)
+        raw = _CurlStream(self, handle, multi, chunks, header_lines)
+        raw.wait_for_headers()
+        return self._make_response(handle, request, header_lines, raw)
+
+
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    Urllib3Transport.name: Urllib3Transport,
+    CurlTransport.name: CurlTransport,
+}
@@ -0,0 +1,204 @@
+import asyncio
+import io
+import os
+import stat
+import requests
+
+# The size of the chunks read from file objects and sliced from buffers
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _source_length(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    if not hasattr(source, 'read'):
+        return None
+    try:
+        status = os.fstat(source.fileno())
+        if stat.S_ISREG(status.st_mode):
+            return max(status.st_size - source.tell(), 0)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    try:
+        if not source.seekable():
+            return None
+        position = source.tell()
+        end = source.seek(0, io.SEEK_END)
+        source.seek(position)
+        return max(end - position, 0)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _as_bytes(chunk):
+    return chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+
+class UploadBody:
+    """
+    A request body streamed to the server instead of being built in memory.
+
+    The source is a binary file object, a bytes-like object (bytes, bytearray, memoryview, sent as slices of the
+    buffer without copies), an iterator or generator of bytes-like chunks, or, with AsyncCurl only, an async
+    iterable of chunks. File objects are read chunk by chunk from their current position, and iterators are consumed
+    as the body is sent, so the payload is never held whole in memory.
+
+    The body is sent with a Content-Length header when its length is known, which is the case for bytes-like
+    objects and seekable files unless given explicitly, and with chunked transfer encoding otherwise. Bytes-like
+    bodies can be sent again, e.g. after a 307 redirect; the others only once, as files and iterators are consumed.
+
+    Parameters:
+    - source (object): The content of the body.
+    - length (int, optional): The length of the body in bytes. Defaults to None (detected when possible).
+    - progress (callable, optional): A function called with the number of bytes sent since its previous call and the total size of the body (0 if unknown). Defaults to None.
+    - chunk_size (int, optional): The size of the chunks read from files and sliced from buffers. Defaults to 64 KiB.
+
+    Example Usage:
+    ```
+    with open('backup.tar', 'rb') as file:
+        curl.put('https://example.com/backup.tar', data=UploadBody(file, progress=print))
+    ```
+    """
+
+    def __init__(self, source, length=None, progress=None, chunk_size=UPLOAD_CHUNK_SIZE):
+        self.source = source
+        self.length = _source_length(source) if length is None else length
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.sent = 0
+        self._started = False
+        self._chunks = None
+        self._pending = b''
+
+    def __len__(self):
+        if self.length is None:
+            raise TypeError("The length of the body is unknown.")
+        return self.length
+
+    @property
+    def rewindable(self):
+        """
+        Whether the body can be sent again: True for bytes-like sources.
+        """
+        return isinstance(self.source, (bytes, bytearray, memoryview))
+
+    def _report(self, chunk):
+        size = len(chunk)
+        self.sent += size
+        if self.progress is not None:
+            self.progress(size, self.length or 0)
+
+    def _source_chunks(self):
+        source, chunk_size = self.source, self.chunk_size
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = memoryview(source).cast('B')
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+        elif hasattr(source, 'read'):
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    return
+                yield _as_bytes(chunk)
+        elif hasattr(source, '__aiter__') and not hasattr(source, '__iter__'):
+            raise TypeError("An async iterable body can only be sent by AsyncCurl.")
+        else:
+            for chunk in source:
+                yield _as_bytes(chunk)
+
+    def __iter__(self):
+        """
+        Read the body in chunks, reporting the progress.
+
+        Yields:
+        bytes-like: The chunks of the body. Empty chunks are skipped, as they would end a chunked body.
+
+        Raises:
+        requests.exceptions.UnrewindableBodyError: If the body was already read and its source is not bytes-like.
+        """
+        if self._started and not self.rewindable:
+            raise requests.exceptions.UnrewindableBodyError("Unable to rewind request body for redirect.")
+        self._started = True
+        for chunk in self._source_chunks():
+            if len(chunk):
+                self._report(chunk)
+                yield chunk
+
+    async def __aiter__(self):
+        """
+        Read the body in chunks without blocking the event loop, reporting the progress.
+
+        File objects are read in a worker thread; async iterables are consumed directly.
+
+        Yields:
+        bytes-like: The chunks of the body.
+        """
+        source = self.source
+        if hasattr(source, '__aiter__'):
+            async for chunk in source:
+                chunk = _as_bytes(chunk)
+                if len(chunk):
+                    self._report(chunk)
+                    yield chunk
+        elif hasattr(source, 'read') and not isinstance(source, io.BytesIO):
+            while True:
+                chunk = await asyncio.to_thread(source.read, self.chunk_size)
+                if not chunk:
+                    return
+                chunk = _as_bytes(chunk)
+                self._report(chunk)
+                yield chunk
+        else:
+            for chunk in self:
+                yield chunk
+
+    def read_chunk(self, size):
+        """
+        Return the next bytes of the body, for transports pulling it (libcurl's READFUNCTION).
+
+        Parameters:
+        - size (int): The maximum number of bytes.
+
+        Returns:
+        bytes: Up to size bytes, or b'' at the end of the body.
+        """
+        if self._chunks is None:
+            self._chunks = iter(self)
+        pending = self._pending
+        while not len(pending):
+            pending = next(self._chunks, None)
+            if pending is None:
+                return b''
+        self._pending = pending[size:]
+        return bytes(pending[:size])
+
+
+def is_upload_body(data):
+    """
+    Tell whether a payload is sent as a raw body rather than encoded as JSON.
+
+    Parameters:
+    - data (object): The payload given to post(), put() or patch().
+
+    Returns:
+    bool: True for UploadBody objects, bytes-like objects, file objects, iterators and async iterables; False for the JSON values (dicts, lists, strings, numbers, None).
+    """
+    return (isinstance(data, (UploadBody, bytes, bytearray, memoryview))
+            or hasattr(data, 'read') or hasattr(data, '__next__') or hasattr(data, '__aiter__'))
+
+
+def set_payload(request_kwargs, data):
+    """
+    Store the payload of a request in its keyword arguments: raw bodies as an UploadBody in 'data', other values as the JSON payload in 'json'.
+
+    Parameters:
+    - request_kwargs (dict): The request keyword arguments (see BaseCurl.exec()), modified in place.
+    - data (object): The payload.
+
+    Returns:
+    None
+    """
+    if is_upload_body(data):
+        request_kwargs['data'] = data if isinstance(data, UploadBody) else UploadBody(data)
+    else:
+        request_kwargs['json'] = data
@@ -0,0 +1,117 @@
+import re
+import xml.etree.ElementTree as ET
+
+_STEP_SEPARATOR = re.compile(r'/(?![^{]*\})')
+
+
+class XmlElementParser:
+    """
+    Parses an XML document fed in chunks and returns the elements matching a path as soon as they are complete.
+
+    The path is a tag or a simple path of tags separated by slashes: 'item' matches every item element,
+    'channel/item' the items whose parent is a channel, and '/rss/channel/item' only that absolute location. Steps
+    follow the ElementTree notation: '{uri}tag' for a namespaced tag, '{*}tag' for a tag in any namespace, and '*'
+    for any tag.
+
+    Every element is detached from its parent once complete, unless it is inside a matching element, so processed
+    subtrees are released and memory stays flat however long the document is. The returned elements are complete
+    and left intact; their parents only hold the children that are not complete yet.
+
+    Parameters:
+    - path (str): The tag or path of the elements to return.
+    """
+
+    def __init__(self, path):
+        if not path or path == '/':
+            raise ValueError("The path must name at least one tag.")
+        self.path = path
+        self._absolute = path.startswith('/')
+        # Slashes within the braces of a namespace do not separate steps
+        self._steps = _STEP_SEPARATOR.split(path.strip('/'))
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        # The open elements, with whether each matches the path
+        self._open = []
+        self._tags = []
+        self._matching = 0
+
+    @staticmethod
+    def _step_matches(step, tag):
+        if step == '*' or step == tag:
+            return True
+        if step.startswith('{*}'):
+            return tag.rpartition('}')[2] == step[3:]
+        return False
+
+    def _matches(self):
+        tags, steps = self._tags, self._steps
+        if len(tags) < len(steps) or (self._absolute and len(tags) != len(steps)):
+            return False
+        return all(self._step_matches(step, tag) for step, tag in zip(steps, tags[-len(steps):]))
+
+    def _read(self):
+        elements = []
+        open_elements = self._open
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                self._tags.append(element.tag)
+                matched = self._matches()
+                open_elements.append((element, matched))
+                self._matching += matched
+                continue
+            _, matched = open_elements.pop()
+            self._tags.pop()
+            if matched:
+                self._matching -= 1
+                elements.append(element)
+            if not self._matching and open_elements:
+                open_elements[-1][0].remove(element)
+        return elements
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the document.
+
+        Parameters:
+        - data (bytes-like): The chunk.
+
+        Returns:
+        list: The matching elements completed by the chunk, in document order of their end tags.
+
+        Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed.
+        """
+        self._parser.feed(data)
+        return self._read()
+
+    def close(self):
+        """
+        Signal the end of the document.
+
+        Returns:
+        list: The last matching elements.
+
+        Raises:
+        xml.etree.ElementTree.ParseError: If the document is incomplete or not well-formed.
+        """
+        self._parser.close()
+        return self._read()
+
+
+def iter_xml_elements(chunks, path):
+    """
+    Yield the elements matching a path of an XML document received in chunks (see XmlElementParser).
+
+    Parameters:
+    - chunks (iterable): The bytes-like chunks of the document.
+    - path (str): The tag or path of the elements.
+
+    Yields:
+    xml.etree.ElementTree.Element: The matching elements, complete.
+
+    Raises:
+    xml.etree.ElementTree.ParseError: If the document is incomplete or not well-formed.
+    """
+    parser = XmlElementParser(path)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
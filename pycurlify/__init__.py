@@ -5,6 +5,9 @@ PyCurl extends the functionality provided by BaseCurl to offer simplified method
 
 Attributes:
     PyCurl.Curl: A class providing simplified methods for making HTTP requests.
+    PyCurl.AsyncCurl: An asyncio client mirroring the API of Curl (requires httpx).
+    PyCurl.MultiEngine: Executes queues of requests and downloads through one libcurl multi handle (requires pycurl).
+    PyCurl.DownloadManager: Downloads queues of files with global, per-host and per-device limits and persistent state.
     PyCurl.__version__: The version of the PyCurl package.
     PyCurl.__description__: A brief description of the PyCurl package.
 
@@ -18,8 +21,11 @@ Example Usage:
 """
 
 from .Curl import Curl as PyCurlify
+from .AsyncCurl import AsyncCurl as AsyncPyCurlify
+from .MultiEngine import MultiEngine
+from .DownloadManager import DownloadManager
 
-__all__ = ['PyCurlify']
+__all__ = ['PyCurlify', 'AsyncPyCurlify', 'MultiEngine', 'DownloadManager']
 
 __version__ = '2.0.0'
 __description__ = 'PyCurlify: A flexible wrapper around the requests library for making HTTP requests.'
@@ -0,0 +1,189 @@
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """
+    A keep-alive request handler that answers every request with a JSON document describing it.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = bytearray()
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    # The client gave up sending the body
+                    raise ConnectionResetError
+                size = int(line.split(b';')[0], 16)
+                if not size:
+                    # Skip the trailers
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        return self.rfile.read(length) if length else b''
+
+    def send_body(self, body, content_type='application/json', status=200, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_chunked(self, chunks, content_type='application/json', status=200, headers=None):
+        """
+        Send a body with chunked transfer encoding, flushing every chunk.
+        """
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        for chunk in chunks:
+            if chunk:
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def echo(self):
+        self.server.seen.append((self.command, self.path, dict(self.headers.items())))
+        body = self.read_body()
+        path, _, query = self.path.partition('?')
+        if path == '/cache/max-age':
+            self.send_body(b'{"cached": true}', headers={'Cache-Control': 'max-age=60'})
+            return
+        if path == '/cache/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                return
+            self.send_body(b'{"version": 1}', headers={'ETag': '"v1"', 'Cache-Control': 'no-cache'})
+            return
+        if path == '/cache/vary':
+            body = json.dumps({'accept': self.headers.get('Accept')}).encode('utf-8')
+            self.send_body(body, headers={'Cache-Control': 'max-age=60', 'Vary': 'Accept'})
+            return
+        if path == '/cache/user':
+            body = json.dumps({'authorization': self.headers.get('Authorization'),
+                               'cookie': self.headers.get('Cookie')}).encode('utf-8')
+            self.send_body(body, headers={'Cache-Control': 'max-age=60'})
+            return
+        if path == '/cache/redirect':
+            self.send_body(b'', status=301, headers={'Location': '/cache/max-age', 'Cache-Control': 'max-age=60'})
+            return
+        if path == '/redirect':
+            self.send_body(b'', status=int(query or 302), headers={'Location': '/redirected'})
+            return
+        if path == '/redirect-cookie':
+            self.send_body(b'', status=int(query or 302),
+                           headers={'Location': '/redirected', 'Set-Cookie': 'hop=1; Path=/'})
+            return
+        if path == '/redirect-host':
+            # The same server under another host name
+            location = f'http://localhost:{self.server.server_port}/redirected'
+            self.send_body(b'', status=302, headers={'Location': location})
+            return
+        if path == '/idle':
+            # The headers are sent at once, the body only after the given number of seconds
+            self.send_chunked(self._idle(float(query or 1)), 'text/plain')
+            return
+        if path == '/set-cookie':
+            self.send_body(b'{}', headers={'Set-Cookie': 'session=abc; Path=/'})
+            return
+        if path == '/slow':
+            time.sleep(float(query or 1))
+        if path in ('/bytes', '/bytes-plain'):
+            # /bytes serves byte ranges, /bytes-plain ignores the Range header
+            payload = (bytes(range(251)) * (int(query) // 251 + 1))[:int(query)]
+            etag = getattr(self.server, 'etag', '"bytes"')
+            extra_headers = getattr(self.server, 'extra_headers', {})
+            match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+            if path == '/bytes' and match and self.headers.get('If-Range', etag) == etag:
+                start = int(match.group(1))
+                end = min(int(match.group(2) or len(payload) - 1), len(payload) - 1)
+                if start >= len(payload):
+                    self.send_body(b'', status=416, headers={'Content-Range': f'bytes */{len(payload)}'})
+                    return
+                self.send_body(payload[start:end + 1], content_type='application/octet-stream', status=206,
+                               headers={'Accept-Ranges': 'bytes', 'ETag': etag,
+                                        'Content-Range': f'bytes {start}-{end}/{len(payload)}', **extra_headers})
+                return
+            self.send_body(payload, content_type='application/octet-stream',
+                           headers={'ETag': etag, **extra_headers} if path == '/bytes' else extra_headers)
+            return
+        document = {
+            'method': self.command,
+            'path': self.path,
+            'headers': dict(self.headers.items()),
+            'body': body.decode('utf-8', 'replace'),
+        }
+        self.send_body(json.dumps(document).encode('utf-8'))
+
+    @staticmethod
+    def _idle(seconds):
+        time.sleep(seconds)
+        yield b'done'
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = echo
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def handle_error(self, request, client_address):
+        # Clients stopping a stream early reset their connection
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class LocalServer:
+    """
+    Runs a ThreadingHTTPServer on a random local port in a background thread.
+
+    Example Usage:
+    ```
+    with LocalServer() as server:
+        curl.get(server.url('/path'))
+    ```
+    """
+
+    def __init__(self, handler=EchoHandler):
+        self.httpd = _Server(('127.0.0.1', 0), handler)
+        self.httpd.seen = []
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def seen(self):
+        """
+        The (method, path, headers) of every request received, in order.
+        """
+        return self.httpd.seen
+
+    def url(self, path='/'):
+        return f'http://127.0.0.1:{self.httpd.server_port}{path}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,53 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pycurlify import AsyncPyCurlify
+from LocalServer import LocalServer
+
+
+class TestAsyncCurl(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = LocalServer().__enter__()
+        self.curl = AsyncPyCurlify()
+
+    async def asyncTearDown(self):
+        await self.curl.aclose()
+        self.server.__exit__(None, None, None)
+
+    async def test_concurrent_requests_are_isolated(self):
+        await self.curl.get(self.server.url('/warmup'))
+
+        async def worker(worker_id):
+            self.curl.set_header('X-Worker', str(worker_id))
+            response = await self.curl.post(self.server.url(f'/{worker_id}'), data={'id': worker_id})
+            document = json.loads(response.content)
+            return (document['headers'].get('X-Worker') == str(worker_id)
+                    and json.loads(document['body']) == {'id': worker_id}
+                    and self.curl.get_response() is response)
+
+        results = await asyncio.gather(*(worker(worker_id) for worker_id in range(200)))
+        self.assertTrue(all(results))
+        self.assertEqual(self.curl.get_pool_stats()['requests'], 201)
+
+    async def test_callbacks_may_be_coroutines(self):
+        completed = []
+
+        async def on_complete(response):
+            completed.append(response.status_code)
+
+        self.curl.complete_callback = on_complete
+        await self.curl.get(self.server.url('/'))
+        self.assertEqual(completed, [200])
+        self.assertEqual(self.curl.response()['method'], 'GET')
+
+    async def test_download_file(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            result = await self.curl.download_file(self.server.url('/file'), dir_path, 'file.json')
+            self.assertEqual(result['file_size'], os.path.getsize(result['file_path']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.set_pool_config(pool_maxsize=8)
+
+    def test_get_many_ordered(self):
+        self.curl.set_header('X-Batch', 'yes')
+        with LocalServer() as server:
+            urls = [server.url(f'/{index}') for index in range(50)]
+            results = list(self.curl.get_many(urls, concurrency=8, ordered=True))
+        self.assertEqual([result['index'] for result in results], list(range(50)))
+        for index, result in enumerate(results):
+            document = json.loads(result['response'].content)
+            self.assertEqual(document['path'], f'/{index}')
+            self.assertEqual(document['headers']['X-Batch'], 'yes')
+            self.assertIsNone(result['error'])
+
+    def test_request_many_reports_errors_without_aborting(self):
+        with LocalServer() as server:
+            requests = [
+                {'method': 'post', 'url': server.url('/a'), 'data': {'a': 1}},
+                {'method': 'get', 'url': 'http://127.0.0.1:1/unreachable'},
+                {'method': 'get'},
+                server.url('/b'),
+            ]
+            results = sorted(self.curl.request_many(requests, concurrency=4), key=lambda result: result['index'])
+        self.assertEqual(json.loads(json.loads(results[0]['response'].content)['body']), {'a': 1})
+        self.assertIsNone(results[1]['response'])
+        self.assertIsNotNone(results[1]['error'])
+        self.assertIsNotNone(results[2]['error'])
+        self.assertEqual(results[3]['response'].status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
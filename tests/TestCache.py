@@ -0,0 +1,87 @@
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.enable_cache(max_entries=2)
+        self.server = LocalServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_fresh_response_is_served_from_cache(self):
+        for _ in range(3):
+            self.assertEqual(self.curl.get(self.server.url('/cache/max-age')).json(), {'cached': True})
+        self.assertEqual(len(self.server.seen), 1)
+        stats = self.curl.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores']), (2, 1, 1))
+
+    def test_stale_response_is_revalidated(self):
+        self.curl.get(self.server.url('/cache/etag'))
+        response = self.curl.get(self.server.url('/cache/etag'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'version': 1})
+        self.assertEqual(self.server.seen[1][2].get('If-None-Match'), '"v1"')
+        self.assertEqual(self.curl.get_cache_stats()['revalidations'], 1)
+
+    def test_vary_keeps_one_variant_per_header_value(self):
+        for accept in ('text/plain', 'application/json', 'text/plain'):
+            response = self.curl.get(self.server.url('/cache/vary'), headers={'Accept': accept})
+            self.assertEqual(response.json(), {'accept': accept})
+        self.assertEqual(len(self.server.seen), 2)
+
+    def test_unsafe_request_invalidates_and_lru_evicts(self):
+        self.curl.get(self.server.url('/cache/max-age'))
+        self.curl.post(self.server.url('/cache/max-age'), data={})
+        self.curl.get(self.server.url('/cache/max-age'))
+        self.assertEqual(len(self.server.seen), 3)
+
+        self.curl.get(self.server.url('/cache/max-age?a'))
+        self.curl.get(self.server.url('/cache/max-age?b'))
+        stats = self.curl.get_cache_stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (2, 1))
+
+    def test_request_no_cache_forces_revalidation(self):
+        self.curl.get(self.server.url('/cache/max-age'))
+        self.curl.get(self.server.url('/cache/max-age'), headers={'Cache-Control': 'no-cache'})
+        self.assertEqual(len(self.server.seen), 2)
+
+    def test_responses_are_not_shared_between_credentials(self):
+        url = self.server.url('/cache/user')
+        for user in ('Bearer alice', 'Bearer bob', 'Bearer alice'):
+            response = self.curl.get(url, headers={'Authorization': user})
+            self.assertEqual(response.json()['authorization'], user)
+        for session in ('a', 'b'):
+            self.assertEqual(self.curl.get(url, cookies={'session': session}).json()['cookie'], f'session={session}')
+        self.assertEqual(self.curl.get(url).json(), {'authorization': None, 'cookie': None})
+        self.assertEqual(len(self.server.seen), 5)
+        self.assertEqual(self.curl.get_cache_stats()['hits'], 1)
+
+    def test_stored_redirects_follow_the_redirect_policy(self):
+        url = self.server.url('/cache/redirect')
+        self.assertEqual(self.curl.get(url).status_code, 301)
+        # The stored 301 is not served unfollowed to a request following redirects
+        self.curl.set_follow_location()
+        response = self.curl.get(url)
+        self.assertEqual((response.status_code, response.json()), (200, {'cached': True}))
+        self.assertEqual([path for _, path, _ in self.server.seen],
+                         ['/cache/redirect', '/cache/redirect', '/cache/max-age'])
+        self.assertEqual(self.curl.get(url).status_code, 301)
+        self.assertEqual(len(self.server.seen), 3)
+
+    def test_followed_responses_are_not_stored_under_the_requested_url(self):
+        url = self.server.url('/cache/redirect')
+        self.curl.set_follow_location()
+        self.assertEqual(self.curl.get(url).json(), {'cached': True})
+        response = self.curl.get(url)
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response.headers['Location'], '/cache/max-age')
+        self.assertEqual(len(self.server.seen), 3)
+        self.assertEqual(self.curl.get_cache_stats()['stores'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestConcurrency(unittest.TestCase):
+    THREADS = 64
+    ROUNDS = 5
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.set_pool_config(pool_maxsize=self.THREADS)
+
+    def test_shared_instance_has_no_cross_talk(self):
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(worker_id):
+            mismatches = []
+            for round_id in range(self.ROUNDS):
+                self.curl.set_header('X-Worker', str(worker_id))
+                self.curl.set_cookies({'worker': str(worker_id)})
+                self.curl.set_timeout(10)
+                barrier.wait()
+                response = self.curl.get(self.server.url(f'/{worker_id}'), params={'round': round_id})
+                document = json.loads(response.content)
+                if document['headers'].get('X-Worker') != str(worker_id) \
+                        or document['headers'].get('Cookie') != f'worker={worker_id}' \
+                        or document['path'] != f'/{worker_id}?round={round_id}' \
+                        or self.curl.get_response() is not response \
+                        or self.curl.get_request_headers().get('X-Worker') != str(worker_id):
+                    mismatches.append((worker_id, round_id))
+            return mismatches
+
+        with LocalServer() as self.server, ThreadPoolExecutor(self.THREADS) as executor:
+            results = list(executor.map(worker, range(self.THREADS)))
+
+        self.assertEqual([mismatch for result in results for mismatch in result], [])
+        self.assertEqual(self.curl.get_pool_stats()['in_use'], 0)
+
+    def test_staged_options_are_per_thread(self):
+        self.curl.set_header('X-Main', '1')
+        thread = threading.Thread(target=self.curl.close)
+        thread.start()
+        thread.join()
+        self.assertEqual(self.curl._context().headers, {'X-Main': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
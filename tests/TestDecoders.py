@@ -0,0 +1,79 @@
+import unittest
+import xml.etree.ElementTree as ET
+import requests
+from pycurlify import PyCurlify
+from pycurlify.Decoders import DecoderRegistry
+from LocalServer import LocalServer
+
+
+def _response(content_type, content):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = content_type
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+class TestDecoders(unittest.TestCase):
+
+    def test_default_decoders(self):
+        registry = DecoderRegistry()
+        self.assertEqual(registry.decode(_response('application/json; charset=utf-8', b'{"a": 1}')), {'a': 1})
+        self.assertEqual(registry.decode(_response('application/problem+json', b'{"a": 1}')), {'a': 1})
+        self.assertEqual(registry.decode(_response('application/json', b'{invalid')), '{invalid')
+        self.assertEqual(registry.decode(_response('Text/HTML', b'<p>')), '<p>')
+        self.assertEqual(registry.decode(_response('application/atom+xml', b'<feed/>')).tag, 'feed')
+        self.assertEqual(registry.decode(_response('text/xml', b'<a>')), '<a>')
+        self.assertEqual(registry.decode(_response('text/plain', b'plain')), b'plain')
+        self.assertEqual(registry.decode(_response('', b'raw')), b'raw')
+
+    def test_precedence_and_custom_decoders(self):
+        registry = DecoderRegistry()
+        registry.register('text/*', lambda response: 'wildcard')
+        registry.register('+csv', lambda response: 'suffix')
+        registry.register('text/vnd.custom+csv', lambda response: 'exact')
+        self.assertEqual(registry.decode(_response('text/plain', b'')), 'wildcard')
+        self.assertEqual(registry.decode(_response('text/other+csv', b'')), 'suffix')
+        self.assertEqual(registry.decode(_response('text/vnd.custom+csv; header=present', b'')), 'exact')
+        self.assertEqual(registry.decode(_response('text/html', b'<p>')), '<p>')
+
+        registry.unregister('text/vnd.custom+csv')
+        self.assertEqual(registry.decode(_response('text/vnd.custom+csv; header=present', b'')), 'suffix')
+        self.assertEqual(DecoderRegistry().decode(_response('text/plain', b'plain')), b'plain')
+
+    def test_response_is_decoded_once(self):
+        curl = PyCurlify()
+        calls = []
+
+        def decode(response):
+            calls.append(response)
+            return response.json()
+
+        with LocalServer() as server:
+            curl.get(server.url('/path'))
+            first = curl.response()
+            self.assertIs(curl.response(), first)
+            self.assertEqual(first['path'], '/path')
+
+            curl.register_decoder('application/json', decode)
+            self.assertEqual(curl.response(), first)
+            self.assertIsNot(curl.response(), first)
+            self.assertEqual(len(calls), 1)
+
+            curl.unregister_decoder('application/json')
+            self.assertIsInstance(curl.response(), bytes)
+            # Other clients keep their own registry
+            other = PyCurlify()
+            other.get(server.url('/'))
+            self.assertIsInstance(other.response(), dict)
+
+    def test_xml_response(self):
+        response = _response('application/xml', b'<root><item>1</item></root>')
+        element = DecoderRegistry().decode(response)
+        self.assertIsInstance(element, ET.Element)
+        self.assertIs(DecoderRegistry().decode(response), element)
+
+
+if __name__ == '__main__':
+    unittest.main()
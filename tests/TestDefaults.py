@@ -0,0 +1,47 @@
+import json
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestDefaults(unittest.TestCase):
+
+    def setUp(self):
+        self.curl = PyCurlify()
+
+    def test_defaults_survive_close_and_are_overridable(self):
+        self.curl.set_default_bearer_authentication('token')
+        self.curl.set_default_header('X-Client', 'default')
+        self.curl.set_default_cookies({'team': 'a'})
+        self.curl.set_default_timeout(10)
+        with LocalServer() as server:
+            for _ in range(2):
+                document = json.loads(self.curl.get(server.url('/')).content)
+                self.assertEqual(document['headers']['Authorization'], 'Bearer token')
+                self.assertEqual(document['headers']['X-Client'], 'default')
+                self.assertEqual(document['headers']['Cookie'], 'team=a')
+            self.assertEqual(self.curl.get_timeout(), 10)
+
+            self.curl.set_header('X-Client', 'staged')
+            self.curl.set_cookie('team', 'b')
+            self.curl.disable_timeout()
+            self.assertIsNone(self.curl.get_timeout())
+            document = json.loads(self.curl.get(server.url('/'), headers={'Authorization': 'Basic x'}).content)
+            self.assertEqual(document['headers']['X-Client'], 'staged')
+            self.assertEqual(document['headers']['Authorization'], 'Basic x')
+            self.assertEqual(document['headers']['Cookie'], 'team=b')
+            self.assertEqual(self.curl.get_timeout(), 10)
+
+    def test_snapshot_is_rebuilt_only_on_change(self):
+        self.curl.set_default_header('X-A', '1')
+        snapshot = self.curl.get_defaults()
+        self.curl.set_header('X-B', '2')
+        self.curl.close()
+        self.assertIs(self.curl.get_defaults(), snapshot)
+        self.curl.remove_default_header('X-A')
+        self.assertEqual(dict(self.curl.get_defaults().headers), {})
+        self.assertEqual(dict(snapshot.headers), {'X-A': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
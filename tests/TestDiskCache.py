@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pycurlify import PyCurlify
+from pycurlify.Cache import CacheEntry
+from pycurlify.DiskCache import DiskStore
+from LocalServer import LocalServer
+
+
+def _entry(url, body):
+    now = time.time()
+    return CacheEntry('GET', url, 200, 'OK', {'Cache-Control': 'max-age=60'}, body, (), now, now)
+
+
+def _fill(path, worker):
+    store = DiskStore(path)
+    for index in range(20):
+        store.put(('GET', f'http://example.com/{worker}/{index}'), _entry('http://example.com/', b'x' * 100))
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = LocalServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def _client(self, **kwargs):
+        curl = PyCurlify()
+        curl.enable_cache(path=self.directory.name, **kwargs)
+        return curl
+
+    def test_new_client_is_served_from_disk(self):
+        self.assertEqual(self._client().get(self.server.url('/cache/max-age')).json(), {'cached': True})
+
+        curl = self._client()
+        response = curl.get(self.server.url('/cache/max-age'))
+        self.assertEqual(response.json(), {'cached': True})
+        self.assertEqual(len(self.server.seen), 1)
+        stats = curl.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['entries'], stats['memory_entries']), (1, 1, 0))
+
+    def test_disk_hit_streams_body_from_file(self):
+        self._client().get(self.server.url('/cache/max-age'))
+        curl = self._client()
+        response = curl.get(self.server.url('/cache/max-age'))
+        self.assertFalse(response._content_consumed)
+        self.assertEqual(b''.join(response.iter_content(4)), b'{"cached": true}')
+        self.assertTrue(response.raw.closed)
+        response = curl.get(self.server.url('/cache/max-age'))
+        self.assertEqual(response.content, b'{"cached": true}')
+        self.assertTrue(response.raw.closed)
+
+    def test_revalidation_keeps_blob(self):
+        self._client().get(self.server.url('/cache/etag'))
+        blobs = [name for _, _, names in os.walk(self.directory.name) for name in names if len(name) == 32]
+
+        response = self._client().get(self.server.url('/cache/etag'))
+        self.assertEqual(response.json(), {'version': 1})
+        self.assertEqual(self.server.seen[1][2].get('If-None-Match'), '"v1"')
+        self.assertEqual([name for _, _, names in os.walk(self.directory.name) for name in names if len(name) == 32],
+                         blobs)
+
+    def test_size_and_ttl_bounds(self):
+        store = DiskStore(self.directory.name, max_bytes=1000)
+        for index in range(5):
+            store.put(('GET', f'http://example.com/{index}'), _entry('http://example.com/', b'x' * 300))
+        self.assertLessEqual(store.stats()['bytes'], 1000)
+        self.assertEqual(store.get(('GET', 'http://example.com/0')), [])
+        self.assertEqual(len(store.get(('GET', 'http://example.com/4'))), 1)
+
+        store.ttl = 0
+        self.assertEqual(store.get(('GET', 'http://example.com/4')), [])
+
+
+class TestDiskCacheProcesses(unittest.TestCase):
+
+    def test_concurrent_writers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            processes = [multiprocessing.get_context('spawn').Process(target=_fill, args=(directory, worker))
+                         for worker in range(4)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            self.assertEqual([process.exitcode for process in processes], [0] * 4)
+            self.assertEqual(DiskStore(directory).stats()['entries'], 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
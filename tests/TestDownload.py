@@ -0,0 +1,178 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import EchoHandler, LocalServer
+
+SIZE = 300000
+
+
+def _payload(size):
+    return (bytes(range(251)) * (size // 251 + 1))[:size]
+
+
+class CuttingHandler(EchoHandler):
+    """
+    Drops the connection after server.cut bytes of every response body, when set.
+    """
+
+    def send_body(self, body, content_type='application/json', status=200, headers=None):
+        cut = getattr(self.server, 'cut', None)
+        if cut is None:
+            return super().send_body(body, content_type, status, headers)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body[:cut])
+        self.close_connection = True
+
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.set_pool_config(pool_maxsize=8)
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = LocalServer(CuttingHandler).__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def _read(self, result):
+        with open(result['file_path'], 'rb') as file:
+            return file.read()
+
+    def test_single_stream(self):
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin')
+        self.assertEqual((result['file_size'], result['connections']), (SIZE, 1))
+        self.assertEqual(self._read(result), _payload(SIZE))
+
+    def test_parallel_ranges(self):
+        self.curl.set_header('X-Staged', 'yes')
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                          connections=4, min_part_size=50000)
+        self.assertEqual((result['file_size'], result['connections']), (SIZE, 4))
+        self.assertEqual(self._read(result), _payload(SIZE))
+
+        ranges = sorted(headers['Range'] for _, _, headers in self.server.seen)
+        self.assertEqual(ranges, ['bytes=0-49999', 'bytes=112500-174999', 'bytes=175000-237499',
+                                  'bytes=237500-299999', 'bytes=50000-112499'])
+        self.assertTrue(all(headers.get('X-Staged') == 'yes' for _, _, headers in self.server.seen))
+        self.assertEqual([headers.get('If-Range') for _, _, headers in self.server.seen[1:]], ['"bytes"'] * 4)
+
+    def test_zero_copy(self):
+        for connections in (1, 4):
+            result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                              connections=connections, min_part_size=50000, zero_copy=True)
+            self.assertEqual(result['file_size'], SIZE)
+            self.assertEqual(self._read(result), _payload(SIZE))
+
+    def test_small_file_is_not_split(self):
+        result = self.curl.download_file(self.server.url('/bytes?1000'), self.directory.name, 'file.bin',
+                                          connections=4, min_part_size=50000)
+        self.assertEqual((result['file_size'], result['connections']), (1000, 1))
+        self.assertEqual(self._read(result), _payload(1000))
+        self.assertEqual(len(self.server.seen), 1)
+
+    def test_fallback_without_range_support(self):
+        result = self.curl.download_file(self.server.url(f'/bytes-plain?{SIZE}'), self.directory.name, 'file.bin',
+                                          connections=4, min_part_size=50000)
+        self.assertEqual((result['file_size'], result['connections']), (SIZE, 1))
+        self.assertEqual(self._read(result), _payload(SIZE))
+        self.assertEqual(len(self.server.seen), 1)
+
+    def test_unexpected_content_range_is_an_error(self):
+        for content_range in ('bytes 5-9/300000', 'bytes 0-9/*', 'invalid'):
+            for resume in (False, True):
+                with self.subTest(content_range=content_range, resume=resume):
+                    self.server.httpd.extra_headers = {'Content-Range': content_range}
+                    result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name,
+                                                      'file.bin', connections=4, min_part_size=50000, resume=resume)
+                    self.assertIsNone(result)
+                    self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'file.bin')))
+
+    def test_failed_download_leaves_no_file(self):
+        self.curl.set_timeout(0.2)
+        result = self.curl.download_file(self.server.url('/slow?1'), self.directory.name, 'slow.bin', connections=4)
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'slow.bin')))
+
+    def _interrupt(self):
+        self.server.httpd.cut = 100000
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                          resume=True)
+        self.server.httpd.cut = None
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'file.bin')))
+        with open(os.path.join(self.directory.name, 'file.bin.part.json')) as file:
+            state = json.load(file)
+        self.assertEqual((state['size'], state['validator'], len(state['ranges'])), (SIZE, '"bytes"', 1))
+        start, end = state['ranges'][0]
+        self.assertTrue(start == 0 and 0 < end < 100000)
+        return end + 1
+
+    def test_resume_after_interruption(self):
+        completed = self._interrupt()
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                          resume=True)
+        self.assertEqual((result['file_size'], result['resumed_bytes']), (SIZE, completed))
+        self.assertEqual(self._read(result), _payload(SIZE))
+        self.assertEqual((self.server.seen[-1][2]['Range'], self.server.seen[-1][2]['If-Range']),
+                         (f'bytes={completed}-{SIZE - 1}', '"bytes"'))
+        self.assertEqual(os.listdir(self.directory.name), ['file.bin'])
+
+    def test_restart_when_remote_file_changed(self):
+        self._interrupt()
+        self.server.httpd.etag = '"v2"'
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                          connections=4, min_part_size=50000, resume=True)
+        self.assertEqual((result['file_size'], result['resumed_bytes']), (SIZE, 0))
+        self.assertEqual(self._read(result), _payload(SIZE))
+        self.assertEqual(self.server.seen[1][2]['If-Range'], '"bytes"')
+        self.assertEqual(os.listdir(self.directory.name), ['file.bin'])
+
+    def test_digests_are_computed_while_writing(self):
+        payload = _payload(SIZE)
+        expected = {'sha256': hashlib.sha256(payload).hexdigest(), 'md5': hashlib.md5(payload).hexdigest()}
+        for connections, zero_copy in ((1, False), (1, True), (4, False), (4, True)):
+            result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                              connections=connections, min_part_size=50000, zero_copy=zero_copy,
+                                              digests=['SHA-256', 'md5'])
+            self.assertEqual(result['digests'], expected)
+
+    def test_resumed_ranges_are_hashed(self):
+        self._interrupt()
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                          resume=True, digests={'sha256': hashlib.sha256(_payload(SIZE)).hexdigest()})
+        self.assertEqual(result['digests'], {'sha256': hashlib.sha256(_payload(SIZE)).hexdigest()})
+
+    def test_mismatch_deletes_or_quarantines_the_file(self):
+        for on_mismatch, remaining in (('delete', []), ('quarantine', ['file.bin.quarantine'])):
+            result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                              connections=4, min_part_size=50000, digests={'sha256': '00' * 32},
+                                              on_mismatch=on_mismatch)
+            self.assertIsNone(result)
+            self.assertEqual(os.listdir(self.directory.name), remaining)
+
+    def test_digest_headers_are_verified(self):
+        sha256 = base64.b64encode(hashlib.sha256(_payload(SIZE)).digest()).decode()
+        self.server.httpd.extra_headers = {'Repr-Digest': f'sha-256=:{sha256}:, unknown=:AAAA:'}
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin',
+                                          connections=4, min_part_size=50000)
+        self.assertEqual(result['digests'], {'sha256': hashlib.sha256(_payload(SIZE)).hexdigest()})
+
+        self.server.httpd.extra_headers = {'Content-MD5': base64.b64encode(hashlib.md5(b'other').digest()).decode()}
+        result = self.curl.download_file(self.server.url(f'/bytes?{SIZE}'), self.directory.name, 'file.bin')
+        self.assertIsNone(result)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
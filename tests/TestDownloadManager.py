@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+import unittest
+from pycurlify import DownloadManager
+from LocalServer import EchoHandler, LocalServer
+
+
+class CountingHandler(EchoHandler):
+    """
+    Records the highest number of requests handled at the same time, in total and per Host header.
+    """
+
+    def do_GET(self):
+        server = self.server
+        host = self.headers.get('Host', '').rsplit(':', 1)[0]
+        with server.lock:
+            server.active[host] = server.active.get(host, 0) + 1
+            server.peak[host] = max(server.peak.get(host, 0), server.active[host])
+            server.peak_total = max(server.peak_total, sum(server.active.values()))
+        try:
+            super().do_GET()
+        finally:
+            with server.lock:
+                server.active[host] -= 1
+
+
+class TestDownloadManager(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = LocalServer(CountingHandler).__enter__()
+        self.server.httpd.lock = threading.Lock()
+        self.server.httpd.active, self.server.httpd.peak, self.server.httpd.peak_total = {}, {}, 0
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def _path(self, *parts):
+        return os.path.join(self.directory.name, *parts)
+
+    def test_downloads_queue_with_host_limits(self):
+        port = self.server.httpd.server_port
+        reports = []
+        manager = DownloadManager(concurrency=6, max_host_downloads=2, report_interval=0.05, progress=reports.append)
+        indexes = manager.add_many((f'http://{host}:{port}/slow?0.1', self._path(host, f'{index}.json'))
+                                   for host in ('127.0.0.1', 'localhost') for index in range(6))
+        indexes.append(manager.add(f'http://127.0.0.1:{port}/bytes?50000', self._path('file.bin')))
+        results = {result['index']: result for result in manager.run()}
+        manager.close()
+
+        self.assertEqual(sorted(results), indexes)
+        self.assertTrue(all(result['error'] is None for result in results.values()))
+        self.assertEqual(os.path.getsize(self._path('file.bin')), 50000)
+        self.assertEqual(len(os.listdir(self._path('localhost'))), 6)
+        self.assertEqual(self.server.httpd.peak, {'127.0.0.1': 2, 'localhost': 2})
+        self.assertEqual({key: reports[-1][key] for key in ('queued', 'running', 'done', 'failed')},
+                         {'queued': 0, 'running': 0, 'done': 13, 'failed': 0})
+        self.assertGreater(reports[-1]['bytes'], 50000)
+        self.assertEqual(reports[-1]['eta'], 0)
+
+    def test_device_writer_limit(self):
+        port = self.server.httpd.server_port
+        manager = DownloadManager(concurrency=4, max_host_downloads=4, max_device_writers=1,
+                                  progress=lambda stats: None)
+        manager.add_many((f'http://{host}:{port}/slow?0.05', self._path(f'{host}-{index}.json'))
+                         for host in ('127.0.0.1', 'localhost') for index in range(3))
+        self.assertEqual(manager.perform(), 6)
+        manager.close()
+        self.assertEqual(self.server.httpd.peak_total, 1)
+
+    def test_state_survives_restart(self):
+        state_path = self._path('state.sqlite3')
+        jobs = [(self.server.url('/bytes?1000'), self._path('a.bin')), ('http://127.0.0.1:1/', self._path('b.bin'))]
+        manager = DownloadManager(state_path=state_path, progress=lambda stats: None)
+        manager.add_many(jobs)
+        results = sorted(manager.run(), key=lambda result: result['index'])
+        manager.close()
+        self.assertEqual([result['file_size'] for result in results], [1000, 0])
+        self.assertIsNotNone(results[1]['error'])
+
+        # Known destinations are not queued again; only the failed job is retried
+        completed = []
+        manager = DownloadManager(state_path=state_path, progress=lambda stats: None, callback=completed.append)
+        self.assertEqual(manager.add_many(jobs), [1, 2])
+        self.assertEqual(manager.stats()['queued'], 1)
+        manager.perform()
+        self.assertEqual([result['url'] for result in completed], ['http://127.0.0.1:1/'])
+        manager.close()
+
+        manager = DownloadManager(state_path=state_path, retry_failed=False, progress=lambda stats: None)
+        self.assertEqual(manager.stats()['queued'], 0)
+        self.assertEqual((manager.stats()['done'], manager.stats()['failed']), (1, 1))
+        manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
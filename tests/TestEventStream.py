@@ -0,0 +1,152 @@
+import unittest
+import requests
+from pycurlify import PyCurlify
+from pycurlify.EventStream import EventStreamParser, ServerSentEvent
+from LocalServer import EchoHandler, LocalServer
+
+EVENTS_PER_CONNECTION = 3
+TOTAL_EVENTS = 8
+
+
+class EventsHandler(EchoHandler):
+    """
+    Serves /events as a text/event-stream of TOTAL_EVENTS events with IDs 1 to TOTAL_EVENTS, closing the stream after
+    EVENTS_PER_CONNECTION of them and resuming after the Last-Event-ID of the next request. Once every event was sent,
+    it answers 204 No Content. /plain is not an event stream and /missing is a 404.
+    """
+
+    def do_GET(self):
+        self.server.seen.append((self.command, self.path, dict(self.headers.items())))
+        try:
+            if self.path == '/events':
+                first = int(self.headers.get('Last-Event-ID') or 0) + 1
+                if first > TOTAL_EVENTS:
+                    self.send_body(b'', status=204)
+                    return
+                last = min(first + EVENTS_PER_CONNECTION, TOTAL_EVENTS + 1)
+                self.send_chunked(self._events(first, last), 'text/event-stream; charset=utf-8')
+            elif self.path == '/plain':
+                self.send_body(b'data: x\n\n', 'text/plain')
+            elif self.path == '/missing':
+                self.send_body(b'', status=404)
+            else:
+                self.echo()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _events(self, first, last):
+        yield b'retry: 10\n: keep-alive comment\n\n'
+        for index in range(first, last):
+            event = b'tick' if index % 2 else b'tock'
+            yield b'id: %d\nevent: %s\ndata: {"index": %d}\ndata: second line\n\n' % (index, event, index)
+
+
+def _parse(stream, size):
+    parser = EventStreamParser()
+    events = []
+    for offset in range(0, len(stream), size):
+        events += parser.feed(stream[offset:offset + size])
+    return parser, events
+
+
+class TestEventStreamParser(unittest.TestCase):
+
+    def test_fields_whatever_the_chunking(self):
+        stream = ('﻿data: first\r\n\r\n'
+                  ': comment\n'
+                  'event: update\rid: 7\rdata:no space\rdata\rdata:  two spaces\r\r'
+                  'data: événement\nid\nretry: 2500\nretry: soon\nunknown: field\n\n'
+                  'event: ignored\n\n'
+                  'id: 9\0\ndata: last\n\n'
+                  'data: pending').encode('utf-8')
+        expected = [
+            ServerSentEvent('message', 'first', ''),
+            ServerSentEvent('update', 'no space\n\n two spaces', '7'),
+            ServerSentEvent('message', 'événement', ''),
+            ServerSentEvent('message', 'last', ''),
+        ]
+        for size in (1, 2, 5, len(stream)):
+            with self.subTest(size=size):
+                parser, events = _parse(stream, size)
+                self.assertEqual(events, expected)
+                self.assertEqual(parser.retry, 2500)
+                self.assertEqual(parser.last_event_id, '')
+
+    def test_crlf_split_between_chunks(self):
+        parser = EventStreamParser('3')
+        self.assertEqual(parser.feed(b'data: a\r'), [])
+        self.assertEqual(parser.feed(b'\n\r'), [])
+        self.assertEqual(parser.feed(b'\n'), [ServerSentEvent('message', 'a', '3')])
+
+
+class TestEventSource(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer(EventsHandler).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def setUp(self):
+        self.server.seen.clear()
+
+    def test_reconnects_with_last_event_id(self):
+        for transport in ('requests', 'urllib3', 'curl'):
+            with self.subTest(transport=transport):
+                self.server.seen.clear()
+                curl = PyCurlify()
+                curl.set_transport(transport)
+                curl.set_header('X-Client', 'sse')
+                source = curl.event_source(self.server.url('/events'))
+                events = list(source)
+                self.assertEqual([event.id for event in events], [str(index) for index in range(1, 9)])
+                self.assertEqual(events[0].event, 'tick')
+                self.assertEqual(events[1].event, 'tock')
+                self.assertEqual(events[0].data, '{"index": 1}\nsecond line')
+
+                headers = [headers for _, _, headers in self.server.seen]
+                self.assertEqual([request.get('Last-Event-ID') for request in headers], [None, '3', '6', '8'])
+                self.assertTrue(all(request['Accept'] == 'text/event-stream' for request in headers))
+                self.assertTrue(all(request['X-Client'] == 'sse' for request in headers))
+
+                stats = source.stats()
+                self.assertEqual(stats['events'], 8)
+                self.assertEqual(stats['reconnects'], 3)
+                self.assertEqual(stats['retry'], 0.01)
+                self.assertEqual(stats['last_event_id'], '8')
+                self.assertGreater(stats['bytes'], 0)
+                self.assertGreater(stats['events_per_second'], 0)
+                self.assertGreaterEqual(stats['max_lag'], stats['lag'])
+                curl.get_transport().close()
+
+    def test_callbacks_and_close(self):
+        curl = PyCurlify()
+        received = []
+        source = curl.event_source(self.server.url('/events'), last_event_id='4')
+        source.on('*', lambda event: received.append(('other', event.id)))
+
+        def stop(event):
+            received.append(('tock', event.id))
+            source.close()
+
+        source.on('tock', stop)
+        source.run()
+        self.assertEqual(received, [('other', '5'), ('tock', '6')])
+        self.assertEqual(self.server.seen[0][2]['Last-Event-ID'], '4')
+
+    def test_errors(self):
+        curl = PyCurlify()
+        with self.assertRaises(requests.HTTPError):
+            list(curl.event_source(self.server.url('/missing')))
+        with self.assertRaises(requests.RequestException):
+            list(curl.event_source(self.server.url('/plain')))
+        source = curl.event_source('http://127.0.0.1:1/', retry=0.01, max_retries=2)
+        with self.assertRaises(requests.ConnectionError):
+            list(source)
+        self.assertEqual(source.stats()['reconnects'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import unittest
+import requests
+from pycurlify import PyCurlify, AsyncPyCurlify
+from pycurlify.JsonCodec import CODECS, JsonCodec, MsgspecCodec, OrjsonCodec, get_codec, encode_body
+from LocalServer import LocalServer
+
+# The codecs whose package is installed
+INSTALLED = [name for name, (_, module) in CODECS.items() if module is not None]
+PAYLOAD = {'id': 1, 'name': 'café', 'tags': ['a', 'b'], 'big': 2 ** 70, 'nested': {'ratio': 0.5, 'none': None}}
+
+
+class RecordingCodec(JsonCodec):
+    name = 'recording'
+
+    def __init__(self):
+        self.calls = []
+
+    def dumps(self, obj):
+        self.calls.append('dumps')
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.calls.append('loads')
+        return super().loads(data)
+
+
+class TestJsonCodec(unittest.TestCase):
+
+    def test_get_codec(self):
+        preferred = next(name for name in ('orjson', 'msgspec', 'json') if name in INSTALLED)
+        self.assertEqual(get_codec().name, preferred)
+        self.assertEqual(get_codec('json').name, 'json')
+        codec = RecordingCodec()
+        self.assertIs(get_codec(codec), codec)
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
+        for name in ('orjson', 'msgspec'):
+            if name not in INSTALLED:
+                with self.assertRaises(ImportError):
+                    get_codec(name)
+
+    def test_codecs_agree(self):
+        for name in INSTALLED:
+            codec = get_codec(name)
+            encoded = codec.dumps(PAYLOAD)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(json.loads(encoded), PAYLOAD)
+            self.assertEqual(codec.loads(encoded), PAYLOAD)
+            self.assertEqual(codec.loads(memoryview(encoded)), PAYLOAD)
+            self.assertEqual(codec.loads(encoded.decode('utf-8')), PAYLOAD)
+            with self.assertRaises(ValueError):
+                codec.loads(b'{invalid')
+
+    def test_non_finite_floats_are_rejected(self):
+        for name in INSTALLED:
+            codec = get_codec(name)
+            for value in (float('nan'), float('inf'), -float('inf')):
+                with self.subTest(codec=name, value=value):
+                    with self.assertRaises(ValueError):
+                        codec.dumps({'a': [1, {'b': value}]})
+                    with self.assertRaises(requests.exceptions.InvalidJSONError):
+                        encode_body({'json': (value,), 'headers': {}}, codec)
+            self.assertEqual(json.loads(codec.dumps({'a': None, 'b': 1.5})), {'a': None, 'b': 1.5})
+
+    @unittest.skipUnless(CODECS['orjson'][1], 'orjson is not installed')
+    def test_orjson_codec(self):
+        self.assertIsInstance(get_codec('orjson'), OrjsonCodec)
+
+    @unittest.skipUnless(CODECS['msgspec'][1], 'msgspec is not installed')
+    def test_msgspec_codec(self):
+        self.assertIsInstance(get_codec('msgspec'), MsgspecCodec)
+
+    def test_encode_body(self):
+        request_kwargs = {'url': 'http://example.com', 'headers': {'content-type': 'application/vnd.api+json'},
+                          'json': {'a': 1}}
+        encoded = encode_body(request_kwargs, JsonCodec())
+        self.assertEqual(encoded['data'], b'{"a": 1}')
+        self.assertNotIn('json', encoded)
+        self.assertEqual(encoded['headers'], {'content-type': 'application/vnd.api+json'})
+        self.assertIn('json', request_kwargs)
+        self.assertIs(encode_body({'json': None, 'headers': {}}, JsonCodec())['json'], None)
+        with self.assertRaises(requests.exceptions.InvalidJSONError):
+            encode_body({'json': {'a': object()}, 'headers': {}}, JsonCodec())
+
+    def test_round_trip_with_every_transport(self):
+        with LocalServer() as server:
+            for transport in ('requests', 'urllib3', 'curl'):
+                for codec in INSTALLED:
+                    with self.subTest(transport=transport, codec=codec):
+                        curl = PyCurlify()
+                        curl.set_transport(transport)
+                        curl.set_json_codec(codec)
+                        curl.post(server.url('/'), data=PAYLOAD)
+                        document = curl.response()
+                        self.assertEqual(json.loads(document['body']), PAYLOAD)
+                        self.assertEqual(document['headers']['Content-Type'], 'application/json')
+                        curl.get_transport().close()
+
+    def test_client_codec_decodes_responses(self):
+        codec = RecordingCodec()
+        curl = PyCurlify()
+        curl.register_decoder('text/html', lambda response: 'custom')
+        curl.set_json_codec(codec)
+        self.assertIs(curl.get_json_codec(), codec)
+        with LocalServer() as server:
+            curl.put(server.url('/put'), data={'a': 1})
+            self.assertEqual(curl.response()['method'], 'PUT')
+        self.assertEqual(codec.calls, ['dumps', 'loads'])
+        self.assertEqual(curl._decoders.resolve('text/html')(None), 'custom')
+
+    def test_unserializable_payload_is_reported(self):
+        errors = []
+        curl = PyCurlify()
+        curl.error_callback = errors.append
+        with LocalServer() as server:
+            self.assertIsNone(curl.post(server.url('/'), data={'a': object()}))
+            self.assertEqual(server.seen, [])
+        self.assertEqual(len(errors), 1)
+
+
+class TestAsyncJsonCodec(unittest.IsolatedAsyncioTestCase):
+
+    async def test_round_trip(self):
+        codec = RecordingCodec()
+        with LocalServer() as server:
+            async with AsyncPyCurlify() as curl:
+                curl.set_json_codec(codec)
+                await curl.patch(server.url('/'), data=PAYLOAD)
+                document = curl.response()
+        self.assertEqual(json.loads(document['body']), PAYLOAD)
+        self.assertEqual(document['headers']['Content-Type'], 'application/json')
+        self.assertEqual(codec.calls, ['dumps', 'loads'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import unittest
+import requests
+from pycurlify import PyCurlify
+from pycurlify.JsonCodec import get_codec
+from pycurlify.JsonStream import JsonItemParser, iter_json_items
+from LocalServer import EchoHandler, LocalServer
+
+DOCUMENT = {
+    'meta': {'items': [0], 'note': 'brackets ]}[{ and "quotes" \\ in strings'},
+    'items': [{'id': index, 'name': 'é"]}' * (index % 3), 'tags': [index, {'deep': None}]} for index in range(50)]
+             + [1.5e3, -2, 'text', True, False, None, [], {}],
+    'total': 58,
+}
+
+
+def _items(count):
+    yield b'{"total": %d, "items": [' % count
+    for start in range(0, count, 100):
+        yield b','.join(b'{"id": %d, "payload": "%s"}' % (index, b'x' * 100)
+                        for index in range(start, min(start + 100, count))) + (b',' if start + 100 < count else b'')
+    yield b']}'
+
+
+class ItemsHandler(EchoHandler):
+    """
+    Serves /items?<count> as a chunked JSON document, /truncated as an incomplete one and /missing as a 404.
+    """
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        try:
+            if path == '/items':
+                self.send_chunked(_items(int(query)))
+            elif path == '/truncated':
+                self.send_chunked([b'[1, 2, {"a": '])
+            elif path == '/missing':
+                self.send_body(b'[]', status=404)
+            else:
+                super().do_GET()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class TestJsonItemParser(unittest.TestCase):
+
+    def test_values_at_path_whatever_the_chunking(self):
+        document = json.dumps(DOCUMENT).encode('utf-8')
+        for codec in (None, get_codec()):
+            for size in (1, 2, 7, 64, len(document)):
+                chunks = [document[offset:offset + size] for offset in range(0, len(document), size)]
+                with self.subTest(codec=codec, size=size):
+                    self.assertEqual(list(iter_json_items(chunks, 'items.item', codec)), DOCUMENT['items'])
+                    self.assertEqual(list(iter_json_items(chunks, 'items.item.id', codec)), list(range(50)))
+                    self.assertEqual(list(iter_json_items(chunks, 'meta.note', codec)), [DOCUMENT['meta']['note']])
+                    self.assertEqual(list(iter_json_items(chunks, '', codec)), [DOCUMENT])
+                    self.assertEqual(list(iter_json_items(chunks, 'missing.item', codec)), [])
+
+        self.assertEqual(list(iter_json_items([b' [1, "a" ,[]] '])), [1, 'a', []])
+        self.assertEqual(list(iter_json_items([b'[]'])), [])
+        self.assertEqual(list(iter_json_items([b'4', b'2'], '')), [42])
+
+    def test_invalid_documents(self):
+        for document in (b'', b'[1', b'[1,]', b'[1}', b'{"a" 1}', b'{1: 2}', b'[1] [2]', b'[tru]', b'[x]'):
+            with self.subTest(document=document):
+                with self.assertRaises(requests.exceptions.JSONDecodeError):
+                    list(iter_json_items([document]))
+
+    def test_memory_is_bounded(self):
+        parser = JsonItemParser('items.item')
+        largest = count = 0
+        for chunk in _items(100000):
+            count += len(parser.feed(chunk))
+            largest = max(largest, len(parser._buffer))
+        count += len(parser.close())
+        self.assertEqual(count, 100000)
+        # No more than a partial item is kept between chunks
+        self.assertLess(largest, 200)
+
+
+class TestIterJson(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer(ItemsHandler).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def test_iter_json_with_every_transport(self):
+        for transport in ('requests', 'urllib3', 'curl'):
+            with self.subTest(transport=transport):
+                curl = PyCurlify()
+                curl.set_transport(transport)
+                ids = [item['id'] for item in curl.iter_json(self.server.url('/items?5000'), path='items.item')]
+                self.assertEqual(ids, list(range(5000)))
+
+                # Stopping early closes the connection; the client remains usable
+                for item in curl.iter_json(self.server.url('/items?5000'), path='items.item'):
+                    break
+                self.assertEqual(item['id'], 0)
+                self.assertEqual(list(curl.iter_json(self.server.url('/items?3'), path='total')), [3])
+
+                with self.assertRaises(requests.exceptions.JSONDecodeError):
+                    list(curl.iter_json(self.server.url('/truncated')))
+                curl.get_transport().close()
+
+    def test_errors(self):
+        curl = PyCurlify()
+        with self.assertRaises(requests.HTTPError):
+            list(curl.iter_json(self.server.url('/missing')))
+        with self.assertRaises(requests.ConnectionError):
+            list(curl.iter_json('http://127.0.0.1:1/'))
+        self.assertEqual(list(curl.iter_json(self.server.url('/echo'), path='method')), ['GET'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import os
+import tempfile
+import unittest
+from pycurlify import PyCurlify, MultiEngine
+from LocalServer import LocalServer
+
+
+class TestMultiEngine(unittest.TestCase):
+
+    def test_requests_and_downloads(self):
+        curl = PyCurlify()
+        curl.set_header('X-Engine', 'multi')
+        completed = []
+        engine = MultiEngine(curl, max_total_connections=8, max_host_connections=4, max_transfers=16,
+                             callback=completed.append)
+        with LocalServer() as server, tempfile.TemporaryDirectory() as dir_path:
+            for index in range(100):
+                engine.add('get', server.url(f'/{index}'))
+            engine.add('post', server.url('/post'), data={'a': 1})
+            download = engine.add_download(server.url('/bytes?50000'), dir_path, 'file.bin')
+            failed = engine.add('get', 'http://127.0.0.1:1/')
+            results = {result['index']: result for result in engine.run()}
+
+            self.assertEqual(os.path.getsize(os.path.join(dir_path, 'file.bin')), 50000)
+
+        engine.close()
+        self.assertEqual(len(results), 103)
+        self.assertEqual(len(completed), 103)
+        for index in range(100):
+            document = json.loads(results[index]['response'].content)
+            self.assertEqual(document['path'], f'/{index}')
+            self.assertEqual(document['headers']['X-Engine'], 'multi')
+        self.assertEqual(json.loads(json.loads(results[100]['response'].content)['body']), {'a': 1})
+        self.assertEqual(results[download]['file_size'], 50000)
+        self.assertIsNone(results[failed]['response'])
+        self.assertIsNotNone(results[failed]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import threading
+import unittest
+import requests
+from pycurlify import PyCurlify
+from pycurlify.JsonCodec import get_codec
+from pycurlify.JsonStream import NdjsonParser, iter_ndjson_records
+from LocalServer import EchoHandler, LocalServer
+
+RECORDS = [{'id': 1, 'message': 'first'}, [1, 2], 'text', 3.5, None, {'nested': {'line': 'a\\nb'}}]
+
+
+def _records(count):
+    for start in range(0, count, 100):
+        yield b''.join(b'{"id": %d, "level": "info", "message": "%s"}\n' % (index, b'm' * 80)
+                       for index in range(start, min(start + 100, count)))
+
+
+class NdjsonHandler(EchoHandler):
+    """
+    Serves /logs?<count> as a chunked NDJSON stream, and /live, whose second record is only sent once the test sets
+    the released event of the server.
+    """
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        try:
+            if path == '/logs':
+                self.send_chunked(_records(int(query)), 'application/x-ndjson')
+            elif path == '/live':
+                self.send_chunked(self._live(), 'application/x-ndjson')
+            else:
+                super().do_GET()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _live(self):
+        yield b'{"id": 0}\n'
+        self.server.released.wait(5)
+        yield b'{"id": 1}\n'
+
+
+class TestNdjsonParser(unittest.TestCase):
+
+    def test_records_whatever_the_chunking(self):
+        stream = b'\n'.join(json.dumps(record).encode('utf-8') for record in RECORDS)
+        stream = stream.replace(b'\n', b'\r\n', 1) + b'\n\n  \n' + b'{"last": true}'
+        for codec in (None, get_codec()):
+            for size in (1, 3, 16, len(stream)):
+                chunks = [stream[offset:offset + size] for offset in range(0, len(stream), size)]
+                with self.subTest(codec=codec, size=size):
+                    self.assertEqual(list(iter_ndjson_records(chunks, codec)), RECORDS + [{'last': True}])
+                    self.assertEqual(list(iter_ndjson_records(chunks, codec, batch_size=4)),
+                                     [RECORDS[:4], RECORDS[4:] + [{'last': True}]])
+        self.assertEqual(list(iter_ndjson_records([])), [])
+
+    def test_invalid_batch_size(self):
+        curl = PyCurlify()
+        for batch_size in (0, -1, 2.5, True):
+            with self.subTest(batch_size=batch_size):
+                with self.assertRaises(ValueError):
+                    next(iter_ndjson_records([b'{"a": 1}\n'], batch_size=batch_size))
+                with self.assertRaises(ValueError):
+                    next(curl.iter_ndjson('http://127.0.0.1:1/', batch_size=batch_size))
+
+    def test_invalid_line(self):
+        with self.assertRaises(requests.exceptions.JSONDecodeError) as raised:
+            list(iter_ndjson_records([b'{"a": 1}\n', b'\n{"a": \n{"a": 3}\n']))
+        self.assertIn('line 3', str(raised.exception))
+
+    def test_memory_is_constant(self):
+        parser = NdjsonParser()
+        largest = count = 0
+        for chunk in _records(50000):
+            # Split the chunks within a line
+            count += len(parser.feed(chunk[:50])) + len(parser.feed(chunk[50:]))
+            largest = max(largest, len(parser._buffer))
+        count += len(parser.close())
+        self.assertEqual(count, 50000)
+        self.assertLess(largest, 200)
+
+
+class TestIterNdjson(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer(NdjsonHandler).__enter__()
+        cls.server.httpd.released = threading.Event()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def test_iter_ndjson_with_every_transport(self):
+        for transport in ('requests', 'urllib3', 'curl'):
+            with self.subTest(transport=transport):
+                curl = PyCurlify()
+                curl.set_transport(transport)
+                records = list(curl.iter_ndjson(self.server.url('/logs?2500')))
+                self.assertEqual([record['id'] for record in records], list(range(2500)))
+                batches = list(curl.iter_ndjson(self.server.url('/logs?2500'), batch_size=1000))
+                self.assertEqual([len(batch) for batch in batches], [1000, 1000, 500])
+
+                # Records are yielded as their lines arrive, not when the stream ends
+                released = self.server.httpd.released
+                released.clear()
+                ids = []
+                for record in curl.iter_ndjson(self.server.url('/live')):
+                    ids.append(record['id'])
+                    released.set()
+                self.assertEqual(ids, [0, 1])
+                curl.get_transport().close()
+
+    def test_response_decodes_ndjson(self):
+        curl = PyCurlify()
+        curl.get(self.server.url('/logs?3'))
+        self.assertEqual([record['id'] for record in curl.response()], [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestPool(unittest.TestCase):
+
+    def setUp(self):
+        self.curl = PyCurlify()
+
+    def test_connection_is_reused(self):
+        with LocalServer() as server:
+            for _ in range(5):
+                self.curl.get(server.url('/'))
+        stats = self.curl.get_pool_stats()
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['reused'], 4)
+        self.assertAlmostEqual(stats['reuse_ratio'], 0.8)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_idle_timeout_expires_connections(self):
+        self.curl.set_pool_config(idle_timeout=0)
+        with LocalServer() as server:
+            self.curl.get(server.url('/'))
+            self.curl.get(server.url('/'))
+        stats = self.curl.get_pool_stats()
+        self.assertEqual(stats['expired'], 1)
+        self.assertEqual(stats['reused'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import json
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestRequestTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.curl = PyCurlify()
+
+    def test_send_fills_varying_parts(self):
+        self.curl.set_header('X-Staged', 'yes')
+        with LocalServer() as server:
+            template = self.curl.prepare('post', server.url('/items/{item_id}'), headers={'X-Fixed': '1'})
+            for item_id in range(3):
+                response = template.send(item_id=item_id, params={'q': item_id}, data={'id': item_id})
+                document = json.loads(response.content)
+                self.assertEqual(document['path'], f'/items/{item_id}?q={item_id}')
+                self.assertEqual(document['headers']['X-Staged'], 'yes')
+                self.assertEqual(document['headers']['X-Fixed'], '1')
+                self.assertEqual(json.loads(document['body']), {'id': item_id})
+                self.assertIs(self.curl.get_response(), response)
+        self.assertEqual(self.curl._context().headers, {})
+
+    def test_template_is_immutable(self):
+        template = self.curl.prepare('get', 'http://example.com/')
+        with self.assertRaises(AttributeError):
+            template.url = 'http://other.example.com/'
+        with self.assertRaises(TypeError):
+            template.headers['X-New'] = '1'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TestSingleFlight(unittest.TestCase):
+    THREADS = 16
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.set_pool_config(pool_maxsize=self.THREADS)
+        self.curl.enable_coalescing()
+        self.server = LocalServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def _run(self, request):
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(worker_id):
+            barrier.wait()
+            return request(worker_id)
+
+        with ThreadPoolExecutor(self.THREADS) as executor:
+            return list(executor.map(worker, range(self.THREADS)))
+
+    def test_identical_requests_share_one_round_trip(self):
+        responses = self._run(lambda _: self.curl.get(self.server.url('/slow?0.3')))
+        self.assertEqual(len(self.server.seen), 1)
+        self.assertEqual(len({id(response) for response in responses}), self.THREADS)
+        self.assertEqual(len({id(response.content) for response in responses}), 1)
+        self.assertEqual(responses[0].json()['path'], '/slow?0.3')
+        stats = self.curl.get_coalescing_stats()
+        self.assertEqual((stats['leaders'], stats['collapsed'], stats['in_flight']), (1, self.THREADS - 1, 0))
+
+    def test_callers_do_not_see_each_other_changes(self):
+        def request(worker_id):
+            response = self.curl.get(self.server.url('/slow?0.3'))
+            response.headers['X-Worker'] = str(worker_id)
+            response.encoding = 'latin-1' if worker_id % 2 else 'utf-8'
+            return response
+
+        responses = self._run(request)
+        self.assertEqual(len(self.server.seen), 1)
+        self.assertEqual([response.headers['X-Worker'] for response in responses], [str(i) for i in range(self.THREADS)])
+        self.assertEqual([response.encoding for response in responses], ['utf-8', 'latin-1'] * (self.THREADS // 2))
+        self.assertTrue(all(response.json()['path'] == '/slow?0.3' for response in responses))
+
+    def test_different_headers_are_not_coalesced(self):
+        self._run(lambda worker_id: self.curl.get(self.server.url('/slow?0.1'), headers={'Accept': str(worker_id)}))
+        self.assertEqual(len(self.server.seen), self.THREADS)
+        self.assertEqual(self.curl.get_coalescing_stats()['collapsed'], 0)
+
+    def test_errors_are_shared(self):
+        errors = []
+        self.curl.set_default_timeout(0.1)
+        self.curl.error_callback = errors.append
+        responses = self._run(lambda _: self.curl.get(self.server.url('/slow?0.5')))
+        self.assertEqual(len(self.server.seen), 1)
+        self.assertEqual(responses, [None] * self.THREADS)
+        self.assertEqual(len(errors), self.THREADS)
+        self.assertTrue(all('timed out' in error for error in errors))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import unittest
+from pycurlify import PyCurlify, AsyncPyCurlify
+from LocalServer import EchoHandler, LocalServer
+
+SIZE = 300000
+
+
+def _payload(size):
+    return (bytes(range(251)) * (size // 251 + 1))[:size]
+
+
+class UnsizedHandler(EchoHandler):
+    """
+    Serves /unsized?<size> without a Content-Length, ending the body by closing the connection.
+    """
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path != '/unsized':
+            return super().do_GET()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(_payload(int(query)))
+        self.close_connection = True
+
+
+class SpoolSemantics:
+    transport = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer(UnsizedHandler).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.set_transport(self.transport)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.curl.get_transport().close()
+        self.directory.cleanup()
+
+    def test_small_bodies_stay_in_memory(self):
+        self.curl.set_body_limits(spool_threshold=SIZE)
+        self.curl.get(self.server.url('/bytes?1000'))
+        self.assertEqual(self.curl.get_content(), _payload(1000))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_large_bodies_are_spooled(self):
+        self.curl.set_body_limits(spool_threshold=1000, spool_dir=self.directory.name)
+        for path in ('/bytes', '/unsized'):
+            self.curl.get(self.server.url(f'{path}?{SIZE}'))
+            content = self.curl.get_content()
+            self.assertIsInstance(content, memoryview)
+            self.assertEqual(content, _payload(SIZE))
+            self.assertEqual(b''.join(self.curl.get_response().iter_content(65536)), _payload(SIZE))
+        # The temporary files are unlinked as soon as they are created
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+        self.curl.get(self.server.url('/' + 'x' * 2000))
+        self.assertEqual(self.curl.response()['path'], '/' + 'x' * 2000)
+
+    def test_max_body_size_aborts_the_transfer(self):
+        errors = []
+        self.curl.error_callback = errors.append
+        self.curl.set_body_limits(max_body_size=SIZE - 1)
+        for path in ('/bytes', '/unsized'):
+            self.assertIsNone(self.curl.get(self.server.url(f'{path}?{SIZE}')))
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(all('maximum size' in error for error in errors))
+
+        self.curl.get(self.server.url(f'/bytes?{SIZE - 1}'))
+        self.assertEqual(len(self.curl.get_content()), SIZE - 1)
+
+
+class TestRequestsTransportSpool(SpoolSemantics, unittest.TestCase):
+    transport = 'requests'
+
+    def test_connection_is_reused(self):
+        self.curl.set_body_limits(spool_threshold=1000)
+        for _ in range(3):
+            self.curl.get(self.server.url(f'/bytes?{SIZE}'))
+        self.assertEqual(self.curl.get_pool_stats()['reused'], 2)
+
+
+class TestUrllib3TransportSpool(SpoolSemantics, unittest.TestCase):
+    transport = 'urllib3'
+
+
+class TestCurlTransportSpool(SpoolSemantics, unittest.TestCase):
+    transport = 'curl'
+
+
+class TestAsyncSpool(unittest.IsolatedAsyncioTestCase):
+
+    async def test_spool_and_limit(self):
+        with LocalServer() as server:
+            async with AsyncPyCurlify() as curl:
+                curl.set_body_limits(spool_threshold=1000, max_body_size=SIZE)
+                await curl.get(server.url(f'/bytes?{SIZE}'))
+                self.assertIsInstance(curl.get_content(), memoryview)
+                self.assertEqual(curl.get_content(), _payload(SIZE))
+
+                self.assertIsNone(await curl.get(server.url(f'/bytes?{SIZE + 1}')))
+                await curl.post(server.url('/'), data={'a': 'b' * 2000})
+                self.assertEqual(json.loads(curl.response()['body']), {'a': 'b' * 2000})
+
+
+if __name__ == '__main__':
+    unittest.main()
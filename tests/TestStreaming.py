@@ -0,0 +1,79 @@
+import io
+import os
+import tempfile
+import unittest
+import requests
+from pycurlify import PyCurlify
+from pycurlify.Streaming import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, copy_body, splice_body
+from LocalServer import LocalServer
+
+
+class RecordingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.sizes = []
+
+    def readinto(self, buffer):
+        self.sizes.append(len(buffer))
+        return super().readinto(buffer)
+
+
+def _response(data):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = RecordingReader(data)
+    return response
+
+
+class TestStreaming(unittest.TestCase):
+
+    def test_read_size_grows_and_buffer_is_reused(self):
+        data = bytes(range(256)) * (64 * 1024)
+        response = _response(data)
+        chunks, buffers = [], set()
+
+        def write(view):
+            chunks.append(bytes(view))
+            buffers.add(id(view.obj))
+
+        self.assertEqual(copy_body(response, write), len(data))
+        self.assertEqual(b''.join(chunks), data)
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(response.raw.sizes[0], MIN_CHUNK_SIZE)
+        self.assertEqual(max(response.raw.sizes), MAX_CHUNK_SIZE)
+
+    def test_progress_is_batched(self):
+        data = b'x' * (8 * 1024 * 1024)
+        reports = []
+        copy_body(_response(data), lambda view: None, reports.append)
+        self.assertEqual(sum(reports), len(data))
+        self.assertLess(len(reports), 3)
+
+    def test_size_hint_bounds_the_buffer(self):
+        response = _response(b'abc')
+        self.assertEqual(copy_body(response, lambda view: None, size_hint=3), 3)
+        self.assertEqual(response.raw.sizes, [3, 3])
+
+    @unittest.skipUnless(hasattr(os, 'splice'), "os.splice() is Linux only")
+    def test_splice_body_moves_plain_body_and_reuses_connection(self):
+        curl = PyCurlify()
+        # A timeout makes the socket non-blocking
+        curl.set_default_timeout(5)
+        size = 3 * 1024 * 1024 + 7
+        with LocalServer() as server, tempfile.TemporaryFile() as file:
+            for _ in range(2):
+                curl.enable_stream()
+                response = curl.get(server.url(f'/bytes?{size}'))
+                curl.disable_stream()
+                file.seek(0)
+                self.assertEqual(splice_body(response, file.fileno(), 0), size)
+            file.seek(0)
+            self.assertEqual(file.read(), (bytes(range(251)) * (size // 251 + 1))[:size])
+        self.assertEqual(curl.get_pool_stats()['reused'], 1)
+
+    def test_splice_body_declines_other_bodies(self):
+        self.assertIsNone(splice_body(_response(b'abc'), 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
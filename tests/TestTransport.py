@@ -0,0 +1,134 @@
+import json
+import time
+import unittest
+from pycurlify import PyCurlify
+from LocalServer import LocalServer
+
+
+class TransportSemantics:
+    transport = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def setUp(self):
+        self.curl = PyCurlify()
+        self.curl.set_transport(self.transport)
+
+    def tearDown(self):
+        self.curl.get_transport().close()
+
+    def test_headers_params_and_body(self):
+        self.curl.set_header('X-Test', 'value')
+        response = self.curl.post(self.server.url('/echo?a=1'), params={'b': [2, 3], 'c': None}, data={'key': 'value'})
+        document = self.curl.response()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(document['method'], 'POST')
+        self.assertEqual(document['path'], '/echo?a=1&b=2&b=3')
+        self.assertEqual(document['headers']['X-Test'], 'value')
+        self.assertEqual(document['headers']['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(document['body']), {'key': 'value'})
+
+    def test_cookies_are_sent_and_kept(self):
+        self.curl.get(self.server.url('/set-cookie'))
+        self.assertEqual(self.curl.get_cookie('session'), 'abc')
+        document = json.loads(self.curl.get(self.server.url('/'), cookies={'extra': '1'}).content)
+        self.assertEqual(sorted(document['headers']['Cookie'].split('; ')), ['extra=1', 'session=abc'])
+
+    def test_redirects(self):
+        self.assertEqual(self.curl.get(self.server.url('/redirect')).status_code, 302)
+        self.curl.set_follow_location()
+        response = self.curl.get(self.server.url('/redirect'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.url.endswith('/redirected'))
+
+    def test_post_redirects(self):
+        self.curl.set_follow_location()
+        self.curl.post(self.server.url('/redirect?303'), data={'key': 'value'})
+        document = self.curl.response()
+        self.assertEqual((document['method'], document['path'], document['body']), ('GET', '/redirected', ''))
+        self.curl.set_follow_location()
+        self.curl.post(self.server.url('/redirect?307'), data={'key': 'value'})
+        document = self.curl.response()
+        self.assertEqual((document['method'], json.loads(document['body'])), ('POST', {'key': 'value'}))
+
+    def test_redirects_rewrite_the_method_and_keep_hop_cookies(self):
+        for status in (301, 302):
+            with self.subTest(status=status):
+                self.curl.set_follow_location()
+                response = self.curl.post(self.server.url(f'/redirect-cookie?{status}'), data={'key': 'value'})
+                document = self.curl.response()
+                self.assertEqual((document['method'], document['path'], document['body']), ('GET', '/redirected', ''))
+                self.assertEqual(document['headers'].get('Cookie'), 'hop=1')
+                self.assertNotIn('Content-Type', document['headers'])
+                self.assertEqual([hop.status_code for hop in response.history], [status])
+                self.assertEqual(response.history[0].cookies.get('hop'), '1')
+
+    def test_authorization_is_dropped_across_hosts(self):
+        self.curl.set_follow_location()
+        self.curl.get(self.server.url('/redirect?302'), headers={'Authorization': 'Bearer token'})
+        self.assertEqual(self.curl.response()['headers'].get('Authorization'), 'Bearer token')
+        self.curl.set_follow_location()
+        self.curl.get(self.server.url('/redirect-host'), headers={'Authorization': 'Bearer token'})
+        document = self.curl.response()
+        self.assertEqual(document['path'], '/redirected')
+        self.assertNotIn('Authorization', document['headers'])
+
+    def test_streamed_bodies_and_redirects(self):
+        self.curl.set_follow_location()
+        self.curl.put(self.server.url('/redirect?307'), data=b'raw body')
+        self.assertEqual(self.curl.response()['body'], 'raw body')
+        errors = []
+        self.curl.error_callback = errors.append
+        self.curl.set_follow_location()
+        self.assertIsNone(self.curl.put(self.server.url('/redirect?307'), data=iter([b'raw body'])))
+        self.assertEqual(len(errors), 1)
+
+    def test_streamed_response_returns_with_the_headers(self):
+        self.curl.enable_stream()
+        started = time.perf_counter()
+        response = self.curl.get(self.server.url('/idle?1.5'))
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(response.headers['Content-Type'], 'text/plain')
+        self.assertEqual(response.content, b'done')
+
+    def test_timeout(self):
+        errors = []
+        self.curl.error_callback = errors.append
+        self.curl.set_timeout(0.2)
+        self.assertIsNone(self.curl.get(self.server.url('/slow?1.5')))
+        self.assertEqual(len(errors), 1)
+
+    def test_streaming(self):
+        self.curl.enable_stream()
+        response = self.curl.get(self.server.url('/bytes?100000'))
+        body = b''.join(response.iter_content(chunk_size=4096))
+        self.assertEqual(body, bytes(index % 251 for index in range(100000)))
+        self.assertEqual(self.curl.get(self.server.url('/')).status_code, 200)
+
+
+class TestRequestsTransport(TransportSemantics, unittest.TestCase):
+    transport = 'requests'
+
+
+class TestUrllib3Transport(TransportSemantics, unittest.TestCase):
+    transport = 'urllib3'
+
+    def test_connection_is_released(self):
+        for _ in range(3):
+            self.curl.get(self.server.url('/'))
+        stats = self.curl.get_pool_stats()
+        self.assertEqual((stats['in_use'], stats['created']), (0, 1))
+
+
+class TestCurlTransport(TransportSemantics, unittest.TestCase):
+    transport = 'curl'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import io
+import json
+import tempfile
+import unittest
+from pycurlify import AsyncPyCurlify, MultiEngine, PyCurlify
+from pycurlify.Upload import UploadBody, is_upload_body
+from LocalServer import LocalServer
+
+PAYLOAD = bytes(range(97, 123)) * 10000
+
+
+def _chunks(data, size=10000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class TestUploadBody(unittest.TestCase):
+
+    def test_length_detection(self):
+        self.assertEqual(UploadBody(b'abc').length, 3)
+        self.assertEqual(UploadBody(memoryview(bytearray(10))).length, 10)
+        stream = io.BytesIO(b'0123456789')
+        stream.seek(4)
+        self.assertEqual(UploadBody(stream).length, 6)
+        with tempfile.TemporaryFile() as file:
+            file.write(PAYLOAD)
+            file.seek(0)
+            self.assertEqual(len(UploadBody(file)), len(PAYLOAD))
+        body = UploadBody(_chunks(PAYLOAD))
+        self.assertIsNone(body.length)
+        with self.assertRaises(TypeError):
+            len(body)
+
+    def test_chunks_and_progress(self):
+        reports = []
+        body = UploadBody(PAYLOAD, progress=lambda size, total: reports.append((size, total)), chunk_size=100000)
+        chunks = list(body)
+        self.assertTrue(all(isinstance(chunk, memoryview) for chunk in chunks))
+        self.assertEqual(b''.join(chunks), PAYLOAD)
+        self.assertEqual(reports, [(100000, 260000), (100000, 260000), (60000, 260000)])
+        self.assertEqual(body.sent, len(PAYLOAD))
+
+        body = UploadBody(iter([b'ab', b'', 'cd', b'efg']))
+        self.assertEqual([body.read_chunk(3) for _ in range(5)], [b'ab', b'cd', b'efg', b'', b''])
+
+    def test_payload_kinds(self):
+        for data in (b'', bytearray(), memoryview(b''), io.BytesIO(), _chunks(b''), UploadBody(b'')):
+            self.assertTrue(is_upload_body(data))
+        for data in ({'a': 1}, [1, 2], 'text', 1.5, None, True):
+            self.assertFalse(is_upload_body(data))
+
+
+class TestUpload(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def _echo(self, curl, method, data, headers=None):
+        response = getattr(curl, method)(self.server.url('/upload'), headers=headers, data=data)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_bodies_with_every_transport(self):
+        for transport in ('requests', 'urllib3', 'curl'):
+            with self.subTest(transport=transport):
+                curl = PyCurlify()
+                curl.set_transport(transport)
+                text = PAYLOAD.decode('ascii')
+
+                with tempfile.TemporaryFile() as file:
+                    file.write(PAYLOAD)
+                    file.seek(0)
+                    reports = []
+                    body = UploadBody(file, progress=lambda size, total: reports.append(total))
+                    document = self._echo(curl, 'put', body, {'Content-Type': 'application/octet-stream'})
+                self.assertEqual(document['method'], 'PUT')
+                self.assertEqual(document['body'], text)
+                self.assertEqual(document['headers']['Content-Length'], str(len(PAYLOAD)))
+                self.assertEqual(document['headers']['Content-Type'], 'application/octet-stream')
+                self.assertEqual(body.sent, len(PAYLOAD))
+                self.assertEqual(set(reports), {len(PAYLOAD)})
+
+                document = self._echo(curl, 'post', memoryview(PAYLOAD)[10:])
+                self.assertEqual(document['method'], 'POST')
+                self.assertEqual(document['body'], text[10:])
+                self.assertEqual(document['headers']['Content-Length'], str(len(PAYLOAD) - 10))
+
+                document = self._echo(curl, 'patch', _chunks(PAYLOAD))
+                self.assertEqual(document['method'], 'PATCH')
+                self.assertEqual(document['body'], text)
+                self.assertEqual(document['headers']['Transfer-Encoding'], 'chunked')
+                self.assertNotIn('Content-Length', document['headers'])
+
+                # Other values are still sent as JSON
+                document = self._echo(curl, 'post', {'a': 1})
+                self.assertEqual(json.loads(document['body']), {'a': 1})
+                curl.get_transport().close()
+
+    def test_template_and_multi_engine(self):
+        curl = PyCurlify()
+        template = curl.prepare('post', self.server.url('/upload'))
+        document = json.loads(template.send(data=_chunks(PAYLOAD)).content)
+        self.assertEqual(document['body'], PAYLOAD.decode('ascii'))
+
+        engine = MultiEngine(curl)
+        engine.add('put', self.server.url('/upload'), data=io.BytesIO(PAYLOAD))
+        engine.add('post', self.server.url('/upload'), data=_chunks(PAYLOAD))
+        results = sorted(engine.run(), key=lambda result: result['index'])
+        engine.close()
+        documents = [json.loads(result['response'].content) for result in results]
+        self.assertEqual([document['body'] for document in documents], [PAYLOAD.decode('ascii')] * 2)
+        self.assertEqual(documents[0]['headers']['Content-Length'], str(len(PAYLOAD)))
+        self.assertEqual(documents[1]['headers']['Transfer-Encoding'], 'chunked')
+
+
+class TestAsyncUpload(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = LocalServer().__enter__()
+        self.curl = AsyncPyCurlify()
+
+    async def asyncTearDown(self):
+        await self.curl.aclose()
+        self.server.__exit__(None, None, None)
+
+    async def test_async_and_file_bodies(self):
+        async def produce():
+            for chunk in _chunks(PAYLOAD):
+                yield chunk
+
+        response = await self.curl.post(self.server.url('/upload'), data=produce())
+        document = json.loads(response.content)
+        self.assertEqual(document['body'], PAYLOAD.decode('ascii'))
+        self.assertEqual(document['headers']['Transfer-Encoding'], 'chunked')
+
+        with tempfile.TemporaryFile() as file:
+            file.write(PAYLOAD)
+            file.seek(0)
+            response = await self.curl.put(self.server.url('/upload'), data=file)
+        document = json.loads(response.content)
+        self.assertEqual(document['body'], PAYLOAD.decode('ascii'))
+        self.assertEqual(document['headers']['Content-Length'], str(len(PAYLOAD)))
+
+        with self.assertRaises(TypeError):
+            list(UploadBody(produce()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import xml.etree.ElementTree as ET
+from pycurlify import PyCurlify
+from pycurlify.XmlStream import XmlElementParser, iter_xml_elements
+from LocalServer import EchoHandler, LocalServer
+
+DOCUMENT = b'''<?xml version="1.0" encoding="utf-8"?>
+<rss><channel><title>Feed</title>
+<item id="1"><title>First &amp; foremost</title><item id="1.1"/></item>
+<item id="2"><title>Caf\xc3\xa9</title></item>
+<archive><item id="3"/></archive>
+</channel>
+<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Atom</title></entry></feed>
+</rss>'''
+
+
+def _feed(count):
+    yield b'<?xml version="1.0"?><rss><channel><title>Feed</title>'
+    for start in range(0, count, 100):
+        yield b''.join(b'<item id="%d"><title>Item %d</title><description>%s</description></item>'
+                       % (index, index, b'd' * 100) for index in range(start, min(start + 100, count)))
+    yield b'</channel></rss>'
+
+
+class FeedHandler(EchoHandler):
+    """
+    Serves /feed?<count> as a chunked RSS document.
+    """
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path != '/feed':
+            return super().do_GET()
+        try:
+            self.send_chunked(_feed(int(query)), 'application/rss+xml')
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class TestXmlElementParser(unittest.TestCase):
+
+    def _ids(self, path, size=7):
+        chunks = [DOCUMENT[offset:offset + size] for offset in range(0, len(DOCUMENT), size)]
+        return [element.get('id') for element in iter_xml_elements(chunks, path)]
+
+    def test_paths(self):
+        for size in (1, 7, len(DOCUMENT)):
+            with self.subTest(size=size):
+                self.assertEqual(self._ids('item', size), ['1.1', '1', '2', '3'])
+        self.assertEqual(self._ids('channel/item'), ['1', '2'])
+        self.assertEqual(self._ids('/rss/channel/item'), ['1', '2'])
+        self.assertEqual(self._ids('archive/*'), ['3'])
+        self.assertEqual(self._ids('/item'), [])
+        self.assertEqual(self._ids('entry'), [])
+        entries = list(iter_xml_elements([DOCUMENT], '{*}entry'))
+        self.assertEqual(entries[0].find('{http://www.w3.org/2005/Atom}title').text, 'Atom')
+        self.assertEqual(len(list(iter_xml_elements([DOCUMENT], '{http://www.w3.org/2005/Atom}entry'))), 1)
+        with self.assertRaises(ValueError):
+            XmlElementParser('/')
+
+    def test_elements_are_complete(self):
+        items = list(iter_xml_elements([DOCUMENT], 'channel/item'))
+        self.assertEqual(items[0].find('title').text, 'First & foremost')
+        self.assertEqual(items[0].find('item').get('id'), '1.1')
+        self.assertEqual(items[1].find('title').text, 'Café')
+
+    def test_invalid_documents(self):
+        for document in (b'<rss><item></rss>', b'<rss><item/>', b'not xml'):
+            with self.subTest(document=document):
+                with self.assertRaises(ET.ParseError):
+                    list(iter_xml_elements([document], 'item'))
+
+    def test_processed_subtrees_are_released(self):
+        parser = XmlElementParser('item')
+        count = 0
+        for chunk in _feed(20000):
+            count += len(parser.feed(chunk))
+            # The channel only holds the item being parsed, if any
+            channel = parser._open[1][0] if len(parser._open) > 1 else None
+            self.assertLessEqual(len(channel) if channel is not None else 0, 1)
+        count += len(parser.close())
+        self.assertEqual(count, 20000)
+
+
+class TestIterXml(unittest.TestCase):
+
+    def test_iter_xml_with_every_transport(self):
+        with LocalServer(FeedHandler) as server:
+            for transport in ('requests', 'urllib3', 'curl'):
+                with self.subTest(transport=transport):
+                    curl = PyCurlify()
+                    curl.set_transport(transport)
+                    titles = [item.findtext('title') for item in curl.iter_xml(server.url('/feed?2500'), 'item')]
+                    self.assertEqual(titles, [f'Item {index}' for index in range(2500)])
+                    for item in curl.iter_xml(server.url('/feed?2500'), '/rss/channel/item'):
+                        break
+                    self.assertEqual(item.get('id'), '0')
+                    self.assertEqual(curl.get(server.url('/after')).status_code, 200)
+                    curl.get_transport().close()
+
+
+if __name__ == '__main__':
+    unittest.main()